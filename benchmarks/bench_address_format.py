@@ -0,0 +1,114 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark parsing prefixes and addresses into compact forms, and the saving for consumers sorting and matching them.
+
+Run with: PYTHONPATH=src python -m benchmarks.bench_address_format [routes]
+"""
+
+import ipaddress
+import random
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from birdclient import BirdClient
+
+from .synthetic import BirdOutputGenerator
+
+
+def timed(func: Callable[[], Any]) -> tuple[float, Any]:
+    """Return the time taken to run a function and its result."""
+
+    start = time.perf_counter()
+    res = func()
+    return time.perf_counter() - start, res
+
+
+def lpm_str(routes: dict[Any, Any], addresses: list[str]) -> int:
+    """Longest prefix match addresses against string prefixes, as a consumer would today."""
+
+    table: dict[int, dict[int, Any]] = {}
+    for prefix in routes:
+        network = ipaddress.ip_network(prefix)
+        table.setdefault(network.prefixlen, {})[int(network.network_address) >> (32 - network.prefixlen)] = prefix
+    return _lpm(table, [int(ipaddress.ip_address(x)) for x in addresses])
+
+
+def lpm_int(routes: dict[Any, Any], addresses: list[str]) -> int:
+    """Longest prefix match addresses against integer encoded prefixes."""
+
+    table: dict[int, dict[int, Any]] = {}
+    for prefix in routes:
+        network, length, _ = prefix
+        table.setdefault(length, {})[network >> (32 - length)] = prefix
+    return _lpm(table, [int(ipaddress.ip_address(x)) for x in addresses])
+
+
+def lpm_ipaddress(routes: dict[Any, Any], addresses: list[str]) -> int:
+    """Longest prefix match addresses against ipaddress network objects."""
+
+    table: dict[int, dict[int, Any]] = {}
+    for network in routes:
+        table.setdefault(network.prefixlen, {})[int(network.network_address) >> (32 - network.prefixlen)] = network
+    return _lpm(table, [int(ipaddress.ip_address(x)) for x in addresses])
+
+
+def _lpm(table: dict[int, dict[int, Any]], addresses: list[int]) -> int:
+    """Count the addresses which match a prefix."""
+
+    lengths = sorted(table, reverse=True)
+    matched = 0
+    for address in addresses:
+        for length in lengths:
+            if (address >> (32 - length)) in table[length]:
+                matched += 1
+                break
+    return matched
+
+
+def main() -> None:
+    """Run the benchmark."""
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = list(BirdOutputGenerator().routes(count))
+    rand = random.Random(2)  # noqa: S311
+    addresses = [str(ipaddress.IPv4Address(rand.getrandbits(32))) for _ in range(count)]
+
+    print(f"Routes: {count}, lines: {len(data)}")  # noqa: T201
+    print(f"{'format':<10} {'parse':>8} {'sort':>8} {'lpm':>8} {'total':>8}")  # noqa: T201
+    for address_format in ("str", "int", "ipaddress"):
+        birdclient = BirdClient(address_format=address_format)
+        parse_time, routes = timed(lambda birdclient=birdclient: birdclient.show_route(data=data))
+        if address_format == "str":
+            sort_time, _ = timed(lambda routes=routes: sorted(routes, key=ipaddress.ip_network))
+            lpm_time, _ = timed(lambda routes=routes: lpm_str(routes, addresses))
+        elif address_format == "int":
+            sort_time, _ = timed(lambda routes=routes: sorted(routes))
+            lpm_time, _ = timed(lambda routes=routes: lpm_int(routes, addresses))
+        else:
+            sort_time, _ = timed(lambda routes=routes: sorted(routes))
+            lpm_time, _ = timed(lambda routes=routes: lpm_ipaddress(routes, addresses))
+        total = parse_time + sort_time + lpm_time
+        print(f"{address_format:<10} {parse_time:8.3f} {sort_time:8.3f} {lpm_time:8.3f} {total:8.3f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
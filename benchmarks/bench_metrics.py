@@ -0,0 +1,141 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark the CPU time the Prometheus metrics exporter takes per scrape.
+
+The exporter scrapes a BIRD server with the number of BGP sessions given, each with its own table, every 10 seconds. A few
+sessions flap between scrapes and the route counts change on every query, so the scrapes have work to do. Replies come from
+memory, receiving them from BIRD is measured by bench_transport.
+
+Run with: PYTHONPATH=src python -m benchmarks.bench_metrics [protocols]
+"""
+
+import re
+import sys
+import time
+
+from birdclient import BirdClient, BirdMetrics
+
+from .synthetic import BirdOutputGenerator
+
+# Scrape interval to simulate
+SCRAPE_INTERVAL = 10.0
+# Sessions flapping between scrapes
+FLAPS = 5
+
+
+class _CannedBirdClient(BirdClient):
+    """BirdClient answering queries from canned replies, changing the route counts on each 'show protocols all' query."""
+
+    replies: dict[str, list[str]]
+    queries: int
+
+    def __init__(self, replies: dict[str, list[str]]) -> None:
+        """Initialize the object."""
+        super().__init__()
+        self.replies = replies
+        self.queries = 0
+
+    def query(self, query: str | list[str]) -> list[str]:
+        """Return the canned reply to a query."""
+
+        self.queries += 1
+        query = " ".join(query) if isinstance(query, list) else query
+        reply = self.replies[query]
+        if query.startswith("show protocols all "):
+            reply = [re.sub(r"^(\s+Routes:\s+)\d+", rf"\g<1>{self.queries}", line) if "Routes:" in line else line for line in reply]
+        return ["0001 BIRD 2.15.1 ready.", *reply]
+
+    def query_iter(self, query: str | list[str]) -> list[str]:  # type: ignore[override]
+        """Return the canned reply to a query."""
+        return self.query(query)
+
+    def query_many(self, queries: list[str | list[str]]) -> list[list[str]]:  # type: ignore[override]
+        """Return the canned reply to each query."""
+        return [self.query(query) for query in queries]
+
+
+def _replies(count: int) -> dict[str, list[str]]:
+    """Return the replies of a BIRD server with the number of BGP sessions given."""
+
+    details = list(BirdOutputGenerator().protocols(count))[1:]
+    replies = {
+        "show status": [
+            "1000-BIRD 2.15.1",
+            "1011-Router ID is 172.16.10.1",
+            " Current server time is 2024-05-01 11:00:00.000",
+            " Last reboot on 2024-05-01 10:00:00.000",
+            " Last reconfiguration on 2024-05-01 10:00:00.000",
+            "0013 Daemon is up and running",
+        ],
+        "show protocols": list(BirdOutputGenerator().protocols(count, details=False))[1:],
+        "show protocols all": details,
+    }
+
+    # Split the details up by protocol, each starts with its summary line, which is the only line starting with a single space
+    starts = [num for num, line in enumerate(details) if line.startswith("1002-") or (line[:1] == " " and line[1:2] != " ")]
+    for start, end in zip(starts, [*starts[1:], len(details) - 1], strict=True):
+        summary = details[start].removeprefix("1002-").lstrip()
+        replies[f"show protocols all {summary.split()[0]}"] = [details[0], f"1002-{summary}", *details[start + 1 : end], "0000 "]
+
+    # Route counts for the table of each session
+    for num in range(count):
+        table = f"t_bgp4_AS{64512 + num}_peer"
+        replies[f"show route table {table} count"] = [f"0014 {num} of {num} routes for {num} networks in table {table}"]
+
+    return replies
+
+
+def main() -> None:
+    """Run the benchmark."""
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    scrapes = 50
+    replies = _replies(count)
+    summaries = replies["show protocols"]
+    print(f"Protocols: {count}, scrapes every {SCRAPE_INTERVAL:.0f}s, {FLAPS} sessions flapping between scrapes")  # noqa: T201
+    print(f"{'details max age':>15} {'first scrape':>12} {'later scrapes':>13}")  # noqa: T201
+
+    for details_max_age in (None, 3600.0, 1800.0, 600.0):
+        metrics = BirdMetrics(_CannedBirdClient(replies), max_age=0, details_max_age=details_max_age)
+
+        # The first scrape queries the details of every protocol
+        start = time.process_time()
+        metrics.collect()
+        first = time.process_time() - start
+
+        # Later scrapes only query the summary, along with the details of protocols that flapped or are due a refresh, move the
+        # details refresh time back by the scrape interval each time so they are refreshed as they would be over time
+        elapsed = 0.0
+        for scrape in range(scrapes):
+            for num in range(FLAPS):
+                line = 4 + (scrape * FLAPS + num) % count
+                old, new = ("2023-12-04", "2023-12-05") if "2023-12-04" in summaries[line] else ("2023-12-05", "2023-12-04")
+                summaries[line] = summaries[line].replace(old, new)
+            metrics._details_time -= SCRAPE_INTERVAL  # noqa: SLF001
+            start = time.process_time()
+            metrics.collect()
+            elapsed += time.process_time() - start
+
+        label = "none" if details_max_age is None else f"{details_max_age:.0f}s"
+        print(f"{label:>15} {first * 1000:>10.1f}ms {elapsed / scrapes * 1000:>11.1f}ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark the route and protocol parsers across output sizes using synthetic BIRD output.
+
+Each case runs in a fresh process so its peak RSS can be measured. Results can be saved and compared against a previous run to
+catch regressions.
+
+Run with: PYTHONPATH=src python -m benchmarks.bench_parsers [--sizes 1000,10000] [--save results.json] [--compare results.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import pathlib
+import resource
+import sys
+import time
+from typing import Any
+
+from birdclient import BirdClient
+
+from .synthetic import BirdOutputGenerator
+
+# Benchmark cases, the kind of output and the options passed to the generator
+CASES: dict[str, dict[str, Any]] = {
+    "routes-bgp": {"kind": "bgp"},
+    "routes-bgp-multi": {"kind": "bgp", "max_sources": 4},
+    "routes-bgp6": {"kind": "bgp", "family": 6},
+    "routes-ospf": {"kind": "ospf", "max_sources": 2},
+    "routes-rip": {"kind": "rip"},
+    "routes-kernel": {"kind": "kernel"},
+    "routes-roa": {"kind": "roa", "max_sources": 2},
+    "protocols": {"kind": "protocols"},
+}
+
+
+def run_case(case: str, version: int, size: int, repeat: int) -> dict[str, Any]:
+    """Run a benchmark case, this is run in its own process."""
+
+    options = dict(CASES[case])
+    kind = options.pop("kind")
+    generator = BirdOutputGenerator(version=version)
+    data = list(generator.protocols(size)) if kind == "protocols" else list(generator.routes(size, kind=kind, **options))
+    birdclient = BirdClient()
+
+    # RSS with the data loaded, before we parse it
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Run a few times and take the best, to reduce noise
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = birdclient.show_protocols(data=data) if kind == "protocols" else birdclient.show_route(data=data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        del result
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "case": case,
+        "version": version,
+        "size": size,
+        "lines": len(data),
+        "seconds": best,
+        "lines_per_second": len(data) / best,
+        "items_per_second": size / best,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": peak_rss / 1024,
+        "parse_rss_mb": (peak_rss - base_rss) / 1024,
+    }
+
+
+def compare(results: list[dict[str, Any]], baseline: list[dict[str, Any]], tolerance: float) -> list[str]:
+    """Return the regressions of the results compared to a baseline."""
+
+    previous = {(x["case"], x["version"], x["size"]): x for x in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get((result["case"], result["version"], result["size"]))
+        if not base:
+            continue
+        if result["lines_per_second"] < base["lines_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{result['case']} v{result['version']} {result['size']}: "
+                f"{result['lines_per_second']:,.0f} lines/s, was {base['lines_per_second']:,.0f} lines/s"
+            )
+        if result["parse_rss_mb"] > base["parse_rss_mb"] * (1 + tolerance) + 1:
+            regressions.append(
+                f"{result['case']} v{result['version']} {result['size']}: "
+                f"{result['parse_rss_mb']:,.1f} MB parse RSS, was {base['parse_rss_mb']:,.1f} MB"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks."""
+
+    parser = argparse.ArgumentParser(description="Benchmark the BirdClient parsers.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma separated prefix or protocol counts")
+    parser.add_argument("--versions", default="2,3", help="Comma separated BIRD versions to generate output for")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma separated cases to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times to run each case, the best is reported")
+    parser.add_argument("--save", help="Save the results to a JSON file")
+    parser.add_argument("--compare", help="Compare the results to a JSON file saved previously")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression as a fraction (default: %(default)s)")
+    args = parser.parse_args()
+
+    sizes = [int(x) for x in args.sizes.split(",")]
+    versions = [int(x) for x in args.versions.split(",")]
+    cases = args.cases.split(",")
+
+    print(  # noqa: T201
+        f"{'case':<18} {'ver':>3} {'size':>8} {'lines':>9} {'seconds':>8} {'lines/s':>10} {'items/s':>10} "
+        f"{'peak MB':>8} {'parse MB':>8}"
+    )
+    results = []
+    # Use a fresh process for each case so the peak RSS of one case doesn't hide that of the next
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        for version in versions:
+            for size in sizes:
+                with context.Pool(1) as pool:
+                    result = pool.apply(run_case, (case, version, size, args.repeat))
+                results.append(result)
+                print(  # noqa: T201
+                    f"{case:<18} {version:>3} {size:>8} {result['lines']:>9} {result['seconds']:>8.3f} "
+                    f"{result['lines_per_second']:>10,.0f} {result['items_per_second']:>10,.0f} "
+                    f"{result['peak_rss_mb']:>8.1f} {result['parse_rss_mb']:>8.1f}"
+                )
+
+    if args.save:
+        with pathlib.Path(args.save).open("w", encoding="UTF-8") as resultfile:
+            json.dump(results, resultfile, indent=2)
+
+    if args.compare:
+        with pathlib.Path(args.compare).open(encoding="UTF-8") as basefile:
+            regressions = compare(results, json.load(basefile), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")  # noqa: T201
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
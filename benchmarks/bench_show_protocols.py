@@ -0,0 +1,53 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark parsing 'show protocols all' output for a large route server.
+
+Run with: PYTHONPATH=src python -m benchmarks.bench_show_protocols [protocols]
+"""
+
+import sys
+import time
+
+from birdclient import BirdClient
+
+from .synthetic import BirdOutputGenerator
+
+
+def main() -> None:
+    """Run the benchmark."""
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    data = list(BirdOutputGenerator().protocols(count))
+    birdclient = BirdClient()
+
+    # Run a few times and take the best, to reduce noise
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        result = birdclient.show_protocols(data=data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"Protocols: {len(result)}, lines: {len(data)}")  # noqa: T201
+    print(f"Parse time: {best:.3f}s, {len(data) / best:,.0f} lines/s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
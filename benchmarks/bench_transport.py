@@ -0,0 +1,83 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark the BIRD control socket transport against a fake BIRD server.
+
+Run with: PYTHONPATH=src python -m benchmarks.bench_transport [routes]
+"""
+
+import sys
+import time
+
+from birdclient import BirdClient
+
+from .fakebird import FakeBirdServer
+from .synthetic import BirdOutputGenerator
+
+
+def main() -> None:
+    """Run the benchmark."""
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = list(BirdOutputGenerator().routes(count))
+    replies = {
+        "show route table master4 all": data,
+        "show route for 100.64.0.1 all": ["1007-Table master4:", data[2], data[3], "0000 "],
+    }
+
+    # Receiving a large table with different chunk sizes
+    print(f"Routes: {count}, lines: {len(data)}")  # noqa: T201
+    print(f"{'chunk size':>10} {'seconds':>8} {'lines/s':>10} {'prefixes/s':>10}")  # noqa: T201
+    for chunk_size in (512, 4096, 65536):
+        with FakeBirdServer(replies, chunk_size=chunk_size) as server:
+            birdclient = BirdClient(server.path)
+            start = time.perf_counter()
+            routes = sum(1 for _ in birdclient.show_route_table_iter("master4"))
+            elapsed = time.perf_counter() - start
+        print(f"{chunk_size:>10} {elapsed:>8.3f} {len(data) / elapsed:>10,.0f} {routes / elapsed:>10,.0f}")  # noqa: T201
+
+    # Parsing a table BIRD sends slowly, with the parser receiving the reply itself and with a reader thread receiving ahead of it
+    print(f"\n{'read ahead':>10} {'seconds':>8} {'prefixes/s':>10}")  # noqa: T201
+    with FakeBirdServer(replies, chunk_size=16384, delay=0.002) as server:
+        for read_ahead in (0, 4, 16):
+            birdclient = BirdClient(server.path, read_ahead=read_ahead)
+            start = time.perf_counter()
+            routes = sum(1 for _ in birdclient.show_route_table_iter("master4"))
+            elapsed = time.perf_counter() - start
+            print(f"{read_ahead:>10} {elapsed:>8.3f} {routes / elapsed:>10,.0f}")  # noqa: T201
+
+    # Many small queries, with a new connection for each, and pipelined over one connection
+    queries = ["show route for 100.64.0.1 all"] * 1000
+    print(f"\n{'small queries':<20} {'seconds':>8} {'queries/s':>10}")  # noqa: T201
+    with FakeBirdServer(replies) as server:
+        birdclient = BirdClient(server.path)
+        start = time.perf_counter()
+        for query in queries:
+            birdclient.query(query)
+        elapsed = time.perf_counter() - start
+        print(f"{'connection each':<20} {elapsed:>8.3f} {len(queries) / elapsed:>10,.0f}")  # noqa: T201
+
+        start = time.perf_counter()
+        birdclient.query_many(queries)
+        elapsed = time.perf_counter() - start
+        print(f"{'pipelined':<20} {elapsed:>8.3f} {len(queries) / elapsed:>10,.0f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Local stand-in for the BIRD control socket.
+
+FakeBirdServer listens on a unix socket in a temporary directory, sends the BIRD greeting on connect and replays canned replies
+to queries. The way replies are sent can be controlled to exercise the client receive loop, with chunk sizes, delays between
+chunks, slow start, disconnects part way through a reply and queries which are never answered.
+"""
+
+import pathlib
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Mapping
+from types import TracebackType
+from typing import Self
+
+__all__ = ["FakeBirdServer"]
+
+
+# Reply sent by BIRD for commands it doesn't understand
+SYNTAX_ERROR = ["9001 syntax error, unexpected CF_SYM_UNDEFINED"]
+
+
+class _FakeBirdHandler(socketserver.StreamRequestHandler):
+    """Handle a connection to the fake BIRD server."""
+
+    server: "_FakeBirdUnixServer"
+
+    def handle(self) -> None:
+        """Send the greeting and answer queries until the client disconnects."""
+
+        fake = self.server.fake
+        fake.connected()
+        self._send(f"0001 BIRD {fake.version} ready.\n".encode(), disconnect=False)
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            query = line.decode("UTF-8").strip()
+            reply = fake.reply(query)
+            # A reply of None means we never answer, wait for the client to give up
+            if reply is None:
+                while self.rfile.readline():
+                    pass
+                return
+            try:
+                if not self._send(reply.encode(), disconnect=True):
+                    return
+            except (BrokenPipeError, ConnectionResetError):
+                # The client closed the connection part way through the reply
+                fake.abort()
+                return
+
+    def _send(self, data: bytes, *, disconnect: bool) -> bool:
+        """Send data in chunks as configured, returning False if we disconnected part way through."""
+
+        fake = self.server.fake
+        size = fake.slow_start or fake.chunk_size
+        sent = 0
+        while sent < len(data):
+            end = sent + size
+            if disconnect and fake.disconnect_after is not None and end >= fake.disconnect_after:
+                self.wfile.write(data[sent : fake.disconnect_after])
+                self.wfile.flush()
+                return False
+            self.wfile.write(data[sent:end])
+            self.wfile.flush()
+            sent = end
+            if fake.delay:
+                time.sleep(fake.delay)
+            # Double the chunk size each time during slow start
+            size = min(size * 2, fake.chunk_size)
+        return True
+
+
+class _FakeBirdUnixServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server with a reference back to our fake BIRD server."""
+
+    daemon_threads = True
+    fake: "FakeBirdServer"
+
+
+class FakeBirdServer:
+    """
+    Fake BIRD control socket server.
+
+    ``replies`` maps queries to the reply lines to send, or is a function returning the reply lines for a query. Queries with no
+    reply get a BIRD syntax error, a reply of None is never answered. Any greeting lines at the start of a reply are skipped, so
+    test fixtures can be used as is.
+
+    Replies are sent in chunks of ``chunk_size`` bytes with ``delay`` seconds between them. With ``slow_start`` the first chunk is
+    that many bytes, doubling each chunk up to ``chunk_size``. When ``disconnect_after`` is set the connection is closed after
+    sending that many bytes of a reply. Replies the client closes the connection part way through are counted in ``aborted``.
+    """
+
+    version: str
+    chunk_size: int
+    delay: float
+    slow_start: int
+    disconnect_after: int | None
+    # Queries received, in order
+    queries: list[str]
+    # Number of connections accepted
+    connections: int
+    # Number of replies the client stopped reading before the end
+    aborted: int
+
+    # Canned replies
+    _replies: Mapping[str, list[str] | None] | Callable[[str], list[str] | None]
+    # Temporary directory holding our socket
+    _tmpdir: pathlib.Path | None
+    # Server and the thread it runs in
+    _server: _FakeBirdUnixServer | None
+    _thread: threading.Thread | None
+    # Lock protecting our counters
+    _lock: threading.Lock
+
+    def __init__(  # noqa: PLR0913
+        self,
+        replies: Mapping[str, list[str] | None] | Callable[[str], list[str] | None] | None = None,
+        *,
+        version: str = "2.15.1",
+        chunk_size: int = 65536,
+        delay: float = 0.0,
+        slow_start: int = 0,
+        disconnect_after: int | None = None,
+    ) -> None:
+        """Initialize the object."""
+
+        self._replies = replies if replies is not None else {}
+        self.version = version
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self.slow_start = slow_start
+        self.disconnect_after = disconnect_after
+        self.queries = []
+        self.connections = 0
+        self.aborted = 0
+        self._tmpdir = None
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        """Start the server when used as a context manager."""
+        self.start()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Stop the server when leaving the context."""
+        self.stop()
+
+    @property
+    def path(self) -> str:
+        """Return the path of our unix socket."""
+
+        if not self._tmpdir:
+            raise RuntimeError("Fake BIRD server is not running")
+        return str(self._tmpdir / "bird.ctl")
+
+    def start(self) -> None:
+        """Start listening."""
+
+        self._tmpdir = pathlib.Path(tempfile.mkdtemp(prefix="fakebird-"))
+        self._server = _FakeBirdUnixServer(self.path, _FakeBirdHandler)
+        self._server.fake = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="fakebird", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop listening and remove our socket."""
+
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._tmpdir:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def connected(self) -> None:
+        """Record a new connection."""
+
+        with self._lock:
+            self.connections += 1
+
+    def abort(self) -> None:
+        """Record a reply the client stopped reading."""
+
+        with self._lock:
+            self.aborted += 1
+
+    def reply(self, query: str) -> str | None:
+        """Return the reply to send for a query."""
+
+        with self._lock:
+            self.queries.append(query)
+
+        lines = self._replies(query) if callable(self._replies) else self._replies.get(query, SYNTAX_ERROR)
+        if lines is None:
+            return None
+
+        # Skip the greeting, we send that when the client connects
+        start = 0
+        while start < len(lines) and lines[start].startswith("0001 "):
+            start += 1
+        return "".join(f"{line}\n" for line in lines[start:])
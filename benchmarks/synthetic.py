@@ -0,0 +1,352 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Deterministic generator of synthetic BIRD 2.x and 3.x control socket output.
+
+The output is modelled on the test fixtures, the same seed always produces the same output so results can be compared between
+runs.
+"""
+
+import ipaddress
+import random
+from collections.abc import Iterator
+
+__all__ = ["ROUTE_KINDS", "BirdOutputGenerator"]
+
+
+# Kinds of routes we can generate
+ROUTE_KINDS = ("bgp", "ospf", "rip", "kernel", "static", "roa")
+
+# BIRD version with the BIRD 2 output format, the other supported version is BIRD 3
+_BIRD2 = 2
+# IP version of IPv4 addresses
+_IPV4 = 4
+# Address bits and address class by IP version
+_ADDRESS_BITS = {4: 32, 6: 128}
+_ADDRESS_CLASSES = {4: ipaddress.IPv4Address, 6: ipaddress.IPv6Address}
+
+# Prefix lengths to pick from, weighted towards the most common lengths in a full table
+_PREFIX_LENGTHS = {4: (16, 19, 20, 21, 22, 22, 23, 24, 24, 24, 24, 24), 6: (29, 32, 32, 36, 40, 44, 48, 48, 48, 48)}
+
+
+class BirdOutputGenerator:
+    """
+    Generate synthetic BIRD output.
+
+    ``version`` is the major BIRD version to mimic, 2 or 3, which changes the greeting and the way route attributes are output.
+    """
+
+    # Major BIRD version
+    _version: int
+    # Random number generator
+    _rand: random.Random
+    # Internal route id used by BIRD 3
+    _route_id: int
+
+    def __init__(self, version: int = 2, seed: int = 1) -> None:
+        """Initialize the object."""
+
+        if version not in (2, 3):
+            raise ValueError(f"BIRD version must be 2 or 3, not {version}")
+
+        self._version = version
+        self._rand = random.Random(seed)  # noqa: S311
+        self._route_id = 0
+
+    @property
+    def greeting(self) -> str:
+        """Return the greeting BIRD sends on connection."""
+        return "0001 BIRD 2.15.1 ready." if self._version == _BIRD2 else "0001 BIRD 3.0.1 ready."
+
+    def routes(
+        self, count: int, *, kind: str = "bgp", family: int = 4, table: str | None = None, max_sources: int = 1
+    ) -> Iterator[str]:
+        """
+        Yield 'show route table <table> all' output with the number of prefixes given.
+
+        Each prefix has between 1 and ``max_sources`` routes from different protocols, the first of which is the best route. ROAs
+        always have a single route.
+        """
+
+        if kind not in ROUTE_KINDS:
+            raise ValueError(f"Route kind must be one of {', '.join(ROUTE_KINDS)}, not '{kind}'")
+
+        table = table or f"t_{kind}{family}"
+        yield self.greeting
+        yield f"1007-Table {table}:"
+        for num, prefix in enumerate(self.prefixes(count, family=family)):
+            # ROAs are separate networks in BIRD, so there is only ever one per line
+            sources = 1 if kind == "roa" else self._rand.randint(1, max_sources)
+            for source in range(sources):
+                # Routes for the same prefix after the first leave the prefix out
+                if source:
+                    lead = f"1007-{'':<20}"
+                elif num:
+                    lead = f"1007-{prefix:<20}"
+                else:
+                    lead = f" {prefix:<20}"
+                yield from getattr(self, f"_route_{kind}")(lead, prefix, family, source)
+        yield "0000 "
+
+    def protocols(self, count: int, *, details: bool = True) -> Iterator[str]:
+        """Yield 'show protocols all' output with the number of BGP protocols given, along with a few other protocols."""
+
+        yield self.greeting
+        yield "2002-Name       Proto      Table      State  Since         Info"
+        yield "1002-device1    Device     ---        up     2019-09-01 13:13:28  "
+        yield " ospf4      OSPF       t_ospf4    up     2019-09-01 13:13:28  Running"
+        yield " p_ospf4_to_kernel4 Pipe       ---        up     2019-09-01 13:13:28  t_ospf4 <=> t_kernel4"
+        for num in range(count):
+            asn = 64512 + num
+            address = f"100.{64 + num // 65536}.{(num // 256) % 256}.{num % 256}"
+            if num % 10:
+                yield f" bgp4_AS{asn}_peer BGP        ---        up     2023-12-04 22:25:36  Established"
+                state = "Established"
+            else:
+                yield (
+                    f" bgp4_AS{asn}_peer BGP        ---        start  2023-12-06 14:26:45  Active        Socket: Connection refused"
+                )
+                state = "Active"
+            if not details:
+                continue
+            imported = self._rand.randrange(100000)
+            exported = self._rand.randrange(1000)
+            yield from [
+                f"1006-  Description:    AS{asn} peer - {asn}::peer::peering@example.com",
+                "       VRF:            default",
+                f"       BGP state:          {state}",
+                f"         Neighbor address: {address}",
+                f"         Neighbor AS:      {asn}",
+                "         Local AS:         65001",
+                f"         Neighbor ID:      {address}",
+                "         Local capabilities",
+                "           Multiprotocol",
+                "             AF announced: ipv4",
+                "           Route refresh",
+                "           4-octet AS numbers",
+                "         Session:          external AS4",
+                "         Source address:   100.64.20.2",
+                "         Hold timer:       129.907/180",
+                "         Keepalive timer:  20.911/60",
+                "       Channel ipv4",
+                "         State:          UP",
+                f"         Table:          t_bgp4_AS{asn}_peer",
+                "         Preference:     100",
+                f"         Input filter:   f_bgp_AS{asn}_peer_import",
+                f"         Output filter:  f_bgp_AS{asn}_peer_export",
+                "         Import limit:   400000",
+                "           Action:       restart",
+                f"         Routes:         {imported} imported, {exported} exported, {imported} preferred",
+                "         Route change stats:     received   rejected   filtered    ignored   accepted",
+                f"           Import updates:        {imported:>7}          0          0          0    {imported:>7}",
+                "           Import withdraws:            7          0        ---          0          7",
+                f"           Export updates:        {exported:>7}          0          0        ---    {exported:>7}",
+                "           Export withdraws:            7        ---        ---        ---          0",
+                "         BGP Next hop:   100.64.20.2",
+                "         IGP IPv4 table: master4",
+                "",
+            ]
+        yield "0000 "
+
+    def prefixes(self, count: int, *, family: int = 4) -> Iterator[str]:
+        """Yield the number of unique random prefixes given."""
+
+        bits = _ADDRESS_BITS[family]
+        address_class = _ADDRESS_CLASSES[family]
+        seen = set()
+        while len(seen) < count:
+            length = self._rand.choice(_PREFIX_LENGTHS[family])
+            network = self._rand.getrandbits(bits) & ~((1 << (bits - length)) - 1)
+            if address_class is ipaddress.IPv6Address:
+                # Keep to global unicast space
+                network = (0x1 << 125) | (network >> 3)
+                network &= ~((1 << (bits - length)) - 1)
+            if (network, length) in seen:
+                continue
+            seen.add((network, length))
+            yield f"{address_class(network)}/{length}"
+
+    def _gateway(self, family: int) -> str:
+        """Return a random gateway address."""
+
+        if family == _IPV4:
+            return f"100.64.{self._rand.randrange(4)}.{self._rand.randrange(1, 16)}"
+        return f"fc20::{self._rand.randrange(1, 16):x}"
+
+    def _since(self) -> str:
+        """Return a random 'since' timestamp."""
+        return f"2024-04-{self._rand.randint(1, 30):02d} {self._rand.randrange(24):02d}:{self._rand.randrange(60):02d}:14"
+
+    def _internal(self) -> str:
+        """Return the BIRD 3 internal route handling line."""
+
+        self._route_id += 1
+        return f"1008-     Internal route handling values: 0L 20G 0S id {self._route_id}"
+
+    def _route_bgp(self, lead: str, _prefix: str, family: int, source: int) -> list[str]:
+        """Return the lines for a BGP route."""
+
+        rand = self._rand
+        gateway = self._gateway(family)
+        peer = 65000 + rand.randrange(1, 32)
+        as_path = [str(peer)] + [str(rand.randrange(1, 400000)) for _ in range(rand.randrange(0, 6))]
+        communities = [f"({peer},{rand.randrange(1000)})" for _ in range(rand.randrange(0, 5))]
+        ext_communities = [f"(rt, {peer}, {rand.randrange(100)})" for _ in range(rand.randrange(0, 2))]
+        large_communities = [f"({peer}, {rand.randrange(1, 8)}, {rand.randrange(1000)})" for _ in range(rand.randrange(0, 4))]
+        best = "" if source else " *"
+        local_pref = 100 + 50 * rand.randrange(8)
+
+        if self._version == _BIRD2:
+            lines = [
+                f"{lead} unicast [bgp_AS{peer}_peer{family} {self._since()} from {gateway}]{best} (100) [AS{as_path[-1]}i]",
+                f" \tvia {gateway} on eth0",
+                "1008-\tType: BGP univ",
+                "1012-\tBGP.origin: IGP",
+                f" \tBGP.as_path: {' '.join(as_path)}",
+                f" \tBGP.next_hop: {gateway}",
+                f" \tBGP.local_pref: {local_pref}",
+            ]
+            if communities:
+                lines.append(f" \tBGP.community: {' '.join(communities)}")
+            if ext_communities:
+                lines.append(f" \tBGP.ext_community: {' '.join(ext_communities)}")
+            if large_communities:
+                lines.append(f" \tBGP.large_community: {' '.join(large_communities)}")
+            return lines
+
+        lines = [
+            f"{lead} unicast [bgp_AS{peer}_peer{family} {self._since()}]{best} (100) [AS{as_path[-1]}i]",
+            f"  via {gateway} on eth0",
+            "1012-     preference: 100",
+            "  igp_metric: 0",
+            f"  from: {gateway}",
+            "  source: BGP",
+            "  bgp_origin: IGP",
+            f"  bgp_path: {' '.join(as_path)}",
+            f"  bgp_next_hop: {gateway}",
+            f"  bgp_local_pref: {local_pref}",
+        ]
+        if communities:
+            lines.append(f"  bgp_community: {' '.join(communities)}")
+        if ext_communities:
+            lines.append(f"  bgp_ext_community: {' '.join(ext_communities)}")
+        if large_communities:
+            lines.append(f"  bgp_large_community: {' '.join(large_communities)}")
+        lines.append(self._internal())
+        return lines
+
+    def _route_ospf(self, lead: str, prefix: str, family: int, source: int) -> list[str]:  # noqa: ARG002
+        """Return the lines for an OSPF route."""
+
+        gateway = self._gateway(family)
+        metric = self._rand.randrange(1, 20) * 10
+        router_id = f"0.0.0.{self._rand.randrange(1, 255)}"
+        best = "" if source else " *"
+        if self._version == _BIRD2:
+            return [
+                f"{lead} unicast [ospf{family} {self._since()}]{best} I (150/{metric}) [{router_id}]",
+                f" \tvia {gateway} on eth0",
+                "1008-\tType: OSPF univ",
+                f"1012-\tOSPF.metric1: {metric}",
+                f" \tOSPF.router_id: {router_id}",
+            ]
+        return [
+            f"{lead} unicast [ospf{family} {self._since()}]{best} I (150/{metric}) [{router_id}]",
+            f"  via {gateway} on eth0",
+            "1012-     preference: 150",
+            "  source: OSPF",
+            f"  ospf_metric1: {metric}",
+            f"  ospf_router_id: {router_id}",
+            self._internal(),
+        ]
+
+    def _route_rip(self, lead: str, prefix: str, family: int, source: int) -> list[str]:  # noqa: ARG002
+        """Return the lines for a RIP route."""
+
+        gateway = self._gateway(family)
+        metric = self._rand.randrange(1, 16)
+        best = "" if source else " *"
+        if self._version == _BIRD2:
+            return [
+                f"{lead} unicast [rip{family} {self._since()}]{best} (120/{metric})",
+                f" \tvia {gateway} on eth0",
+                "1008-\tType: RIP univ",
+                "1012-\tRIP.tag: 0000",
+            ]
+        return [
+            f"{lead} unicast [rip{family} {self._since()}]{best} (120/{metric})",
+            f"  via {gateway} on eth0",
+            "1012-     preference: 120",
+            "  source: RIP",
+            f"  rip_metric: {metric}",
+            "  rip_tag: 0000",
+            self._internal(),
+        ]
+
+    def _route_kernel(self, lead: str, prefix: str, family: int, source: int) -> list[str]:  # noqa: ARG002
+        """Return the lines for a kernel route."""
+
+        gateway = self._gateway(family)
+        best = "" if source else " *"
+        if self._version == _BIRD2:
+            return [
+                f"{lead} unicast [kernel{family} {self._since()}]{best} (10)",
+                f" \tvia {gateway} on eth9",
+                "1008-\tType: inherit univ",
+            ]
+        return [
+            f"{lead} unicast [kernel{family} {self._since()}]{best} (10)",
+            f"  via {gateway} on eth9",
+            "1012-     preference: 10",
+            "  source: inherit",
+            "  krt_source: 3",
+            "  krt_metric: 0",
+            self._internal(),
+        ]
+
+    def _route_static(self, lead: str, prefix: str, family: int, source: int) -> list[str]:  # noqa: ARG002
+        """Return the lines for a static route."""
+
+        gateway = self._gateway(family)
+        best = "" if source else " *"
+        if self._version == _BIRD2:
+            return [
+                f"{lead} unicast [static{family} {self._since()}]{best} (200)",
+                f" \tvia {gateway} on eth0",
+                "1008-\tType: static univ",
+            ]
+        return [
+            f"{lead} unicast [static{family} {self._since()}]{best} (200)",
+            f"  via {gateway} on eth0",
+            "1012-     preference: 200",
+            "  source: static",
+            self._internal(),
+        ]
+
+    def _route_roa(self, lead: str, prefix: str, family: int, source: int) -> list[str]:  # noqa: ARG002
+        """Return the lines for a ROA."""
+
+        # ROAs have the max length added to the prefix
+        length = int(prefix.split("/")[1]) + self._rand.randrange(3)
+        roa = f"{prefix}-{min(length, _ADDRESS_BITS[family])}"
+        lead = f"{lead[:-20]}{roa:<20}"
+        line = f"{lead} AS{self._rand.randrange(64512, 65534)}  [rpki{family} {self._since()}] * (200)"
+        if self._version == _BIRD2:
+            return [line, "1008-\tType: static univ"]
+        return [line, "1012-     preference: 200", "  source: static", self._internal()]
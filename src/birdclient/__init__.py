@@ -23,19 +23,676 @@
 
 """BIRD client class."""
 
+import concurrent.futures
+import datetime as dt
+import functools
+import importlib
+import ipaddress
+import itertools
+import logging
+import os
 import pathlib
 import re
-import socket
-from typing import Any
-
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sized
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from .addresses import address_converter, prefix_converter, prefix_to_str
+from .connection import BirdConnection, BirdConnectionPool, RawCapture
 from .exceptions import BirdClientError, BirdClientNotFoundError, BirdClientParseError
+from .inputs import ReplyData, iter_lines
+from .lookup import RouteLookupCache
+from .observers import Observer, QueryTiming, TimingAggregator
+from .sinks import RouteSink
+from .timestamps import BirdTimestamp, since_converter
 from .version import __version__
-
-__all__ = ["BirdClient", "BirdClientError", "BirdClientNotFoundError", "BirdClientParseError", "__version__"]
-
+from .visitor import RouteVisitor
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .history import RouteHistory
+    from .index import RouteIndex
+    from .metrics import BirdMetrics
+    from .rpki import RoaTable
+    from .snapshot import RouteSnapshot
+    from .stats import RouteStats
+    from .watcher import ProtocolEvent, ProtocolWatcher
+
+__all__ = [
+    "BirdClient",
+    "BirdClientError",
+    "BirdClientNotFoundError",
+    "BirdClientParseError",
+    "BirdConnection",
+    "BirdConnectionPool",
+    "BirdMetrics",
+    "BirdTimestamp",
+    "ProtocolEvent",
+    "ProtocolWatcher",
+    "QueryTiming",
+    "RawCapture",
+    "ReplyData",
+    "RoaTable",
+    "RouteHistory",
+    "RouteIndex",
+    "RouteLookupCache",
+    "RouteSink",
+    "RouteSnapshot",
+    "RouteStats",
+    "RouteVisitor",
+    "TimingAggregator",
+    "__version__",
+]
+
+
+# Modules of the classes only some users need, imported when first used so importing the package doesn't pull in sqlite3,
+# http.server and the like
+_LAZY_IMPORTS = {
+    "BirdMetrics": "metrics",
+    "ProtocolEvent": "watcher",
+    "ProtocolWatcher": "watcher",
+    "RoaTable": "rpki",
+    "RouteHistory": "history",
+    "RouteIndex": "index",
+    "RouteSnapshot": "snapshot",
+    "RouteStats": "stats",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import the classes in _LAZY_IMPORTS when they are first used."""
+
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+# Default route of each address family, covering the whole address space
+_FAMILY_DEFAULT_ROUTES = {4: "0.0.0.0/0", 6: "::/0"}
+
+# Prefix lengths addresses are grouped by in each round of route lookups for each IP version, one address per group is looked up
+# each round and the rest of the group is looked up in the next round, unless the prefix it resolved to covers them
+_LOOKUP_ROUND_PREFIXLENS = {4: (8, 16, 24, 32), 6: (16, 32, 48, 128)}
+_ADDRESS_BITS = {4: 32, 6: 128}
 
 # Regex matches
 _SINCE_MATCH = r"(?P<since>(?:[0-9]{4}-[0-9]{2}-[0-9]{2} )?[0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]{1,3})?)"
+_ROUTE_COUNT_MATCH = re.compile(
+    r"^(?:[0-9]{4}[\- ])?(?:Total: )?"
+    r"(?P<routes>\d+) of (?P<routes_total>\d+) routes for (?P<networks>\d+) networks"
+    r"(?: in table (?P<table>\S+)| in (?P<tables>\d+) tables)?$"
+)
+
+_PROTOCOL_SUMMARY_MATCH = re.compile(
+    r"^(?:1002-| )"
+    r"(?P<name>\S+)\s+"
+    r"(?P<proto>\S+)\s+"
+    r"(?P<table>\S+)\s+"
+    r"(?P<state>\S+)\s+" + _SINCE_MATCH + r"\s+"
+    r"(?P<info>\S+)?\s*"
+    r"(?P<info_extra>.*)?"
+)
+
+# Route lines
+_ROUTE_CODE_MATCH = re.compile(r"^(?P<code>[0-9]{4})-?\s*(?P<line>.*)$")
+_ROUTE_ROA4_PREFIX_MATCH = re.compile(r"^\s*(?P<prefix>[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\/[0-9]{1,2})(?P<line>-.+)$")
+_ROUTE_ROA6_PREFIX_MATCH = re.compile(r"^\s*(?P<prefix>[a-f0-9:]+\/[0-9]{1,3})(?P<line>-.+)$")
+_ROUTE_PREFIX4_MATCH = re.compile(r"^\s*(?P<prefix>[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\/[0-9]{1,2})\s+(?P<line>.+)$")
+_ROUTE_PREFIX6_MATCH = re.compile(r"^\s*(?P<prefix>[a-f0-9:]+\/[0-9]{1,3})\s+(?P<line>.+)$")
+_ROUTE_ROA_MATCH = re.compile(
+    r"^\-(?P<max>[0-9]+)\s+AS(?P<asn>[0-9]+)"
+    r"\s+\[(?P<protocol>\S+) " + _SINCE_MATCH + r"\] "
+    r"(?:(?P<bestpath>\*) )?"
+    r"\((?P<pref>\d+)\)$"
+)
+_ROUTE_SOURCE_MATCH = re.compile(
+    r"^(?P<prefix_type>[a-z]+) "
+    r"\[(?P<protocol>\S+) " + _SINCE_MATCH + r"\] "
+    r"(?:(?P<bestpath>\*) )?"
+    r"\((?P<pref>\d+)\)$"
+)
+_ROUTE_BGP_MATCH = re.compile(
+    r"^(?P<prefix_type>[a-z]+) "
+    r"\["
+    r"(?P<protocol>\S+) " + _SINCE_MATCH + r"(?: from (?P<from>[a-z0-9\.:]+))?"
+    r"\] "
+    r"(?:(?P<bestpath>\*) )?"
+    r"\((?P<pref>\d+)(?:/(?P<metric>\d+|[-?]))?\) "
+    r"\["
+    r"(?P<asn>AS[0-9]+)?"
+    r"(?P<bgp_type>[ie\?])"
+    r"\]$"
+)
+_ROUTE_OSPF_MATCH = re.compile(
+    r"^(?P<prefix_type>[a-z]+) "
+    r"\[(?P<protocol>\S+)\s+" + _SINCE_MATCH + r"\] "
+    r"(?:(?P<bestpath>\*) )?"
+    r"(?P<ospf_type>(?:I|IA|E1|E2)) "
+    r"\((?P<pref>\d+)/(?P<metric1>\d+)(?:/(?P<metric2>\d+))?\)"
+    r"(?: \[(?P<tag>[0-9a-f]+)\])?"
+    r"(?: \[(?P<router_id>[0-9\.]+)\])$"
+)
+_ROUTE_RIP_MATCH = re.compile(
+    r"^(?P<prefix_type>[a-z]+) "
+    r"\[(?P<protocol>\S+)\s+" + _SINCE_MATCH + r"\] "
+    r"(?:(?P<bestpath>\*) )?"
+    r"\((?P<pref>\d+)/(?P<metric1>\d+)\)$"
+)
+_ROUTE_VIA_MATCH = re.compile(
+    r"^\s+via\s+"
+    r"(?P<gateway>\S+)\s+"
+    r"on (?P<interface>\S+)"
+    r"(?: mpls (?P<mpls>[0-9/]+))?"
+    r"(?: (?P<onlink>onlink))?"
+    r"(?: weight (?P<weight>[0-9]+))?$"
+)
+_ROUTE_DEV_MATCH = re.compile(
+    r"^\s+dev (?P<interface>\S+)"
+    r"(?: mpls (?P<mpls>[0-9/]+))?"
+    r"(?: (?P<onlink>onlink))?"
+    r"(?: weight (?P<weight>[0-9]+))?$"
+)
+_ROUTE_TYPE_MATCH = re.compile(r"^\s*Type: (?P<route_type>.+)$")
+_ROUTE_INTERNAL_MATCH = re.compile(r"^\s*Internal route handling values: (?P<value>.+)$")
+_ROUTE_ATTRIBUTE_MATCH = re.compile(r"^\s*(?P<attrib>[A-Za-z0-9\._]+): ?(?P<value>.*)$")
+_ROUTE_ATTRIBUTE_CONTINUED_MATCH = re.compile(r"^ \t\t(?P<value>.*)$")
+
+
+def _protocol_field(name: str, convert: Callable[[str], Any]) -> Callable[[dict[str, Any], str], None]:
+    """Return a handler setting a protocol field from the first word of a value."""
+
+    def handler(protocol: dict[str, Any], value: str) -> None:
+        words = value.split(maxsplit=1)
+        if words:
+            protocol[name] = convert(words[0])
+
+    return handler
+
+
+def _protocol_last_error(protocol: dict[str, Any], value: str) -> None:
+    """Set the protocol last error."""
+    protocol["last_error"] = value.strip().lower()
+
+
+def _route_counts(value: str) -> dict[str, int]:
+    """Return the route counts from a value like '70 imported, 3 filtered, 24 exported, 70 preferred'."""
+
+    counts = {}
+    for item in value.split(","):
+        count, _, kind = item.strip().partition(" ")
+        if count.isdigit():
+            counts[kind] = int(count)
+    return counts
+
+
+def _protocol_routes(protocol: dict[str, Any], value: str) -> None:
+    """Set the protocol route counts."""
+
+    counts = _route_counts(value)
+    if "imported" in counts and "exported" in counts:
+        protocol["routes_imported"] = counts["imported"]
+        protocol["routes_exported"] = counts["exported"]
+
+
+def _channel_routes(channel: dict[str, Any], value: str) -> None:
+    """Set all the channel route counts."""
+
+    for kind, count in _route_counts(value).items():
+        channel[f"routes_{kind}"] = count
+
+
+# Handlers for protocol detail lines, by the key before the ':'
+_PROTOCOL_FIELDS: dict[str, Callable[[dict[str, Any], str], None]] = {
+    "BGP state": _protocol_field("info", str.lower),
+    "Neighbor address": _protocol_field("neighbor_address", str),
+    "Neighbor AS": _protocol_field("neighbor_as", int),
+    "Local AS": _protocol_field("local_as", int),
+    "Last error": _protocol_last_error,
+    "Neighbor ID": _protocol_field("neighbor_id", str),
+    "Source address": _protocol_field("source_address", str),
+    "State": _protocol_field("state", str.lower),
+    "Table": _protocol_field("table", str),
+    "Preference": _protocol_field("preference", int),
+    "Input filter": _protocol_field("input_filter", str),
+    "Output filter": _protocol_field("output_filter", str),
+    "Import limit": _protocol_field("import_limit", int),
+    "Action": _protocol_field("import_limit_action", str),
+    "Routes": _protocol_routes,
+    "BGP Next hop": _protocol_field("bgp_nexthop", str),
+    "IGP IPv4 table": _protocol_field("igp_table", str),
+    "IGP IPv6 table": _protocol_field("igp_table", str),
+}
+
+# Handlers for channel detail lines, by the key before the ':'
+_CHANNEL_FIELDS: dict[str, Callable[[dict[str, Any], str], None]] = {
+    "State": _protocol_field("state", str.lower),
+    "Table": _protocol_field("table", str),
+    "Preference": _protocol_field("preference", int),
+    "Input filter": _protocol_field("input_filter", str),
+    "Output filter": _protocol_field("output_filter", str),
+    "Routes": _channel_routes,
+    "BGP Next hop": _protocol_field("bgp_nexthop", str),
+    "IGP IPv4 table": _protocol_field("igp_table", str),
+    "IGP IPv6 table": _protocol_field("igp_table", str),
+}
+# Channel limits, each followed by an 'Action' line
+_CHANNEL_LIMITS = {"Receive limit": "receive_limit", "Import limit": "import_limit", "Export limit": "export_limit"}
+# Channel route change statistics lines
+_CHANNEL_ROUTE_CHANGE_STATS = {
+    "Import updates": "import_updates",
+    "Import withdraws": "import_withdraws",
+    "Export updates": "export_updates",
+    "Export withdraws": "export_withdraws",
+}
+
+
+def _address_sort_key(address: str) -> tuple[int, int]:
+    """Return a key to sort addresses by."""
+
+    ip = ipaddress.ip_address(address)
+    return ip.version, int(ip)
+
+
+def _route_shards(prefix: str, bits: int) -> tuple[list[str], list[str]]:
+    """Split a prefix into 2^bits shards for use with 'show route in', along with the exact prefixes the shards don't cover."""
+
+    network = ipaddress.ip_network(prefix)
+    bits = min(bits, network.max_prefixlen - network.prefixlen)
+
+    # Shards for 'show route in', each one matches all networks within the shard
+    shards = [str(x) for x in network.subnets(prefixlen_diff=bits)]
+    # Networks shorter than the shards are not matched by any of them, so these need to be looked up exactly
+    exact = [str(x) for diff in range(bits) for x in network.subnets(prefixlen_diff=diff)]
+
+    return shards, exact
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _route_attribute(attrib: str, value: Any, address: Callable[[str], Any], line: str) -> Any:  # noqa: ANN401,C901,PLR0912,PLR0915
+    """Convert the value of a route attribute."""
+
+    # In bird 3.0.0 the attribute "from" was added
+    if attrib == "from":
+        value = address(value)
+    elif attrib == "hostentry":
+        pass
+
+    # In bird 3.0.0 the attribute "igp_metric" was added
+    elif attrib == "igp_metric":
+        value = int(value)
+
+    # In bird 3.0.0 the attribute "BGP.as_path" was renamed to "bgp_path"
+    elif attrib in ("BGP.as_path", "bgp_path"):
+        match_all = re.findall(r"(?P<as_path>\d+)\s*", value)
+        # Replace values if we have any
+        value = [int(x) for x in match_all]
+    # In bird 3.0.0 the attribute "BGP.ext_community" was renamed to "bgp_ext_community"
+    elif attrib in ("BGP.ext_community", "bgp_ext_community"):
+        match_all = re.findall(
+            r"\((?:unknown )?(?P<c1>(?:ro|rt|generic|(?:0x)?\d+)),\s*(?P<c2>(?:0x)?\d+),\s*(?P<c3>(?:0x)?\d+)\)\s*",
+            value,
+        )
+        value = []
+        if match_all:
+            for x in match_all:
+                if x[0] in ["ro", "rt"]:
+                    value.append((x[0], int(x[1]), int(x[2])))
+                else:
+                    # Check if we can convert any of the community values to integers
+                    try:
+                        x0 = int(x[0])
+                    except ValueError:
+                        x0 = x[0]
+                    try:
+                        x1 = int(x[1])
+                    except ValueError:
+                        x1 = x[1]
+                    try:
+                        x2 = int(x[2])
+                    except ValueError:
+                        x2 = x[2]
+                    value.append((x0, x1, x2))
+    # Special case for BGP.large_community
+    elif attrib in ("BGP.community", "bgp_community"):
+        match_all = re.findall(r"\((?P<c1>\d+),\s*(?P<c2>\d+)\)\s*", value)
+        value = []
+        if match_all:
+            value.extend([(int(x[0]), int(x[1])) for x in match_all])
+    # In bird 3.0.0 the attribute "BGP.large_community" was renamed to "bgp_large_community"
+    elif attrib in ("BGP.large_community", "bgp_large_community"):
+        match_all = re.findall(r"\((?P<lc1>\d+),\s*(?P<lc2>\d+),\s*(?P<lc3>\d+)\)\s*", value)
+        value = []
+        if match_all:
+            value.extend([(int(x[0]), int(x[1]), int(x[2])) for x in match_all])
+    # Special case for basic integers
+    elif attrib in ("BGP.local_pref", "bgp_local_pref"):
+        value = int(value)
+    # In bird 3.0.0 the attribute "BGP.next_hop" was renamed to "bgp_next_hop"
+    elif attrib in ("BGP.next_hop", "bgp_next_hop"):
+        value = [address(x) for x in value.split()]
+    # In bird 3.0.0 the attribute "BGP.origin" was renamed to "bgp_origin"
+    elif attrib in ("BGP.origin", "bgp_origin"):  # noqa: SIM114
+        # Normal string
+        pass
+    # In bird 3.0.0 the attribute "BGP.originator_id" was renamed to "bgp_originator_id"
+    elif attrib in ("BGP.originator_id", "bgp_originator_id"):  # noqa: SIM114
+        # Normal string
+        pass
+    # In bird 3.0.0 the attribute "BGP.cluster_list" was renamed to "bgp_cluster_list"
+    elif attrib in ("BGP.cluster_list", "bgp_cluster_list"):
+        # Normal string
+        pass
+
+    # NK: In bird 3.0.0 "ospf_metricX" and "ospf_metricX" was added
+    elif attrib in ("OSPF.metric1", "ospf_metric1", "OSPF.metric2", "ospf_metric2"):
+        value = int(value)
+    # NK: In bird 3.0.0 "OSPF.router_id" was renamed to "ospf_router_id"
+    elif attrib in ("OSPF.router_id", "ospf_router_id"):
+        # Normal string
+        pass
+    # NK: In bird 3.0.0 "OSPF.tag" was renamed to "ospf_tag"
+    elif attrib in ("OSPF.tag", "ospf_tag"):
+        # Tag is hex, so we treat it as a string
+        pass
+
+    # NK: In bird 3.0.0 "Kernel.scope" was renamed to "ktr_scope"
+    elif attrib in ("Kernel.scope", "krt_scope"):
+        # Translate kernel scope based on /etc/iproute2/rt_scopes
+        if value == "0":
+            value = "global"
+        elif value == "255":
+            value = "link"
+        elif value == "254":
+            value = "host"
+        elif value == "253":
+            value = "link"
+        elif value == "200":
+            value = "site"
+        else:
+            raise BirdClientParseError(f"Kernel scope '{value}' found and not understood: {line}")
+    # NK: In bird 3.0.0 "krt_metric" was added
+    elif attrib == "krt_metric":
+        value = int(value)
+    # NK: In bird 3.0.0 "Kernel.source" was renamed to "krt_source"
+    elif attrib in ("Kernel.source", "krt_source"):
+        # Translate kernel source into value
+        # https://github.com/BIRD/bird/blob/master/nest/route.h#L370
+        if value == "0":
+            value = "RTS_DUMMY"
+        elif value == "1":
+            value = "RTS_STATIC"
+        elif value == "2":
+            value = "RTS_INHERIT"
+        elif value == "3":
+            value = "RTS_DEVICE"
+        elif value == "4":
+            value = "RTS_STATIC_DEVICE"
+        elif value == "5":
+            value = "RTS_REDIRECT"
+        elif value == "6":
+            value = "RTS_RIP"
+        elif value == "7":
+            value = "RTS_OSPF"
+        elif value == "8":
+            value = "RTS_OSPF_IA"
+        elif value == "9":
+            value = "RTS_OSPF_EXT1"
+        elif value == "10":
+            value = "RTS_OSPF_EXT2"
+        elif value == "11":
+            value = "RTS_BGP"
+        elif value == "12":
+            value = "RTS_PIPE"
+        elif value == "13":
+            value = "RTS_BABEL"
+        else:
+            raise BirdClientParseError(f"Kernel source '{value}' found and not understood: {line}")
+    # NK: In bird 3.0.0 "RIP.tag" was renamed to "rip_tag"
+    elif attrib in ("RIP.tag", "rip_tag"):
+        # This is a string (HEX)
+        pass
+    # # NK: Bird quirk with 2.0.11, this is supposed to be hidden
+    # elif attrib == "RIP.02":  # noqa: ERA001
+    #     continue  # noqa: ERA001
+    # NK: "rip_metric" attribute introduced in 3.0.0
+    elif attrib == "rip_metric":  # noqa: SIM114
+        value = int(value)
+    # NK: "preference" attribute introduced in 3.0.0
+    elif attrib == "preference":
+        value = int(value)
+    # NK: "source" attribute introduced in 3.0.0
+    elif attrib == "source":
+        # Normal string value
+        pass
+    # Finally if we don't understand the attribute
+    else:
+        raise BirdClientParseError(f"Failed to parse code 1012 attribute '{attrib}': {line}")
+
+    return value
+
+
+def _visit_source_fields(match: re.Match[str], on_field: Callable[[str, Any], None], address: Callable[[str], Any]) -> None:
+    """Pass the fields of the first line of a source other than those passed to ``on_source()`` to a visitor."""
+
+    # ROA entries don't have a prefix type
+    if match.re is _ROUTE_ROA_MATCH:
+        on_field("ROA.max", int(match.group("max")))
+        on_field("ROA.asn", match.group("asn"))
+        return
+
+    on_field("prefix_type", match.group("prefix_type"))
+    if match.re is _ROUTE_BGP_MATCH:
+        bgp_from = match.group("from")
+        if bgp_from:
+            on_field("from", address(bgp_from))
+        metric = match.group("metric")
+        if metric:
+            on_field("metric", None if metric in ("-", "?") else int(metric))
+        asn = match.group("asn")
+        if asn:
+            on_field("asn", asn)
+        on_field("bgp_type", match.group("bgp_type"))
+    elif match.re is _ROUTE_OSPF_MATCH:
+        on_field("ospf_type", match.group("ospf_type"))
+        on_field("metric1", int(match.group("metric1")))
+        metric2 = match.group("metric2")
+        if metric2:
+            on_field("metric2", int(metric2))
+        tag = match.group("tag")
+        if tag:
+            on_field("tag", tag)
+        on_field("router_id", match.group("router_id"))
+    elif match.re is _ROUTE_RIP_MATCH:
+        on_field("metric1", int(match.group("metric1")))
+
+
+# Kinds of parts of 'show route' output yielded by _classify_route_lines()
+_LINE_ATTRIBUTE, _LINE_NEXTHOP, _LINE_SOURCE, _LINE_TYPE, _LINE_PREFIX, _LINE_TABLE, _LINE_END = range(7)
+
+
+def _classify_route_lines(data: Iterable[str]) -> Iterator[tuple[int, Any]]:  # noqa: C901,PLR0912
+    """
+    Classify the lines of 'show route' output, yielding the kind of each part of the routes along with its match.
+
+    Prefixes are yielded as a string, followed by the source on the rest of their line. Attribute lines are yielded as is, so they
+    can be skipped without being matched, ``_split_route_attribute()`` splits them into the attribute and its value.
+    """
+
+    code = ""
+    for _line in data:
+        line = _line
+        match = _ROUTE_CODE_MATCH.match(line)
+        if match:
+            code = match.group("code")
+            line = match.group("line")
+
+        # Pull off route attributes
+        if code == "1012":
+            yield _LINE_ATTRIBUTE, line
+            continue
+
+        # Route info
+        if code == "1007":
+            # Exclude the table line
+            if line.startswith("Table "):
+                yield _LINE_TABLE, line
+                continue
+
+            # Match the prefix at the start of the first line of a route, ROA prefixes are followed by their max length
+            for prefix_match in (_ROUTE_ROA4_PREFIX_MATCH, _ROUTE_ROA6_PREFIX_MATCH, _ROUTE_PREFIX4_MATCH, _ROUTE_PREFIX6_MATCH):
+                match = prefix_match.match(line)
+                if match:
+                    yield _LINE_PREFIX, match.group("prefix")
+                    line = match.group("line")
+                    break
+
+            # Grab the first line of a source
+            match = (
+                _ROUTE_ROA_MATCH.match(line)
+                or _ROUTE_SOURCE_MATCH.match(line)
+                or _ROUTE_BGP_MATCH.match(line)
+                or _ROUTE_OSPF_MATCH.match(line)
+                or _ROUTE_RIP_MATCH.match(line)
+            )
+            if match:
+                yield _LINE_SOURCE, match
+                continue
+
+            # Grab nexthop details via a gateway or a device
+            match = _ROUTE_VIA_MATCH.match(line) or _ROUTE_DEV_MATCH.match(line)
+            if match:
+                yield _LINE_NEXTHOP, match
+                continue
+
+        # Type
+        if code == "1008":
+            match = _ROUTE_TYPE_MATCH.match(line)
+            if match:
+                yield _LINE_TYPE, match
+                continue
+
+            # NK: Match "Internal route handling values: 0L 10G 0S id 1" attribute in 3.0.0, ignore for now
+            if _ROUTE_INTERNAL_MATCH.match(line):
+                continue
+
+            raise BirdClientParseError(f"Failed to parse type: {line}")
+
+        # End of output
+        if code == "0000":
+            yield _LINE_END, line
+            return
+
+        # Start of output
+        if code == "0001":
+            continue
+
+        # Check for errors
+        if code.startswith(("8", "9")):
+            raise BirdClientError(f"BIRD client error: {line}")
+
+        # If we didn't match the line, we need to raise an exception
+        raise BirdClientParseError(f"Failed to parse BIRD output: {line}")
+
+
+def _split_route_attribute(line: str, attrib: str) -> tuple[str, str]:
+    """Split a route attribute line into the attribute and its value, ``attrib`` is the attribute of the previous line."""
+
+    # Check if we match a second line in a multiline attribute, if we do we should have an attribute set
+    match = _ROUTE_ATTRIBUTE_CONTINUED_MATCH.match(line)
+    if match:
+        if not attrib:
+            raise BirdClientParseError(f"Failed to parse code 1012: {line}")
+        return attrib, match.group("value")
+
+    match = _ROUTE_ATTRIBUTE_MATCH.match(line)
+    if not match:
+        raise BirdClientParseError(f"Failed to parse code 1012: {line}")
+    return match.group("attrib"), match.group("value")
+
+
+class _ReplyPreview:
+    """Preview of a BIRD reply for logging, only formatted if the log message is output."""
+
+    __slots__ = ("_lines", "_max_chars", "_total")
+
+    def __init__(self, lines: list[str], total: int, max_chars: int) -> None:
+        """Initialize the object."""
+
+        self._lines = lines
+        self._total = total
+        self._max_chars = max_chars
+
+    def __str__(self) -> str:
+        """Return the preview."""
+
+        res = "\n".join(self._lines)
+        if len(res) > self._max_chars:
+            res = res[: self._max_chars] + "..."
+        if self._total > len(self._lines):
+            res += f"\n... {self._total - len(self._lines)} more lines"
+        return res
+
+
+def _query_text(query: str | list[str]) -> str:
+    """Return the text of a query."""
+    return " ".join(query) if isinstance(query, list) else query
+
+
+def _observed(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Report the timing of a BirdClient call to the client observers."""
+
+    @functools.wraps(func)
+    def wrapper(self: "BirdClient", *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        # Skip timing if nobody is observing, or if we're being called from within another observed call
+        if not self._observers or getattr(self._local, "timing", None):
+            return func(self, *args, **kwargs)
+
+        timing = QueryTiming(func.__name__)
+        self._local.timing = timing
+        started = time.perf_counter()
+        try:
+            res = func(self, *args, **kwargs)
+            if isinstance(res, Sized):
+                timing.result_size = len(res)
+        except Exception as err:
+            timing.error = str(err)
+            raise
+        finally:
+            self._local.timing = None
+            timing.finish(time.perf_counter() - started)
+            self._notify(timing)
+
+        return res
+
+    return wrapper
+
+
+def _observed_iter(func: Callable[..., Iterator[Any]]) -> Callable[..., Iterator[Any]]:
+    """Report the timing of a BirdClient call returning an iterator to the client observers, once the iterator is done."""
+
+    @functools.wraps(func)
+    def wrapper(self: "BirdClient", *args: Any, **kwargs: Any) -> Iterator[Any]:  # noqa: ANN401
+        # Skip timing if nobody is observing, or if we're being called from within another observed call
+        if not self._observers or getattr(self._local, "timing", None):
+            return func(self, *args, **kwargs)
+
+        # Calls made while creating the iterator are part of this call too
+        timing = QueryTiming(func.__name__)
+        self._local.timing = timing
+        started = time.perf_counter()
+        try:
+            iterator = func(self, *args, **kwargs)
+        finally:
+            self._local.timing = None
+        return self._observe_iter(timing, iterator, time.perf_counter() - started)
+
+    return wrapper
 
 
 class BirdClient:
@@ -45,14 +702,99 @@ class BirdClient:
     _debug: bool
     # Socket file
     _control_socket: str | None
-    # Ending lines for bird control channel
-    _ending_lines: list[bytes]
-
-    def __init__(self, control_socket: str | None = None, debug: bool = False) -> None:  # noqa: FBT001,FBT002
-        """Initialize the object."""
-
-        # Set debug flag
+    # Socket timeout
+    _timeout: float
+    # Maximum number of pooled connections
+    _pool_size: int
+    # Connection pool, created on first use
+    _pool: BirdConnectionPool | None
+    # Route lookup caches by table
+    _lookup_caches: dict[str, RouteLookupCache]
+    # Converter for 'since' fields
+    _since: Callable[[str], Any]
+    # Converters for prefixes and addresses in routes
+    _prefix: Callable[[str], Any]
+    _address: Callable[[str], Any]
+    # Options determining how results are returned, used to create clients in worker processes
+    _parse_options: dict[str, Any]
+    # Observers called with the timing of each call
+    _observers: list[Observer]
+    # Thread local state, holding the timing of the call in progress
+    _local: threading.local
+    # Number of reply lines to log in debug mode, and the maximum size of the logged lines
+    _debug_lines: int
+    _debug_chars: int
+    # Log only one in this many replies in debug mode
+    _debug_sample: int
+    # Counter of replies, used for sampling
+    _debug_counter: Iterator[int]
+    # Sink for the raw data received from BIRD
+    _capture: RawCapture | None
+    # Number of batches of reply lines received ahead of parsing by a reader thread, 0 to receive while parsing
+    _read_ahead: int
+
+    def __init__(  # noqa: PLR0913
+        self,
+        control_socket: str | None = None,
+        debug: bool = False,  # noqa: FBT001,FBT002
+        *,
+        timeout: float = 300,
+        pool_size: int = 4,
+        since_format: str = "str",
+        timezone: dt.tzinfo | None = None,
+        address_format: str = "str",
+        observers: Iterable[Observer] | None = None,
+        debug_lines: int = 20,
+        debug_sample: int = 1,
+        capture: str | pathlib.Path | BinaryIO | None = None,
+        read_ahead: int = 0,
+    ) -> None:
+        """
+        Initialize the object.
+
+        The ``since_format`` determines how 'since' fields are returned, "str" returns the string output by BIRD, "timestamp"
+        returns a BirdTimestamp string which is parsed into a datetime when needed, "datetime" returns a timezone aware datetime
+        and "epoch" returns an integer timestamp. BIRD timestamps are taken to be in the local timezone unless ``timezone`` is set.
+
+        The ``address_format`` determines how route prefixes, gateways, 'from' addresses and BGP next hops are returned, "str"
+        returns the string output by BIRD, "int" returns prefixes as (network, length, family) tuples and addresses as
+        (address, family) tuples of integers, "ipaddress" returns cached ipaddress network and address objects.
+
+        The ``observers`` are called with a QueryTiming for each call made, see ``add_observer()``.
+
+        When ``debug`` is set, BIRD replies are logged to the "birdclient" logger at DEBUG level, with only the first
+        ``debug_lines`` lines of each reply and only one in every ``debug_sample`` replies. If ``capture`` is a path or binary file,
+        all data received from BIRD is written to it as is.
+
+        If ``read_ahead`` is set, replies which are parsed as they are received are received by a separate thread, which queues up
+        to that many batches of lines ahead of the parser. This overlaps waiting for BIRD with parsing, see
+        ``BirdConnection.iter_reply()``.
+        """
+
+        # Set debug options
         self._debug = debug
+        self._debug_lines = debug_lines
+        self._debug_chars = debug_lines * 256
+        self._debug_sample = max(1, debug_sample)
+        self._debug_counter = itertools.count()
+        self._capture = RawCapture(capture) if capture is not None else None
+        self._read_ahead = read_ahead
+        # Set socket timeout
+        self._timeout = timeout
+        # Set connection pool size
+        self._pool_size = pool_size
+        self._pool = None
+        # Route lookup caches are created on first use
+        self._lookup_caches = {}
+        # Set how we return 'since' fields
+        self._since = since_converter(since_format, timezone)
+        # Set how we return prefixes and addresses
+        self._prefix = prefix_converter(address_format)
+        self._address = address_converter(address_format)
+        self._parse_options = {"since_format": since_format, "timezone": timezone, "address_format": address_format}
+        # Set our observers
+        self._observers = list(observers or [])
+        self._local = threading.local()
 
         # Work out which bird socket file to use
         self._control_socket = control_socket
@@ -63,43 +805,12 @@ class BirdClient:
                     self._control_socket = bird_socket_file
                     break
 
-        # Setup ending lines
-        self._ending_lines = [
-            b"0000 ",
-            b"0002 ",
-            b"0003 ",
-            b"0004 ",
-            b"0005 ",
-            b"0006 ",
-            b"0007 ",
-            b"0008 ",
-            b"0009 ",
-            b"0010 ",
-            b"0011 ",
-            b"0012 ",
-            b"0013 ",
-            b"0014 ",
-            b"0015 ",
-            b"0016 ",
-            b"0017 ",
-            b"0018 ",
-            b"0019 ",
-            b"0020 ",
-            b"0021 ",
-            b"0022 ",
-            b"0023 ",
-            b"0024 ",
-            b"0025 ",
-            b"8001 ",
-            b"8003 ",
-            b"9001 ",
-        ]
-
-    def show_status(self, data: list[str] | None = None) -> dict[str, str]:
+    @_observed
+    def show_status(self, data: ReplyData | None = None) -> dict[str, str]:
         """Return parsed BIRD status."""
 
         # Grab status
-        if not data:  # pragma: no cover
+        if not data:
             data = self.query(["show", "status"])
 
         # Return structure
@@ -112,7 +823,7 @@ class BirdClient:
         }
 
         # Loop with data to grab information we need
-        for line in data:
+        for line in iter_lines(data):
             # Grab BIRD version
             match = re.match(r"^0001 BIRD (?P<version>[0-9\.]+) ready\.$", line)
             if match:
@@ -136,7 +847,8 @@ class BirdClient:
 
         return res
 
-    def show_protocol(self, protocol: str, data: list[str] | None = None) -> dict[str, Any]:  # pylint: disable=too-many-branches
+    @_observed
+    def show_protocol(self, protocol: str, data: ReplyData | None = None) -> dict[str, Any]:  # pylint: disable=too-many-branches
         """Return parsed BIRD protocol."""
 
         res = self.show_protocols(args=[protocol], data=data)
@@ -145,872 +857,722 @@ class BirdClient:
 
         return res[protocol]
 
-    def show_protocols(  # noqa: C901,PLR0912,PLR0915
-        self, args: list[str] | None = None, data: list[str] | None = None
+    @_observed
+    def show_protocols(
+        self, args: list[str] | None = None, data: ReplyData | None = None, *, details: bool = True
     ) -> dict[str, dict[str, Any]]:
-        """Return parsed BIRD protocol."""
+        """Return parsed BIRD protocol, if ``details`` is False only the cheaper summary is queried."""
+
+        return {protocol["name"]: protocol for protocol in self.show_protocols_iter(args, data, details=details)}
+
+    @_observed_iter
+    def show_protocols_iter(  # noqa: C901,PLR0912,PLR0915
+        self, args: list[str] | None = None, data: ReplyData | None = None, *, details: bool = True
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yield parsed BIRD protocols one at a time as soon as each is complete.
+
+        When querying BIRD the reply is parsed as it is received, so the first protocols are available while BIRD is still sending
+        the rest and memory use does not grow with the number of protocols.
+        """
 
         # Grab protocols
-        if not data:  # pragma: no cover
+        if not data:
             # Build query
-            query = ["show", "protocols", "all"]
+            query = ["show", "protocols"]
+            if details:
+                query.append("all")
             if args:
                 query.extend(args)
-            # Send query to BIRD
-            data = self.query(query)
-
-        res: dict[str, Any] = {}
-        # Loop with data to grab information we need
-        protocol: dict[str, Any] = {}
-        for line in data:
-            # Grab summary
-            match = re.match(
-                r"^(?:1002-| )"
-                r"(?P<name>\S+)\s+"
-                r"(?P<proto>\S+)\s+"
-                r"(?P<table>\S+)\s+"
-                r"(?P<state>\S+)\s+" + _SINCE_MATCH + r"\s+"
-                r"(?P<info>\S+)?\s*"
-                r"(?P<info_extra>.*)?",
-                line,
-            )
-            if match:
-                table = match.group("table")
-                state = match.group("state").lower()
-                info = match.group("info")
-                # If we have info, lowercase it
-                if info:
-                    info = info.lower()
-                info_extra = match.group("info_extra")
-                # If the protocol is BGP and the state is "start", then the state is actually down
-                if match.group("proto") == "BGP":
-                    # Slighly modify our state
-                    if state == "start":
-                        state = "down"
-                    # And add the extra info separately if this is a BGP protocol
-                    info_extra = info_extra.lower()
-
-                    # Change info when it is "active" to "connect" as it swaps between the two
-                    if info in ("active", "connect"):
-                        info = "connecting"
-                    # Next change "passive" to "wait"
-                    elif info == "passive":
-                        info = "waiting"
-                # Check if this is OSPF
-                elif match.group("proto") == "OSPF":
-                    # If info shows alone it means the state is actually down
-                    if info == "alone":
-                        state = "down"
-                # Else add the extra info onto info for all other protocols
-                # If we have extra info then add it onto info and blank it
-                elif info_extra:
-                    info += f" {info_extra}"
-                    info_extra = ""
-
-                protocol_name = match.group("name")
-
-                # Build up the protocol
-                protocol = {
-                    "name": protocol_name,
-                    "proto": match.group("proto"),
-                    "state": state,
-                    "since": match.group("since"),
-                    "info": info,
-                }
-                if table != "---":
-                    protocol["table"] = table
-                if info_extra:
-                    protocol["info_extra"] = info_extra
-                # Save protocol
-                res[protocol["name"]] = protocol
-
-            # Grab BGP state
-            match = re.match(
-                r"\s+BGP state:\s+(?P<bgp_state>\S+)",
-                line,
-            )
-            if match:
-                protocol["info"] = match.group("bgp_state").lower()
-                continue
-
-            # Grab neighbor address
-            match = re.match(
-                r"\s+Neighbor address:\s+(?P<neighbor_address>\S+)",
-                line,
-            )
-            if match:
-                protocol["neighbor_address"] = match.group("neighbor_address")
-                continue
-
-            # Grab neighbor AS
-            match = re.match(
-                r"\s+Neighbor AS:\s+(?P<neighbor_as>\S+)",
-                line,
-            )
-            if match:
-                protocol["neighbor_as"] = int(match.group("neighbor_as"))
-                continue
-
-            # Grab local AS
-            match = re.match(
-                r"\s+Local AS:\s+(?P<local_as>\S+)",
-                line,
-            )
-            if match:
-                protocol["local_as"] = int(match.group("local_as"))
-                continue
-
-            # Grab last error
-            match = re.match(
-                r"\s+Last error:\s+(?P<last_error>.*)",
-                line,
-            )
-            if match:
-                protocol["last_error"] = match.group("last_error").rstrip().lower()
+            # Stream the reply from BIRD, it is already split into lines
+            lines: Iterable[str] = self.query_iter(query)
+        else:
+            lines = iter_lines(data)
+
+        # Protocol we're busy with
+        protocol: dict[str, Any] | None = None
+        # Channel we're busy with, its last limit and the route change statistics columns
+        channel: dict[str, Any] | None = None
+        limit = ""
+        stats_columns: list[str] = []
+        for _line in lines:
+            line = _line
+            # Protocol summary lines start with a 1002 code or a single space for continuation lines
+            if line.startswith("1002-") or (line[:1] == " " and line[1:2] not in (" ", "\t", "")):
+                match = _PROTOCOL_SUMMARY_MATCH.match(line)
+                if match:
+                    # A new protocol summary means the previous protocol is complete
+                    if protocol:
+                        yield protocol
+                    protocol = self._parse_protocol_summary(match)
+                    channel = None
                 continue
 
-            # Grab neighbor ID
-            match = re.match(
-                r"\s+Neighbor ID:\s+(?P<neighbor_id>\S+)",
-                line,
-            )
-            if match:
-                protocol["neighbor_id"] = match.group("neighbor_id")
+            # Protocol detail lines start with a 1006 code or are indented
+            if line.startswith("1006-"):
+                line = line[5:]
+            elif line[:1] not in (" ", "\t"):
                 continue
-
-            # Grab source address
-            match = re.match(
-                r"\s+Source address:\s+(?P<source_address>\S+)",
-                line,
-            )
-            if match:
-                protocol["source_address"] = match.group("source_address")
+            # Skip details we have no protocol for
+            if protocol is None:
                 continue
+            line = line.strip()
 
             # Grab channel
-            match = re.match(
-                r"\s+Channel (?P<channel>\S+)",
-                line,
-            )
-            if match:
-                protocol["channel"] = match.group("channel").lower()
-                continue
-
-            # Grab state
-            match = re.match(
-                r"\s+State:\s+(?P<state>\S+)",
-                line,
-            )
-            if match:
-                protocol["state"] = match.group("state").lower()
-                continue
-
-            # Grab table
-            match = re.match(
-                r"\s+Table:\s+(?P<table>\S+)",
-                line,
-            )
-            if match:
-                protocol["table"] = match.group("table")
-                continue
-
-            # Grab preference
-            match = re.match(
-                r"\s+Preference:\s+(?P<preference>\S+)",
-                line,
-            )
-            if match:
-                protocol["preference"] = int(match.group("preference"))
-                continue
-
-            # Grab input filter
-            match = re.match(
-                r"\s+Input filter:\s+(?P<input_filter>\S+)",
-                line,
-            )
-            if match:
-                protocol["input_filter"] = match.group("input_filter")
-                continue
-
-            # Grab output filter
-            match = re.match(
-                r"\s+Output filter:\s+(?P<output_filter>\S+)",
-                line,
-            )
-            if match:
-                protocol["output_filter"] = match.group("output_filter")
-                continue
-
-            # Grab import limit
-            match = re.match(
-                r"\s+Import limit:\s+(?P<import_limit>\S+)",
-                line,
-            )
-            if match:
-                protocol["import_limit"] = int(match.group("import_limit"))
+            if line.startswith("Channel "):
+                protocol["channel"] = line[8:].split(maxsplit=1)[0].lower()
+                channel = {"name": protocol["channel"]}
+                if "channels" not in protocol:
+                    protocol["channels"] = {}
+                protocol["channels"][channel["name"]] = channel
+                limit = ""
                 continue
 
-            # Grab import limit action
-            match = re.match(
-                r"\s+Action:\s+(?P<import_limit_action>\S+)",
-                line,
-            )
-            if match:
-                protocol["import_limit_action"] = match.group("import_limit_action")
-                continue
+            # Split off the key and dispatch to its handler
+            key, _, value = line.partition(":")
+            handler = _PROTOCOL_FIELDS.get(key)
+            if handler:
+                handler(protocol, value)
 
-            # Grab route count
-            match = re.match(
-                r"\s+Routes:\s+"
-                r"(?P<routes_imported>\d+) imported, "
-                r"(?P<routes_exported>\d+) exported, "
-                r"(?P<routes_preferred>\d+) preferred",
-                line,
-            )
-            if match:
-                protocol["routes_imported"] = int(match.group("routes_imported"))
-                protocol["routes_exported"] = int(match.group("routes_exported"))
+            # Everything below is only for channels
+            if channel is None:
                 continue
 
-            # Grab BGP next hop
-            match = re.match(
-                r"\s+BGP Next hop:\s+(?P<bgp_next_hop>\S+)",
-                line,
-            )
-            if match:
-                protocol["bgp_nexthop"] = match.group("bgp_next_hop")
-                continue
-
-            # Grab IGP table
-            match = re.match(
-                r"\s+IGP IPv[46] table:\s+(?P<igp_table>\S+)",
-                line,
-            )
-            if match:
-                protocol["igp_table"] = match.group("igp_table")
-                continue
-
-        return res
+            handler = _CHANNEL_FIELDS.get(key)
+            if handler:
+                handler(channel, value)
+            # Limits are followed by the action taken when the limit is hit
+            elif key in _CHANNEL_LIMITS:
+                limit = _CHANNEL_LIMITS[key]
+                _protocol_field(limit, int)(channel, value)
+            elif key == "Action" and limit:
+                _protocol_field(f"{limit}_action", str)(channel, value)
+            # Route change statistics, the header gives us the columns for the lines that follow
+            elif key == "Route change stats":
+                stats_columns = value.split()
+                channel["route_change_stats"] = {}
+            elif key in _CHANNEL_ROUTE_CHANGE_STATS and stats_columns:
+                channel["route_change_stats"][_CHANNEL_ROUTE_CHANGE_STATS[key]] = {
+                    column: None if count == "---" else int(count)
+                    for column, count in zip(stats_columns, value.split(), strict=False)
+                }
 
-    def show_route_table(self, table: str, data: list[str] | None = None) -> dict[Any, Any]:  # pylint: disable=R0914,R0912,R0915
+        if protocol:
+            yield protocol
+
+    def _parse_protocol_summary(self, match: re.Match[str]) -> dict[str, Any]:  # noqa: C901
+        """Parse a protocol summary line."""
+
+        table = match.group("table")
+        state = match.group("state").lower()
+        info = match.group("info")
+        # If we have info, lowercase it
+        if info:
+            info = info.lower()
+        info_extra = match.group("info_extra")
+        # If the protocol is BGP and the state is "start", then the state is actually down
+        if match.group("proto") == "BGP":
+            # Slighly modify our state
+            if state == "start":
+                state = "down"
+            # And add the extra info separately if this is a BGP protocol
+            info_extra = info_extra.lower()
+
+            # Change info when it is "active" to "connect" as it swaps between the two
+            if info in ("active", "connect"):
+                info = "connecting"
+            # Next change "passive" to "wait"
+            elif info == "passive":
+                info = "waiting"
+        # Check if this is OSPF
+        elif match.group("proto") == "OSPF":
+            # If info shows alone it means the state is actually down
+            if info == "alone":
+                state = "down"
+        # Else add the extra info onto info for all other protocols
+        # If we have extra info then add it onto info and blank it
+        elif info_extra:
+            info += f" {info_extra}"
+            info_extra = ""
+
+        # Build up the protocol
+        protocol = {
+            "name": match.group("name"),
+            "proto": match.group("proto"),
+            "state": state,
+            "since": self._since(match.group("since")),
+            "info": info,
+        }
+        if table != "---":
+            protocol["table"] = table
+        if info_extra:
+            protocol["info_extra"] = info_extra
+
+        return protocol
+
+    @_observed
+    def show_route_table(
+        self,
+        table: str,
+        data: ReplyData | None = None,
+        *,
+        sinks: Iterable[RouteSink] | None = None,
+        limit: int | None = None,
+    ) -> dict[Any, Any]:
         """Return parsed BIRD routing table."""
 
         # Grab routes
-        return self.show_route(args=["table", table, "all"], data=data)
-
-    def show_route(  # noqa: C901,PLR0912,PLR0915
-        self, args: list[str] | None = None, data: list[str] | None = None
+        return self.show_route(args=["table", table, "all"], data=data, sinks=sinks, limit=limit)
+
+    @_observed_iter
+    def show_route_table_iter(
+        self,
+        table: str,
+        data: ReplyData | None = None,
+        *,
+        sinks: Iterable[RouteSink] | None = None,
+        limit: int | None = None,
+    ) -> Iterator[tuple[Any, list[dict[str, Any]]]]:
+        """Yield each prefix of a BIRD routing table and its sources as soon as they are complete."""
+
+        return self.show_route_iter(args=["table", table, "all"], data=data, sinks=sinks, limit=limit)
+
+    @_observed
+    def show_route_table_sharded(  # noqa: PLR0913
+        self,
+        table: str,
+        *,
+        family: int = 4,
+        shard_bits: int = 2,
+        max_shard_routes: int | None = None,
+        workers: int | None = None,
+        sinks: Iterable[RouteSink] | None = None,
+        limit: int | None = None,
+    ) -> dict[Any, Any]:
+        """Return parsed BIRD routing table, retrieved in shards concurrently over pooled connections."""
+
+        return dict(
+            self.show_route_table_sharded_iter(
+                table,
+                family=family,
+                shard_bits=shard_bits,
+                max_shard_routes=max_shard_routes,
+                workers=workers,
+                sinks=sinks,
+                limit=limit,
+            )
+        )
+
+    @_observed_iter
+    def show_route_table_sharded_iter(  # noqa: PLR0913
+        self,
+        table: str,
+        *,
+        family: int = 4,
+        shard_bits: int = 2,
+        max_shard_routes: int | None = None,
+        workers: int | None = None,
+        sinks: Iterable[RouteSink] | None = None,
+        limit: int | None = None,
+    ) -> Iterator[tuple[Any, list[dict[str, Any]]]]:
+        """
+        Yield each prefix and its sources in a BIRD routing table, retrieved in shards concurrently over pooled connections.
+
+        The address space is split into ``2^shard_bits`` shards which are retrieved using 'show route in', networks shorter than
+        the shards are retrieved using exact lookups. If ``max_shard_routes`` is set, the number of networks in each shard is
+        counted first and shards with more networks are split further, shards without any networks are skipped. As the shards
+        don't overlap each prefix is returned exactly once, shards are returned in the order they complete. Once ``limit``
+        prefixes have been returned, shards which haven't started are cancelled.
+        """
+
+        if family not in _FAMILY_DEFAULT_ROUTES:
+            raise BirdClientError(f"Address family must be 4 or 6, not {family}")
+
+        pool = self.connection_pool()
+        shards, exact = self._plan_route_shards(pool, table, family, shard_bits, max_shard_routes)
+
+        # Work out the queries, the exact lookups are small so we run them together over one connection
+        queries = [[["show", "route", "table", table, "in", shard, "all"]] for shard in shards]
+        if exact:
+            queries.append([["show", "route", "table", table, prefix, "all"] for prefix in exact])
+
+        with ThreadPoolExecutor(max_workers=workers or self._pool_size) as executor:
+            futures = [executor.submit(self._fetch_route_shard, pool, shard_queries) for shard_queries in queries]
+            try:
+                routes = itertools.chain.from_iterable(future.result() for future in as_completed(futures))
+                if sinks:
+                    routes = _feed_sinks(routes, sinks)
+                yield from routes if limit is None else itertools.islice(routes, max(limit, 0))
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    @_observed
+    def show_route(
+        self,
+        args: list[str] | None = None,
+        data: ReplyData | None = None,
+        *,
+        sinks: Iterable[RouteSink] | None = None,
+        limit: int | None = None,
     ) -> dict[Any, Any]:
-        """Return parsed BIRD routes."""
+        """
+        Return parsed BIRD routes.
+
+        Each prefix and its sources is passed to the ``add()`` method of each of the ``sinks`` as soon as it is parsed, which
+        allows building indexes or statistics in the same pass as parsing. If ``limit`` is given, only that many prefixes are
+        returned and the rest of the reply is not parsed.
+        """
+
+        return dict(self.show_route_iter(args, data, sinks=sinks, limit=limit))
+
+    @_observed_iter
+    def show_route_iter(
+        self,
+        args: list[str] | None = None,
+        data: ReplyData | None = None,
+        *,
+        sinks: Iterable[RouteSink] | None = None,
+        limit: int | None = None,
+    ) -> Iterator[tuple[Any, list[dict[str, Any]]]]:
+        """
+        Yield each prefix of the BIRD routes and its sources, parsing the reply as it is received.
+
+        Each prefix and its sources is passed to the ``sinks`` before it is yielded, see ``show_route()``. When the iterator is
+        closed before the end, or after ``limit`` prefixes, the rest of the reply is not parsed and the BIRD connection is closed,
+        which makes BIRD abort the command.
+        """
 
         # Grab routes
-        if not data:  # pragma: no cover
+        reply = None
+        if not data:
             query = ["show", "route"]
             if args:
                 query.extend(args)
-            data = self.query(query)
+            reply = self.query_iter(query)
+
+        # Replies are already lines, only data passed to us needs to be read
+        routes = self._iter_routes(iter_lines(data) if reply is None else reply)
+        if sinks:
+            routes = _feed_sinks(routes, sinks)
+        if reply is None and limit is None:
+            return routes
+        return _limit_routes(routes, reply, limit)
+
+    @_observed
+    def show_route_visit(
+        self, visitor: RouteVisitor, args: list[str] | None = None, data: ReplyData | None = None, *, limit: int | None = None
+    ) -> None:
+        """
+        Parse BIRD routes, passing each part of them to the ``visitor`` as it is parsed instead of building the sources.
+
+        See ``RouteVisitor`` for the parts passed, the prefixes and values are converted as ``show_route()`` would. If ``limit``
+        is given, parsing stops after that many prefixes as it does for ``show_route()``.
+        """
+
+        reply = None
+        if not data:
+            query = ["show", "route"]
+            if args:
+                query.extend(args)
+            reply = self.query_iter(query)
+
+        try:
+            self._visit_routes(iter_lines(data) if reply is None else reply, visitor, limit)
+        finally:
+            # Stop receiving the reply if we stopped parsing before the end
+            if reply is not None:
+                reply.close()
+
+    def _visit_routes(  # noqa: C901,PLR0912
+        self, data: Iterable[str], visitor: RouteVisitor, limit: int | None = None
+    ) -> None:
+        """Parse BIRD routes, passing each part of them to the visitor, stopping at the prefix after ``limit`` prefixes."""
+
+        # Only pass the parts the visitor overrides the methods for, so we can skip converting the rest
+        visitor_class = type(visitor)
+        on_prefix, on_source, on_field, on_nexthop, on_attribute = (
+            getattr(visitor, name) if getattr(visitor_class, name, None) is not getattr(RouteVisitor, name) else None
+            for name in ("on_prefix", "on_source", "on_field", "on_nexthop", "on_attribute")
+        )
+
+        since = self._since
+        prefix_conv = self._prefix
+        address = self._address
+        attrib = ""
+        prefixes = 0
+
+        if limit is not None and limit <= 0:
+            visitor.on_end()
+            return
+
+        for kind, match in _classify_route_lines(data):
+            if kind == _LINE_ATTRIBUTE:
+                if on_attribute:
+                    attrib, value = _split_route_attribute(match, attrib)
+                    on_attribute(attrib, _route_attribute(attrib, value, address, match))
+
+            elif kind == _LINE_NEXTHOP:
+                if on_nexthop:
+                    gateway = match.group("gateway") if match.re is _ROUTE_VIA_MATCH else None
+                    weight = match.group("weight")
+                    on_nexthop(
+                        address(gateway) if gateway else None,
+                        match.group("interface"),
+                        match.group("mpls"),
+                        match.group("onlink") is not None,
+                        int(weight) if weight else None,
+                    )
 
-        res: dict[str, Any] = {}
+            elif kind == _LINE_SOURCE:
+                if on_source:
+                    bestpath = match.group("bestpath") is not None
+                    on_source(match.group("protocol"), since(match.group("since")), bestpath, int(match.group("pref")))
+                if on_field:
+                    _visit_source_fields(match, on_field, address)
 
-        # Loop with data to grab information we need
-        code = ""
-        sources: list[dict[str, Any]] = []
-        source: dict[str, Any] = {}
-        prefix: str = ""
-        attrib: str = ""
-        value: Any
+            elif kind == _LINE_TYPE:
+                if on_field:
+                    on_field("type", match.group("route_type").split())
 
-        for _line in data:  # pylint: disable=too-many-nested-blocks
-            line = _line
-            match = re.match(r"^(?P<code>[0-9]{4})-?\s*(?P<line>.*)$", line)
-            if match:
-                code = match.group("code")
-                line = match.group("line")
+            elif kind == _LINE_PREFIX:
+                # Stop at the start of the prefix after the last one we want
+                if prefixes == limit:
+                    break
+                prefixes += 1
+                if on_prefix:
+                    on_prefix(prefix_conv(match))
 
-            # End of output
-            if code == "0000":
-                # If we had sources, save them
-                if sources:
-                    res[prefix] = sources
+            elif kind == _LINE_END:
                 break
 
-            # Start of output
-            if code == "0001":
-                continue
+        # Saved output may not have an end line, running out of it ends the routes all the same
+        visitor.on_end()
 
-            # Route info
-            if code == "1007":
-                # Exclude the table line
-                match = re.match(r"^Table ", line)
-                if match:
-                    # If we had sources, save them
-                    if sources:
-                        res[prefix] = sources
-                    sources = []
-                    source = {}
-                    continue
-
-                #
-                # Match IPv4 ROA prefix
-                #
-                match = re.match(
-                    r"^\s*(?P<prefix>[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\/[0-9]{1,2})(?P<line>-.+)$",
-                    line,
-                )
-                if match:
-                    # If we had sources from a previous route, save them
-                    if sources:
-                        res[prefix] = sources
-                    sources = []
-                    source = {}
-                    prefix = match.group("prefix")
-                    line = match.group("line")
-
-                #
-                # Match IPv6 ROA prefix
-                #
-                match = re.match(
-                    r"^\s*(?P<prefix>[a-f0-9:]+\/[0-9]{1,3})(?P<line>-.+)$",
-                    line,
-                )
-                if match:
-                    # If we had sources from a previous route, save them
-                    if sources:
-                        res[prefix] = sources
-                    sources = []
-                    source = {}
-                    prefix = match.group("prefix")
-                    line = match.group("line")
-
-                #
-                # Match IPv4 prefix
-                #
-                match = re.match(
-                    r"^\s*(?P<prefix>[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\/[0-9]{1,2})\s+(?P<line>.+)$",
-                    line,
-                )
-                if match:
-                    # If we had sources from a previous route, save them
-                    if sources:
-                        res[prefix] = sources
-                    sources = []
-                    source = {}
-                    prefix = match.group("prefix")
-                    line = match.group("line")
-
-                #
-                # Match IPv6 prefix
-                #
-                match = re.match(r"^\s*(?P<prefix>[a-f0-9:]+\/[0-9]{1,3})\s+(?P<line>.+)$", line)
-                if match:
-                    # If we had sources, save them
-                    if sources:
-                        res[prefix] = sources
-                    sources = []
-                    source = {}
-                    prefix = match.group("prefix")
-                    line = match.group("line")
+    def _iter_routes(self, data: Iterable[str]) -> Iterator[tuple[Any, list[dict[str, Any]]]]:  # noqa: C901,PLR0912,PLR0915
+        """Parse BIRD routes, yielding each prefix and its sources as soon as they are complete."""
 
-                #
-                # Grab a ROA route table entry
-                #
-                match = re.match(
-                    r"^\-(?P<max>[0-9]+)\s+AS(?P<asn>[0-9]+)"
-                    r"\s+\[(?P<protocol>\S+) " + _SINCE_MATCH + r"\] "
-                    r"(?:(?P<bestpath>\*) )?"
-                    r"\((?P<pref>\d+)\)$",
-                    line,
-                )
-                if match:
-                    source = {
-                        "ROA.max": int(match.group("max")),
-                        "ROA.asn": match.group("asn"),
-                        "protocol": match.group("protocol"),
-                        "since": match.group("since"),
-                        "pref": int(match.group("pref")),
-                    }
-                    # Check if we have a bestpath
-                    bestpath = match.group("bestpath")
-                    if bestpath:
-                        source["bestpath"] = True
-                    else:
-                        source["bestpath"] = False
-                    # Add source
-                    sources.append(source)
-                    continue
+        # Loop with data to grab information we need
+        prefix_conv = self._prefix
+        address = self._address
+        sources: list[dict[str, Any]] = []
+        source: dict[str, Any] = {}
+        prefix: str = ""
+        attrib: str = ""
+        value: Any
 
-                #
-                # Grab a "normal" route
-                #
-                match = re.match(
-                    r"^(?P<prefix_type>[a-z]+) "
-                    r"\[(?P<protocol>\S+) " + _SINCE_MATCH + r"\] "
-                    r"(?:(?P<bestpath>\*) )?"
-                    r"\((?P<pref>\d+)\)$",
-                    line,
-                )
-                if match:
-                    source = {
-                        "prefix_type": match.group("prefix_type"),
-                        "protocol": match.group("protocol"),
-                        "since": match.group("since"),
-                        "pref": int(match.group("pref")),
-                    }
-                    # Check if we have a bestpath
-                    bestpath = match.group("bestpath")
-                    if bestpath:
-                        source["bestpath"] = True
-                    else:
-                        source["bestpath"] = False
-                    # Add source
-                    sources.append(source)
-                    continue
+        for kind, match in _classify_route_lines(data):
+            # Pull off route attributes
+            if kind == _LINE_ATTRIBUTE:
+                attrib, value = _split_route_attribute(match, attrib)
 
-                #
-                # Grab a BGP route
-                #
-                match = re.match(
-                    r"^(?P<prefix_type>[a-z]+) "
-                    r"\["
-                    r"(?P<protocol>\S+) " + _SINCE_MATCH + r"(?: from (?P<from>[a-z0-9\.:]+))?"
-                    r"\] "
-                    r"(?:(?P<bestpath>\*) )?"
-                    r"\((?P<pref>\d+)(?:/(?P<metric>\d+|[-?]))?\) "
-                    r"\["
-                    r"(?P<asn>AS[0-9]+)?"
-                    r"(?P<bgp_type>[ie\?])"
-                    r"\]$",
-                    line,
-                )
-                if match:
-                    source = {
-                        "prefix_type": match.group("prefix_type"),
-                        "protocol": match.group("protocol"),
-                        "since": match.group("since"),
-                    }
-                    # Check if we got a 'from'
-                    bgp_from = match.group("from")
-                    if bgp_from:
-                        source["from"] = bgp_from
-                    # Check if we are the bestpath
-                    bestpath = match.group("bestpath")
-                    if bestpath:
-                        source["bestpath"] = True
-                    else:
-                        source["bestpath"] = False
-
-                    source["pref"] = int(match.group("pref"))
-                    # Check if we got a metric
-                    metric = match.group("metric")
-                    if metric:
-                        if metric in ("-", "?"):
-                            source["metric"] = None
-                        else:
-                            source["metric"] = int(metric)
-                    # Check if we got an ASN
-                    asn = match.group("asn")
-                    if asn:
-                        source["asn"] = asn
-                    source["bgp_type"] = match.group("bgp_type")
-                    # Add source
-                    sources.append(source)
-                    continue
+                # Check if we have attributes, if not, add
+                if "attributes" not in source:
+                    source["attributes"] = {}
 
-                #
-                # Grab a OSPF route
-                #
-                match = re.match(
-                    r"^(?P<prefix_type>[a-z]+) "
-                    r"\[(?P<protocol>\S+)\s+" + _SINCE_MATCH + r"\] "
-                    r"(?:(?P<bestpath>\*) )?"
-                    r"(?P<ospf_type>(?:I|IA|E1|E2)) "
-                    r"\((?P<pref>\d+)/(?P<metric1>\d+)(?:/(?P<metric2>\d+))?\)"
-                    r"(?: \[(?P<tag>[0-9a-f]+)\])?"
-                    r"(?: \[(?P<router_id>[0-9\.]+)\])$",
-                    line,
-                )
-                if match:
-                    source = {
-                        "prefix_type": match.group("prefix_type"),
-                        "protocol": match.group("protocol"),
-                        "since": match.group("since"),
-                        "ospf_type": match.group("ospf_type"),
-                        "pref": int(match.group("pref")),
-                        "metric1": int(match.group("metric1")),
-                    }
-                    # Check if we have a bestpath
-                    bestpath = match.group("bestpath")
-                    if bestpath:
-                        source["bestpath"] = True
-                    else:
-                        source["bestpath"] = False
-                    # Check if we have a metric2
-                    metric2 = match.group("metric2")
-                    if metric2:
-                        source["metric2"] = int(metric2)
-                    # Check if we have a tag
-                    tag = match.group("tag")
-                    if tag:
-                        source["tag"] = tag
-                    source["router_id"] = match.group("router_id")
-                    # Add source
-                    sources.append(source)
-                    continue
+                value = _route_attribute(attrib, value, address, match)
 
-                #
-                # Grab a RIP route
-                #
-                match = re.match(
-                    r"^(?P<prefix_type>[a-z]+) "
-                    r"\[(?P<protocol>\S+)\s+" + _SINCE_MATCH + r"\] "
-                    r"(?:(?P<bestpath>\*) )?"
-                    r"\((?P<pref>\d+)/(?P<metric1>\d+)\)$",
-                    line,
-                )
-                if match:
-                    source = {
-                        "prefix_type": match.group("prefix_type"),
-                        "protocol": match.group("protocol"),
-                        "since": match.group("since"),
-                        "pref": int(match.group("pref")),
-                        "metric1": int(match.group("metric1")),
-                    }
-                    bestpath = match.group("bestpath")
-                    if bestpath:
-                        source["bestpath"] = True
+                # Check if we have an attribute value already
+                if attrib in source["attributes"]:
+                    if isinstance(value, list):
+                        source["attributes"][attrib].extend(value)
                     else:
-                        source["bestpath"] = False
-                    # Add source
-                    sources.append(source)
-                    continue
+                        raise BirdClientParseError("Value is not a list but has multiple items")
+                else:
+                    source["attributes"][attrib] = value
 
-                #
-                # Grab nexthop details via a gateway
-                #
-                match = re.match(
-                    r"^\s+via\s+"
-                    r"(?P<gateway>\S+)\s+"
-                    r"on (?P<interface>\S+)"
-                    r"(?: mpls (?P<mpls>[0-9/]+))?"
-                    r"(?: (?P<onlink>onlink))?"
-                    r"(?: weight (?P<weight>[0-9]+))?$",
-                    line,
-                )
-                if match:
-                    nexthop: dict[str, Any] = {}
+            #
+            # Grab nexthop details via a gateway or a device
+            #
+            elif kind == _LINE_NEXTHOP:
+                nexthop: dict[str, Any] = {}
+                if match.re is _ROUTE_VIA_MATCH:
                     # Grab gateway
                     gateway = match.group("gateway")
                     if gateway:
-                        nexthop["gateway"] = gateway
+                        nexthop["gateway"] = address(gateway)
                     # Grab interface
                     interface = match.group("interface")
                     if interface:
                         nexthop["interface"] = interface
-                    # Grab mpls
-                    mpls = match.group("mpls")
-                    if mpls:
-                        nexthop["mpls"] = mpls
-                    # Grab onlink
-                    onlink = match.group("onlink")
-                    if onlink:
-                        nexthop["onlink"] = onlink
-                    # Grab weight
-                    weight = match.group("weight")
-                    if weight:
-                        nexthop["weight"] = int(weight)
-                    # Save nexthops
-                    if "nexthops" not in source:
-                        source["nexthops"] = []
-                    source["nexthops"].append(nexthop)
-                    continue
+                else:
+                    nexthop["interface"] = match.group("interface")
+                # Grab mpls
+                mpls = match.group("mpls")
+                if mpls:
+                    nexthop["mpls"] = mpls
+                # Grab onlink
+                onlink = match.group("onlink")
+                if onlink:
+                    nexthop["onlink"] = onlink
+                # Grab weight
+                weight = match.group("weight")
+                if weight:
+                    nexthop["weight"] = int(weight)
+                # Save nexthops
+                if "nexthops" not in source:
+                    source["nexthops"] = []
+                source["nexthops"].append(nexthop)
+
+            elif kind == _LINE_SOURCE:
+                source = self._route_source(match)
+                sources.append(source)
 
-                #
-                # Grab nexthop details via a gateway
-                #
-                match = re.match(
-                    r"^\s+via\s+"
-                    r"(?P<gateway>\S+)\s+"
-                    r"on (?P<interface>\S+)"
-                    r"(?: mpls (?P<mpls>[0-9/]+))?"
-                    r"(?: (?P<onlink>onlink))?"
-                    r"(?: weight (?P<weight>[0-9]+))?$",
-                    line,
-                )
-                if match:
-                    nexthop = {}
-                    # Grab gateway
-                    gateway = match.group("gateway")
-                    if gateway:
-                        nexthop["gateway"] = gateway
-                    # Grab interface
-                    interface = match.group("interface")
-                    if interface:
-                        nexthop["interface"] = interface
-                    # Grab mpls
-                    mpls = match.group("mpls")
-                    if mpls:
-                        nexthop["mpls"] = mpls
-                    # Grab onlink
-                    onlink = match.group("onlink")
-                    if onlink:
-                        nexthop["onlink"] = onlink
-                    # Grab weight
-                    weight = match.group("weight")
-                    if weight:
-                        nexthop["weight"] = int(weight)
-                    # Save nexthops
-                    if "nexthops" not in source:
-                        source["nexthops"] = []
-                    source["nexthops"].append(nexthop)
-                    continue
+            # Type
+            elif kind == _LINE_TYPE:
+                source["type"] = match.group("route_type").split()
 
-                #
-                # Grab nexthop details via a device
-                #
-                match = re.match(
-                    r"^\s+dev (?P<interface>\S+)"
-                    r"(?: mpls (?P<mpls>[0-9/]+))?"
-                    r"(?: (?P<onlink>onlink))?"
-                    r"(?: weight (?P<weight>[0-9]+))?$",
-                    line,
-                )
-                if match:
-                    nexthop = {
-                        "interface": match.group("interface"),
-                    }
-                    # Check if we got an MPLS item
-                    mpls = match.group("mpls")
-                    if mpls:
-                        nexthop["mpls"] = mpls
-                    # Check if we got an onlink option
-                    onlink = match.group("onlink")
-                    if onlink:
-                        nexthop["onlink"] = onlink
-                    # Check if we got a weight option
-                    weight = match.group("weight")
-                    if weight:
-                        nexthop["weight"] = int(weight)
-                    # Save nexthops
-                    if "nexthops" not in source:
-                        source["nexthops"] = []
-                    source["nexthops"].append(nexthop)
-                    continue
+            # A new prefix, or the start of a new table
+            elif kind in (_LINE_PREFIX, _LINE_TABLE):
+                # If we had sources from a previous route, save them
+                if sources:
+                    yield prefix_conv(prefix), sources
+                sources = []
+                source = {}
+                if kind == _LINE_PREFIX:
+                    prefix = match
 
-            # Type
-            if code == "1008":
-                match = re.match(r"^\s*Type: (?P<route_type>.+)$", line)
-                if match:
-                    source["type"] = match.group("route_type").split()
-                    continue
+            # End of output
+            elif kind == _LINE_END:
+                # If we had sources, save them
+                if sources:
+                    yield prefix_conv(prefix), sources
+
+    def _route_source(self, match: re.Match[str]) -> dict[str, Any]:
+        """Return a source from the match of its first line."""
+
+        since = self._since
+
+        #
+        # Grab a ROA route table entry
+        #
+        if match.re is _ROUTE_ROA_MATCH:
+            return {
+                "ROA.max": int(match.group("max")),
+                "ROA.asn": match.group("asn"),
+                "protocol": match.group("protocol"),
+                "since": since(match.group("since")),
+                "pref": int(match.group("pref")),
+                "bestpath": match.group("bestpath") is not None,
+            }
+
+        #
+        # Grab a BGP route
+        #
+        if match.re is _ROUTE_BGP_MATCH:
+            source = {
+                "prefix_type": match.group("prefix_type"),
+                "protocol": match.group("protocol"),
+                "since": since(match.group("since")),
+            }
+            # Check if we got a 'from'
+            bgp_from = match.group("from")
+            if bgp_from:
+                source["from"] = self._address(bgp_from)
+            # Check if we are the bestpath
+            source["bestpath"] = match.group("bestpath") is not None
+            source["pref"] = int(match.group("pref"))
+            # Check if we got a metric
+            metric = match.group("metric")
+            if metric:
+                source["metric"] = None if metric in ("-", "?") else int(metric)
+            # Check if we got an ASN
+            asn = match.group("asn")
+            if asn:
+                source["asn"] = asn
+            source["bgp_type"] = match.group("bgp_type")
+            return source
+
+        #
+        # Grab a OSPF route
+        #
+        if match.re is _ROUTE_OSPF_MATCH:
+            source = {
+                "prefix_type": match.group("prefix_type"),
+                "protocol": match.group("protocol"),
+                "since": since(match.group("since")),
+                "ospf_type": match.group("ospf_type"),
+                "pref": int(match.group("pref")),
+                "metric1": int(match.group("metric1")),
+                "bestpath": match.group("bestpath") is not None,
+            }
+            # Check if we have a metric2
+            metric2 = match.group("metric2")
+            if metric2:
+                source["metric2"] = int(metric2)
+            # Check if we have a tag
+            tag = match.group("tag")
+            if tag:
+                source["tag"] = tag
+            source["router_id"] = match.group("router_id")
+            return source
+
+        #
+        # Grab a "normal" route, or a RIP route
+        #
+        source = {
+            "prefix_type": match.group("prefix_type"),
+            "protocol": match.group("protocol"),
+            "since": since(match.group("since")),
+            "pref": int(match.group("pref")),
+        }
+        if match.re is _ROUTE_RIP_MATCH:
+            source["metric1"] = int(match.group("metric1"))
+        source["bestpath"] = match.group("bestpath") is not None
+        return source
+
+    @_observed
+    def lookup_routes(
+        self,
+        addresses: Iterable[str],
+        *,
+        table: str | None = None,
+        cache: RouteLookupCache | None = None,
+        window: int = 64,
+        generation: Hashable | None = None,
+    ) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        """
+        Return the parsed BIRD routes matching each address, as 'show route for <address> all' would.
+
+        The lookups are pipelined over a single connection ``window`` at a time. A longest prefix match cache is used to skip
+        lookups for addresses within prefixes we already resolved, addresses without a matching route map to an empty dict. If no
+        ``cache`` is given, a cache kept by the client for the table is used.
+
+        So that addresses sharing a prefix aren't looked up in the same window, the addresses are looked up in rounds. Each round
+        looks up a single address out of those sharing a /8, /16, /24 and then /32 for IPv4 (/16, /32, /48 and /128 for IPv6),
+        the others are looked up in the next round unless the cache can answer them by then.
+
+        To notice table changes the cache checks the route count of the table on each call, which makes BIRD walk the whole table.
+        Callers which know when the table changes can pass a ``generation`` instead, any hashable value which changes along with
+        the table, and the cache is only thrown away when it changes or the cache expires.
+        """
+
+        if cache is None:
+            cache = self._lookup_caches.setdefault(table or "", RouteLookupCache())
+
+        # Sort the addresses so addresses sharing a prefix are next to each other
+        try:
+            remaining = sorted((_address_sort_key(x), x) for x in set(addresses))
+        except ValueError as err:
+            raise BirdClientError(f"Invalid address to lookup: {err}") from err
+
+        table_args = ["table", table] if table else []
+
+        res: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        with self.connection() as conn:
+            # Throw away the cache if it expired or the table changed
+            signature = generation
+            if generation is None and cache.check_table:
+                counts = self._parse_route_counts(conn.query(["show", "route", *table_args, "count"]))["total"]
+                signature = (counts["routes_total"], counts["networks"])
+            cache.validate(signature)
+
+            for lookup_round in range(len(_LOOKUP_ROUND_PREFIXLENS[4])):
+                pending: list[str] = []
+                deferred: list[tuple[tuple[int, int], str]] = []
+                last_group = None
+                for key, address in remaining:
+                    routes = cache.lookup(address)
+                    if routes is not None:
+                        res[address] = routes
+                        continue
+                    # Addresses in the same group as the last one looked up wait for the next round
+                    version, ip_int = key
+                    group = (version, ip_int >> (_ADDRESS_BITS[version] - _LOOKUP_ROUND_PREFIXLENS[version][lookup_round]))
+                    if group == last_group:
+                        deferred.append((key, address))
+                        continue
+                    last_group = group
+                    pending.append(address)
+                    if len(pending) >= window:
+                        self._lookup_routes_batch(conn, pending, table_args, cache, res)
+                        pending = []
+                if pending:
+                    self._lookup_routes_batch(conn, pending, table_args, cache, res)
+                remaining = deferred
 
-                # NK: Match "Internal route handling values: 0L 10G 0S id 1" attribute in 3.0.0
-                match = re.match(r"^\s*Internal route handling values: (?P<value>.+)$", line)
-                if match:
-                    # NK: ignore for now
-                    continue
+        return res
 
-                raise BirdClientParseError(f"Failed to parse type: {line}")
+    @_observed
+    def show_route_count(self, args: list[str] | None = None, data: ReplyData | None = None) -> dict[str, Any]:
+        """Return parsed BIRD route counts, without transferring the routes themselves."""
 
-            # Pull off route attributes
-            if code == "1012":
-                # Check if we match a second line in a multiline attribute
-                match = re.match(r"^ \t\t(?P<value>.*)$", line)
-                if match:
-                    # If we do, we should have an attribute set
-                    if not attrib:
-                        # If not, throw a parsing error
-                        raise BirdClientParseError(f"Failed to parse code 1012: {line}")
-                    # Finally if we do, grab the value
-                    value = match.group("value")
-                else:
-                    match = re.match(r"^\s*(?P<attrib>[A-Za-z0-9\._]+): ?(?P<value>.*)$", line)
-                    if not match:
-                        raise BirdClientParseError(f"Failed to parse code 1012: {line}")
-                    attrib = match.group("attrib")
-                    value = match.group("value")
+        # Grab route counts
+        if not data:
+            query = ["show", "route"]
+            if args:
+                query.extend(args)
+            query.append("count")
+            data = self.query(query)
 
-                # Check if we have attributes, if not, add
-                if "attributes" not in source:
-                    source["attributes"] = {}
+        return self._parse_route_counts(iter_lines(data))
 
-                # In bird 3.0.0 the attribute "from" was added
-                if attrib in ("from", "hostentry"):
-                    pass
-
-                # In bird 3.0.0 the attribute "igp_metric" was added
-                elif attrib == "igp_metric":
-                    value = int(value)
-
-                # In bird 3.0.0 the attribute "BGP.as_path" was renamed to "bgp_path"
-                elif attrib in ("BGP.as_path", "bgp_path"):
-                    match_all = re.findall(r"(?P<as_path>\d+)\s*", value)
-                    # Replace values if we have any
-                    value = [int(x) for x in match_all]
-                # In bird 3.0.0 the attribute "BGP.ext_community" was renamed to "bgp_ext_community"
-                elif attrib in ("BGP.ext_community", "bgp_ext_community"):
-                    match_all = re.findall(
-                        r"\((?:unknown )?(?P<c1>(?:ro|rt|generic|(?:0x)?\d+)),\s*(?P<c2>(?:0x)?\d+),\s*(?P<c3>(?:0x)?\d+)\)\s*",
-                        value,
-                    )
-                    value = []
-                    if match_all:
-                        for x in match_all:
-                            if x[0] in ["ro", "rt"]:
-                                value.append((x[0], int(x[1]), int(x[2])))
-                            else:
-                                # Check if we can convert any of the community values to integers
-                                try:
-                                    x0 = int(x[0])
-                                except ValueError:
-                                    x0 = x[0]
-                                try:
-                                    x1 = int(x[1])
-                                except ValueError:
-                                    x1 = x[1]
-                                try:
-                                    x2 = int(x[2])
-                                except ValueError:
-                                    x2 = x[2]
-                                value.append((x0, x1, x2))
-                # Special case for BGP.large_community
-                elif attrib in ("BGP.community", "bgp_community"):
-                    match_all = re.findall(r"\((?P<c1>\d+),\s*(?P<c2>\d+)\)\s*", value)
-                    value = []
-                    if match_all:
-                        value.extend([(int(x[0]), int(x[1])) for x in match_all])
-                # In bird 3.0.0 the attribute "BGP.large_community" was renamed to "bgp_large_community"
-                elif attrib in ("BGP.large_community", "bgp_large_community"):
-                    match_all = re.findall(r"\((?P<lc1>\d+),\s*(?P<lc2>\d+),\s*(?P<lc3>\d+)\)\s*", value)
-                    value = []
-                    if match_all:
-                        value.extend([(int(x[0]), int(x[1]), int(x[2])) for x in match_all])
-                # Special case for basic integers
-                elif attrib in ("BGP.local_pref", "bgp_local_pref"):
-                    value = int(value)
-                # In bird 3.0.0 the attribute "BGP.next_hop" was renamed to "bgp_next_hop"
-                elif attrib in ("BGP.next_hop", "bgp_next_hop"):
-                    match_all = re.findall(r"(?P<next_hop>\S+)\s*", value)
-                    value = list(match_all)
-                # In bird 3.0.0 the attribute "BGP.origin" was renamed to "bgp_origin"
-                elif attrib in ("BGP.origin", "bgp_origin"):  # noqa: SIM114
-                    # Normal string
-                    pass
-                # In bird 3.0.0 the attribute "BGP.originator_id" was renamed to "bgp_originator_id"
-                elif attrib in ("BGP.originator_id", "bgp_originator_id"):  # noqa: SIM114
-                    # Normal string
-                    pass
-                # In bird 3.0.0 the attribute "BGP.cluster_list" was renamed to "bgp_cluster_list"
-                elif attrib in ("BGP.cluster_list", "bgp_cluster_list"):
-                    # Normal string
-                    pass
-
-                # NK: In bird 3.0.0 "ospf_metricX" and "ospf_metricX" was added
-                elif attrib in ("OSPF.metric1", "ospf_metric1", "OSPF.metric2", "ospf_metric2"):
-                    value = int(value)
-                # NK: In bird 3.0.0 "OSPF.router_id" was renamed to "ospf_router_id"
-                elif attrib in ("OSPF.router_id", "ospf_router_id"):
-                    # Normal string
-                    pass
-                # NK: In bird 3.0.0 "OSPF.tag" was renamed to "ospf_tag"
-                elif attrib in ("OSPF.tag", "ospf_tag"):
-                    # Tag is hex, so we treat it as a string
-                    pass
-
-                # NK: In bird 3.0.0 "Kernel.scope" was renamed to "ktr_scope"
-                elif attrib in ("Kernel.scope", "krt_scope"):
-                    # Translate kernel scope based on /etc/iproute2/rt_scopes
-                    if value == "0":
-                        value = "global"
-                    elif value == "255":
-                        value = "link"
-                    elif value == "254":
-                        value = "host"
-                    elif value == "253":
-                        value = "link"
-                    elif value == "200":
-                        value = "site"
-                    else:
-                        raise BirdClientParseError(f"Kernel scope '{value}' found and not understood: {line}")
-                # NK: In bird 3.0.0 "krt_metric" was added
-                elif attrib == "krt_metric":
-                    value = int(value)
-                # NK: In bird 3.0.0 "Kernel.source" was renamed to "krt_source"
-                elif attrib in ("Kernel.source", "krt_source"):
-                    # Translate kernel source into value
-                    # https://github.com/BIRD/bird/blob/master/nest/route.h#L370
-                    if value == "0":
-                        value = "RTS_DUMMY"
-                    elif value == "1":
-                        value = "RTS_STATIC"
-                    elif value == "2":
-                        value = "RTS_INHERIT"
-                    elif value == "3":
-                        value = "RTS_DEVICE"
-                    elif value == "4":
-                        value = "RTS_STATIC_DEVICE"
-                    elif value == "5":
-                        value = "RTS_REDIRECT"
-                    elif value == "6":
-                        value = "RTS_RIP"
-                    elif value == "7":
-                        value = "RTS_OSPF"
-                    elif value == "8":
-                        value = "RTS_OSPF_IA"
-                    elif value == "9":
-                        value = "RTS_OSPF_EXT1"
-                    elif value == "10":
-                        value = "RTS_OSPF_EXT2"
-                    elif value == "11":
-                        value = "RTS_BGP"
-                    elif value == "12":
-                        value = "RTS_PIPE"
-                    elif value == "13":
-                        value = "RTS_BABEL"
-                    else:
-                        raise BirdClientParseError(f"Kernel source '{value}' found and not understood: {line}")
-                # NK: In bird 3.0.0 "RIP.tag" was renamed to "rip_tag"
-                elif attrib in ("RIP.tag", "rip_tag"):
-                    # This is a string (HEX)
-                    pass
-                # # NK: Bird quirk with 2.0.11, this is supposed to be hidden
-                # elif attrib == "RIP.02":  # noqa: ERA001
-                #     continue  # noqa: ERA001
-                # NK: "rip_metric" attribute introduced in 3.0.0
-                elif attrib == "rip_metric":  # noqa: SIM114
-                    value = int(value)
-                # NK: "preference" attribute introduced in 3.0.0
-                elif attrib == "preference":
-                    value = int(value)
-                # NK: "source" attribute introduced in 3.0.0
-                elif attrib == "source":
-                    # Normal string value
-                    pass
-                # Finally if we don't understand the attribute
-                else:
-                    raise BirdClientParseError(f"Failed to parse code 1012 attribute '{attrib}': {line}")
+    @_observed
+    def show_route_stats(self, args: list[str] | None = None, data: ReplyData | None = None) -> dict[str, Any]:
+        """Return parsed BIRD route statistics, the routes output along with the statistics is skipped."""
 
-                # Check if we have an attribute value already
-                if attrib in source["attributes"]:
-                    if isinstance(value, list):
-                        source["attributes"][attrib].extend(value)
-                    else:
-                        raise BirdClientParseError("Value is not a list but has multiple items")
-                else:
-                    source["attributes"][attrib] = value
+        # Grab route stats
+        if not data:
+            query = ["show", "route"]
+            if args:
+                query.extend(args)
+            query.append("stats")
+            data = self.query(query)
 
-                continue
+        return self._parse_route_counts(iter_lines(data))
+
+    @_observed
+    def show_route_counts(
+        self, tables: list[str] | None = None, protocols: list[str] | None = None
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return parsed BIRD route counts for a number of tables and protocols, queried over a single connection."""
+
+        tables = tables or []
+        protocols = protocols or []
+
+        # Build queries, tables first, then protocols
+        queries = [["show", "route", "table", table, "count"] for table in tables]
+        queries.extend(["show", "route", "protocol", protocol, "count"] for protocol in protocols)
 
-            # Check for errors
-            if code.startswith(("8", "9")):
-                raise BirdClientError(f"BIRD client error: {line}")
+        replies = self.query_many(queries)
 
-            # If we didn't match the line, we need to raise an exception
-            raise BirdClientParseError(f"Failed to parse BIRD output: {line}")
+        res: dict[str, dict[str, dict[str, Any]]] = {"tables": {}, "protocols": {}}
+        for table, reply in zip(tables, replies[: len(tables)], strict=True):
+            res["tables"][table] = self._parse_route_counts(reply)
+        for protocol, reply in zip(protocols, replies[len(tables) :], strict=True):
+            res["protocols"][protocol] = self._parse_route_counts(reply)
 
         return res
 
-    def query(self, query: str | list[str]) -> list[str]:  # pragma: no cover
-        """Open a socket to the BIRD daemon, send the query and get the response."""
+    def parse_route_dumps(
+        self, paths: str | os.PathLike[str] | Iterable[str | os.PathLike[str]], *, workers: int | None = None
+    ) -> Iterator[tuple[pathlib.Path, dict[Any, Any]]]:
+        """
+        Parse saved 'show route' output in a number of files in parallel, yielding each file and its routes as they complete.
+
+        If ``paths`` is a directory all the files in it are parsed. Each file is parsed in one of ``workers`` processes, which
+        defaults to the number of CPUs, the routes are returned the same as ``show_route()`` would return them. Compressed files
+        are decompressed as they are parsed.
+        """
+
+        if isinstance(paths, str | os.PathLike):
+            path = pathlib.Path(paths)
+            files = sorted(file for file in path.iterdir() if file.is_file()) if path.is_dir() else [path]
+        else:
+            files = [pathlib.Path(file) for file in paths]
+
+        # Reached through the package, which only imports the process pool along with multiprocessing when first used
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_parse_route_dump, self._parse_options, file) for file in files]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def connection(self) -> BirdConnection:
+        """Return a new BIRD connection, which can be used as a context manager to run multiple queries."""
 
         # Make sure socket file is set and it exists else throw a client error
         if not self._control_socket:
@@ -1019,46 +1581,321 @@ class BirdClient:
         if not control_socket_path.exists():
             raise BirdClientError(f"BIRD socket file '{self._control_socket}' does not exist")
 
-        # Create a unix socket
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-
-        # Connect to the BIRD daemon
-        sock.connect(self._control_socket)
-
-        # Build query
-        if isinstance(query, list):
-            query = " ".join(query)
-
-        # Send the query
-        sock.send(f"{query}\n".encode())
-
-        # Initialize byte array to store what we get back
-        data = bytearray()
-
-        # Set timeout just incase
-        sock.settimeout(300)
-
-        # Loop while we're not done
-        done = False
-        while not done:
-            chunk = sock.recv(4096)
-            data.extend(chunk)
-            # If the last bit of data ends us off in a newline, this may be the end of the stream
-            if data.endswith(b"\n"):
-                # Check by splitting the lines off
-                lines = data.splitlines()
-                # Grab last line
-                last_line = lines[-1]
-                # Check if this is an ending line
-                for ending in self._ending_lines:
-                    # If it is, then we're done
-                    if last_line.startswith(ending):
-                        done = True
-        # Close socket
-        sock.close()
+        return BirdConnection(self._control_socket, timeout=self._timeout, capture=self._capture)
+
+    def connection_pool(self) -> BirdConnectionPool:
+        """Return the connection pool used for concurrent queries, creating it on first use."""
+
+        if not self._pool:
+            # Make sure the socket is valid before creating the pool
+            self.connection()
+            self._pool = BirdConnectionPool(
+                str(self._control_socket), size=self._pool_size, timeout=self._timeout, capture=self._capture
+            )
+
+        return self._pool
+
+    def close(self) -> None:
+        """Close any pooled connections and flush the raw data capture."""
+
+        if self._pool:
+            self._pool.close()
+            self._pool = None
+        if self._capture:
+            self._capture.close()
+            self._capture = None
+
+    def add_observer(self, observer: Observer) -> None:
+        """
+        Add an observer, which is called with a QueryTiming breakdown of each call made.
+
+        Calls returning iterators are reported once the iterator is exhausted or closed. Calls made from within other calls are
+        reported as part of the outer call. When there are no observers no timing is done.
+        """
+
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: Observer) -> None:
+        """Remove an observer."""
+
+        self._observers.remove(observer)
+
+    @_observed
+    def query(self, query: str | list[str]) -> list[str]:
+        """Open a socket to the BIRD daemon, send the query and get the response."""
+
+        conn = self.connection()
+        conn.timing = getattr(self._local, "timing", None)
+        with conn:
+            data = conn.query(query)
+
+        if self._log_reply():
+            _LOGGER.debug("BIRD reply to '%s', %d lines:\n%s", _query_text(query), len(data), self._preview(data, len(data)))
+
+        return data
+
+    @_observed_iter
+    def query_iter(self, query: str | list[str]) -> Iterator[str]:
+        """Open a socket to the BIRD daemon, send the query and yield the response lines as they are received."""
+
+        conn = self.connection()
+        conn.timing = getattr(self._local, "timing", None)
+        log = self._log_reply()
+        preview: list[str] = []
+        count = 0
+
+        with conn:
+            conn.send(query)
+            reply = conn.iter_reply(self._read_ahead)
+            try:
+                for lines in itertools.chain([conn.greeting], reply):
+                    # Keep the start of the reply to log, without holding onto all of it
+                    if log:
+                        if len(preview) < self._debug_lines:
+                            preview.extend(lines[: self._debug_lines - len(preview)])
+                        count += len(lines)
+                    yield from lines
+            except GeneratorExit:
+                # We were stopped before the end of the reply, closing the connection rather than discarding the rest of the
+                # reply makes BIRD abort the command
+                _LOGGER.debug("Stopped reading BIRD reply to '%s', closing the connection", _query_text(query))
+                conn.close()
+                raise
+
+        if log:
+            _LOGGER.debug("BIRD reply to '%s', %d lines:\n%s", _query_text(query), count, self._preview(preview, count))
+
+    @_observed
+    def query_many(self, queries: Iterable[str | list[str]]) -> list[list[str]]:
+        """Send a number of queries to the BIRD daemon pipelined over a single connection and return the responses."""
+
+        # We go through the queries again to log the replies
+        queries = list(queries)
+        conn = self.connection()
+        conn.timing = getattr(self._local, "timing", None)
+        with conn:
+            res = conn.query_pipelined(queries)
 
         if self._debug:
-            print(f"Bird Reply:\n{data.decode('UTF-8')}")  # noqa: T201
+            for query, data in zip(queries, res, strict=True):
+                if self._log_reply():
+                    preview = self._preview(data, len(data))
+                    _LOGGER.debug("BIRD reply to '%s', %d lines:\n%s", _query_text(query), len(data), preview)
+
+        return res
+
+    def _observe_iter(self, timing: QueryTiming, iterator: Iterator[Any], elapsed: float) -> Iterator[Any]:
+        """Pass through the items of an iterator, timing the work done to produce them and notifying our observers when done."""
+
+        try:
+            while True:
+                # Time only the work done in the iterator, not the time taken by our caller to consume each item
+                self._local.timing = timing
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - started
+                    self._local.timing = None
+                timing.result_size += 1
+                yield item
+        except Exception as err:
+            timing.error = str(err)
+            raise
+        finally:
+            getattr(iterator, "close", lambda: None)()
+            timing.finish(elapsed)
+            self._notify(timing)
+
+    def _log_reply(self) -> bool:
+        """Return True if the next reply should be logged."""
+
+        if not self._debug or not _LOGGER.isEnabledFor(logging.DEBUG):
+            return False
+        return next(self._debug_counter) % self._debug_sample == 0
+
+    def _preview(self, lines: list[str], total: int) -> _ReplyPreview:
+        """Return a preview of a reply for logging."""
+        return _ReplyPreview(lines[: self._debug_lines], total, self._debug_chars)
+
+    def _notify(self, timing: QueryTiming) -> None:
+        """Notify our observers of the timing of a call."""
+
+        for observer in self._observers:
+            observer(timing)
+
+    def _plan_route_shards(
+        self, pool: BirdConnectionPool, table: str, family: int, shard_bits: int, max_shard_routes: int | None
+    ) -> tuple[list[str], list[str]]:
+        """Work out the shards to retrieve a table with, splitting shards which are too large if a limit was given."""
+
+        shards, exact = _route_shards(_FAMILY_DEFAULT_ROUTES[family], shard_bits)
+
+        # If we have no limit on the shard size, we're done
+        if not max_shard_routes:
+            return shards, exact
+
+        res = []
+        pending = shards
+        while pending:
+            with pool.connection() as conn:
+                replies = [conn.query(["show", "route", "table", table, "in", shard, "count"]) for shard in pending]
+            current, pending = pending, []
+            for shard, reply in zip(current, replies, strict=True):
+                networks = self._parse_route_counts(reply)["total"]["networks"]
+                # Empty shards don't need to be retrieved
+                if not networks:
+                    continue
+                # Split shards that are too large, as long as there is something left to split
+                network = ipaddress.ip_network(shard)
+                if networks > max_shard_routes and network.prefixlen < network.max_prefixlen:
+                    split_shards, split_exact = _route_shards(shard, 1)
+                    pending.extend(split_shards)
+                    exact.extend(split_exact)
+                    continue
+                res.append(shard)
+
+        return res, exact
+
+    def _fetch_route_shard(self, pool: BirdConnectionPool, queries: list[list[str]]) -> list[tuple[Any, list[dict[str, Any]]]]:
+        """Run shard queries over a pooled connection and return the parsed routes."""
+
+        res = []
+        with pool.connection() as conn:
+            for query in queries:
+                data = conn.query(query)
+                # Exact lookups for networks that don't exist return an error we can ignore
+                if data[-1].startswith("8001 "):
+                    continue
+                res.extend(self._iter_routes(data))
+
+        return res
+
+    def _lookup_routes_batch(
+        self,
+        conn: BirdConnection,
+        addresses: list[str],
+        table_args: list[str],
+        cache: RouteLookupCache,
+        res: dict[str, dict[str, list[dict[str, Any]]]],
+    ) -> None:
+        """Lookup a batch of addresses and add the results to the cache."""
+
+        new_prefixes: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        for address, data in zip(
+            addresses, conn.query_pipelined([["show", "route", *table_args, "for", x, "all"] for x in addresses]), strict=True
+        ):
+            # Addresses without a matching route return an error
+            routes = {} if data[-1].startswith("8001 ") else self.show_route(data=data)
+            res[address] = routes
+            cache.add_address(address, routes)
+            for prefix, sources in routes.items():
+                prefix_str = prefix_to_str(prefix)
+                if not cache.is_checked(prefix_str):
+                    new_prefixes[prefix_str] = {prefix: sources}
+
+        # Check which of the new prefixes have more specifics, those that don't can be used to resolve other addresses
+        prefixes = list(new_prefixes)
+        for prefix, data in zip(
+            prefixes, conn.query_pipelined([["show", "route", *table_args, "in", x, "count"] for x in prefixes]), strict=True
+        ):
+            networks = self._parse_route_counts(data)["total"]["networks"]
+            cache.add_prefix(prefix, new_prefixes[prefix], leaf=networks == 1)
+
+    def _parse_route_counts(self, data: Iterable[str]) -> dict[str, Any]:
+        """Parse the route count summary lines output by 'show route ... count' and 'show route ... stats'."""
+
+        res: dict[str, Any] = {
+            "tables": {},
+            "total": {},
+        }
+
+        for line in data:
+            # Fast path to skip over route lines when parsing 'stats' output
+            if " routes for " not in line:
+                # Check for errors
+                if line[:1] in ("8", "9") and line[:4].isdigit():
+                    raise BirdClientError(f"BIRD client error: {line[5:]}")
+                continue
+
+            match = _ROUTE_COUNT_MATCH.match(line)
+            if not match:
+                raise BirdClientParseError(f"Failed to parse route count: {line}")
+
+            counts = {
+                "routes": int(match.group("routes")),
+                "routes_total": int(match.group("routes_total")),
+                "networks": int(match.group("networks")),
+            }
+
+            # Per table count
+            table = match.group("table")
+            if table:
+                res["tables"][table] = counts
+                continue
+
+            # Total count across a number of tables, or from older versions of BIRD which don't output the table name
+            tables = match.group("tables")
+            counts["tables"] = int(tables) if tables else 1
+            res["total"] = counts
+
+        # If we didn't get a total line, we need to work it out ourselves
+        if not res["total"]:
+            res["total"] = {
+                "routes": sum(x["routes"] for x in res["tables"].values()),
+                "routes_total": sum(x["routes_total"] for x in res["tables"].values()),
+                "networks": sum(x["networks"] for x in res["tables"].values()),
+                "tables": len(res["tables"]),
+            }
+
+        return res
+
 
-        # Convert data bytes to a string and split into lines
-        return data.decode("UTF-8").splitlines()
+def _parse_route_dump(options: dict[str, Any], path: pathlib.Path) -> tuple[pathlib.Path, dict[Any, Any]]:
+    """Parse a file of saved 'show route' output in a worker process."""
+    return path, BirdClient(**options).show_route(data=path)
+
+
+def _limit_routes(
+    routes: Iterator[tuple[Any, list[dict[str, Any]]]], reply: Iterator[str] | None, limit: int | None
+) -> Iterator[tuple[Any, list[dict[str, Any]]]]:
+    """Yield up to ``limit`` routes, closing the reply they are parsed from as soon as we stop so BIRD stops sending it."""
+
+    try:
+        if limit is None:
+            yield from routes
+            return
+        if limit <= 0:
+            return
+        remaining = limit
+        for route in routes:
+            remaining -= 1
+            if not remaining:
+                # Stop receiving the reply before returning the last route, as our caller may not ask for more
+                _close_iterators(routes, reply)
+                yield route
+                return
+            yield route
+    finally:
+        _close_iterators(routes, reply)
+
+
+def _close_iterators(*iterators: Iterator[Any] | None) -> None:
+    """Close the iterators which are generators."""
+
+    for iterator in iterators:
+        getattr(iterator, "close", lambda: None)()
+
+
+def _feed_sinks(
+    routes: Iterable[tuple[Any, list[dict[str, Any]]]], sinks: Iterable[RouteSink]
+) -> Iterator[tuple[Any, list[dict[str, Any]]]]:
+    """Pass each prefix and its sources to the sinks as they are yielded."""
+
+    adds = [sink.add for sink in sinks]
+    for prefix, sources in routes:
+        for add in adds:
+            add(prefix, sources)
+        yield prefix, sources
@@ -0,0 +1,146 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Compact address and prefix representations."""
+
+import functools
+import ipaddress
+import socket
+from collections.abc import Callable
+from typing import Any
+
+from .exceptions import BirdClientError, BirdClientParseError
+
+__all__ = [
+    "ADDRESS_FORMATS",
+    "address_converter",
+    "address_to_int",
+    "address_to_ipaddress",
+    "prefix_as_int",
+    "prefix_converter",
+    "prefix_to_int",
+    "prefix_to_ipaddress",
+    "prefix_to_str",
+]
+
+
+# Formats we can return prefixes and addresses in
+ADDRESS_FORMATS = ("str", "int", "ipaddress")
+
+# ipaddress classes for each address family
+_ADDRESS_CLASSES: dict[int, type[ipaddress.IPv4Address | ipaddress.IPv6Address]] = {
+    4: ipaddress.IPv4Address,
+    6: ipaddress.IPv6Address,
+}
+_NETWORK_CLASSES: dict[int, type[ipaddress.IPv4Network | ipaddress.IPv6Network]] = {
+    4: ipaddress.IPv4Network,
+    6: ipaddress.IPv6Network,
+}
+
+
+def address_to_int(address: str) -> tuple[int, int]:
+    """Return an address as an (address, family) tuple of integers, where family is 4 or 6."""
+
+    # inet_pton is implemented in C and is quicker than splitting and converting the address ourselves
+    try:
+        if ":" in address:
+            return int.from_bytes(socket.inet_pton(socket.AF_INET6, address)), 6
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, address)), 4
+    except OSError as err:
+        raise BirdClientParseError(f"Failed to parse address '{address}'") from err
+
+
+def prefix_to_int(prefix: str) -> tuple[int, int, int]:
+    """Return a prefix as a (network, length, family) tuple of integers, where family is 4 or 6."""
+
+    address, _, length = prefix.partition("/")
+    network, family = address_to_int(address)
+    return network, int(length), family
+
+
+@functools.lru_cache(maxsize=65536)
+def address_to_ipaddress(address: str) -> ipaddress.IPv4Address | ipaddress.IPv6Address:
+    """Return an address as a cached ipaddress object."""
+
+    network, family = address_to_int(address)
+    return _ADDRESS_CLASSES[family](network)
+
+
+@functools.lru_cache(maxsize=65536)
+def prefix_to_ipaddress(prefix: str) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+    """Return a prefix as a cached ipaddress object."""
+
+    # Creating the network from integers skips ipaddress having to parse the string itself
+    network, length, family = prefix_to_int(prefix)
+    try:
+        return _NETWORK_CLASSES[family]((network, length))
+    except ValueError as err:
+        raise BirdClientParseError(f"Failed to parse prefix '{prefix}'") from err
+
+
+def prefix_to_str(prefix: Any) -> str:  # noqa: ANN401
+    """Return a prefix in any of our formats as a string."""
+
+    if isinstance(prefix, tuple):
+        network, length, family = prefix
+        return str(_NETWORK_CLASSES[family]((network, length)))
+    return str(prefix)
+
+
+def prefix_as_int(prefix: Any) -> tuple[int, int, int]:  # noqa: ANN401
+    """Return a prefix in any of our formats as a (network, length, family) tuple of integers."""
+
+    if isinstance(prefix, tuple):
+        return prefix  # type: ignore[return-value]
+    if isinstance(prefix, ipaddress.IPv4Network | ipaddress.IPv6Network):
+        return int(prefix.network_address), prefix.prefixlen, prefix.version
+    return prefix_to_int(prefix)
+
+
+# Cache conversion of addresses to integers, these are mostly gateways and next hops which repeat a lot
+_address_to_int_cached = functools.lru_cache(maxsize=65536)(address_to_int)
+
+
+def address_converter(address_format: str) -> Callable[[str], Any]:
+    """Return a function converting addresses into the format requested."""
+
+    if address_format == "str":
+        return str
+    if address_format == "int":
+        return _address_to_int_cached
+    if address_format == "ipaddress":
+        return address_to_ipaddress
+    raise BirdClientError(f"Unknown address format '{address_format}', must be one of: {', '.join(ADDRESS_FORMATS)}")
+
+
+def prefix_converter(address_format: str) -> Callable[[str], Any]:
+    """Return a function converting prefixes into the format requested."""
+
+    if address_format == "str":
+        return str
+    if address_format == "int":
+        return prefix_to_int
+    if address_format == "ipaddress":
+        return prefix_to_ipaddress
+    raise BirdClientError(f"Unknown address format '{address_format}', must be one of: {', '.join(ADDRESS_FORMATS)}")
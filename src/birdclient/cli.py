@@ -0,0 +1,151 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""BIRD client command line interface."""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from collections.abc import Callable, Iterable
+from typing import Any, TextIO
+
+from . import BirdClient, BirdClientError, __version__
+
+__all__ = ["main"]
+
+
+# Number of records written between flushes of the output
+FLUSH_INTERVAL = 1024
+
+
+def _fields(value: str) -> list[str]:
+    """Parse a comma separated list of fields."""
+    return [field.strip() for field in value.split(",") if field.strip()]
+
+
+def _project(data: dict[str, Any], fields: list[str] | None) -> dict[str, Any]:
+    """Return only the requested fields of a dict."""
+
+    if not fields:
+        return data
+    return {field: data[field] for field in fields if field in data}
+
+
+def _write_records(out: TextIO, records: Iterable[dict[str, Any]]) -> None:
+    """Write records as newline delimited JSON, flushing as we go so consumers get output straight away."""
+
+    encode = json.JSONEncoder(default=str, separators=(",", ":")).encode
+    for count, record in enumerate(records):
+        out.write(encode(record) + "\n")
+        if count % FLUSH_INTERVAL == 0:
+            out.flush()
+    out.flush()
+
+
+def _cmd_status(client: BirdClient, args: argparse.Namespace, out: TextIO) -> None:
+    """Output the BIRD status."""
+    _write_records(out, [_project(client.show_status(), args.fields)])
+
+
+def _cmd_protocols(client: BirdClient, args: argparse.Namespace, out: TextIO) -> None:
+    """Output BIRD protocols, one per line."""
+
+    def records() -> Iterable[dict[str, Any]]:
+        for name in args.names or [None]:
+            for protocol in client.show_protocols_iter(args=[name] if name else None, details=not args.summary):
+                yield _project(protocol, args.fields)
+
+    _write_records(out, records())
+
+
+def _cmd_routes(client: BirdClient, args: argparse.Namespace, out: TextIO) -> None:
+    """Output the routes in a BIRD table, one prefix per line."""
+
+    records = (
+        {"prefix": prefix, "sources": [_project(source, args.fields) for source in sources]}
+        for prefix, sources in client.show_route_table_iter(args.table, limit=args.limit)
+    )
+    _write_records(out, records)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build our argument parser."""
+
+    parser = argparse.ArgumentParser(prog="birdclient", description="Query BIRD and output the results as JSON.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--socket", help="BIRD control socket, defaults to /run/bird.ctl or /run/bird/bird.ctl")
+    parser.add_argument("--timeout", type=float, default=300, help="BIRD query timeout in seconds (default: %(default)s)")
+    parser.add_argument("--debug", action="store_true", help="Log the start of each BIRD reply to stderr")
+    parser.add_argument("--capture", metavar="FILE", help="Append all data received from BIRD to FILE as is")
+
+    # Options shared by all commands
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--fields", type=_fields, help="Comma separated list of fields to output")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    status = commands.add_parser("status", parents=[common], help="Output the BIRD status")
+    status.set_defaults(func=_cmd_status)
+
+    protocols = commands.add_parser("protocols", parents=[common], help="Output BIRD protocols as newline delimited JSON")
+    protocols.add_argument("names", nargs="*", help="Protocols to output, defaults to all")
+    protocols.add_argument("--summary", action="store_true", help="Only output the protocol summary, which is quicker")
+    protocols.set_defaults(func=_cmd_protocols)
+
+    routes = commands.add_parser("routes", parents=[common], help="Output the routes in a table as newline delimited JSON")
+    routes.add_argument("table", help="Table to output")
+    routes.add_argument("--limit", type=int, help="Only output the first LIMIT prefixes, stopping BIRD once we have them")
+    routes.set_defaults(func=_cmd_routes)
+
+    return parser
+
+
+def main(argv: list[str] | None = None, out: TextIO | None = None) -> int:
+    """Run the command line interface and return the exit code."""
+
+    args = _build_parser().parse_args(argv)
+    if out is None:
+        out = sys.stdout
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG, stream=sys.stderr, format="%(asctime)s %(name)s: %(message)s")
+
+    client = BirdClient(args.socket, args.debug, timeout=args.timeout, capture=args.capture)
+    func: Callable[[BirdClient, argparse.Namespace, TextIO], None] = args.func
+    try:
+        func(client, args, out)
+    except BirdClientError as err:
+        print(f"ERROR: {err}", file=sys.stderr)  # noqa: T201
+        return 1
+    except BrokenPipeError:  # pragma: no cover
+        # Our output was closed early, like when piped into 'head', point stdout at devnull so Python doesn't complain on exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    finally:
+        client.close()
+
+    return 0
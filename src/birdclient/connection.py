@@ -0,0 +1,518 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""BIRD control socket connection."""
+
+import logging
+import os
+import pathlib
+import queue
+import re
+import socket
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, suppress
+from types import TracebackType
+from typing import BinaryIO, Self
+
+from .exceptions import BirdClientError
+from .observers import QueryTiming
+
+__all__ = ["BirdConnection", "BirdConnectionPool", "RawCapture"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# A reply ends with the first line that has a 4 digit code followed by a space or nothing, continuation lines use a "-" or start
+# with a space
+_REPLY_END_MATCH = re.compile(rb"[0-9]{4}(?: [^\n]*)?\n")
+# Searching for the newline before the reply end line is far quicker than trying to match it at the start of every line
+_REPLY_END_NEXT_MATCH = re.compile(rb"\n[0-9]{4}(?: [^\n]*)?\n")
+
+
+def _reply_end(buffer: bytearray) -> int:
+    """Return the offset after the reply end line in a buffer starting at the beginning of a line, or -1 if it isn't there."""
+
+    match = _REPLY_END_MATCH.match(buffer) or _REPLY_END_NEXT_MATCH.search(buffer)
+    return match.end() if match else -1
+
+
+class RawCapture:
+    """Thread safe sink writing the raw bytes received from BIRD to a file, as they are received and without decoding them."""
+
+    # File we're writing to
+    _file: BinaryIO
+    # If we opened the file, and need to close it
+    _owned: bool
+    # Lock serializing writes from connections in different threads
+    _lock: threading.Lock
+
+    def __init__(self, target: str | os.PathLike[str] | BinaryIO) -> None:
+        """Initialize the object, appending to the file if given a path."""
+
+        if isinstance(target, str | os.PathLike):
+            self._file = pathlib.Path(target).open("ab")  # noqa: SIM115
+            self._owned = True
+        else:
+            self._file = target
+            self._owned = False
+        self._lock = threading.Lock()
+
+    def write(self, data: bytes) -> None:
+        """Write received data."""
+
+        with self._lock:
+            self._file.write(data)
+
+    def close(self) -> None:
+        """Flush the data written, closing the file if we opened it."""
+
+        with self._lock:
+            if self._owned:
+                self._file.close()
+            else:
+                self._file.flush()
+
+
+class BirdConnection:
+    """
+    Persistent connection to the BIRD control socket.
+
+    BIRD processes commands sent over one connection in order, so a single connection can be used to run many queries without
+    paying for a new socket and greeting each time.
+    """
+
+    # Socket file
+    _control_socket: str
+    # Socket timeout
+    _timeout: float
+    # Size of each socket read
+    _recv_size: int
+    # Socket we're connected with
+    _sock: socket.socket | None
+    # Received data not yet returned as part of a reply
+    _buffer: bytearray
+    # Greeting lines sent by BIRD when we connected
+    _greeting: list[str]
+    # Sink for the raw data received
+    _capture: RawCapture | None
+    # Most data we discard from a reply which was not read to the end before closing the connection instead
+    _drain_limit: int
+    # Timing of the current call, if it is being observed
+    timing: QueryTiming | None
+
+    def __init__(
+        self,
+        control_socket: str,
+        timeout: float = 300,
+        recv_size: int = 65536,
+        capture: RawCapture | None = None,
+        drain_limit: int = 1 << 20,
+    ) -> None:
+        """
+        Initialize the object, if ``capture`` is given all data received is written to it.
+
+        When a reply is not read to the end, the rest of it is discarded so the connection can be used for the next query. If more
+        than ``drain_limit`` bytes of it are left the connection is closed instead, which makes BIRD stop sending it.
+        """
+
+        self._control_socket = control_socket
+        self._timeout = timeout
+        self._recv_size = recv_size
+        self._capture = capture
+        self._drain_limit = drain_limit
+        self._sock = None
+        self._buffer = bytearray()
+        self._greeting = []
+        self.timing = None
+
+    def __enter__(self) -> Self:
+        """Open the connection when used as a context manager."""
+        self.open()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Close the connection when leaving the context."""
+        self.close()
+
+    @property
+    def greeting(self) -> list[str]:
+        """Return the greeting lines BIRD sent when we connected."""
+        return self._greeting
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the connection is open."""
+        return self._sock is not None
+
+    def open(self) -> None:
+        """Connect to BIRD and read the greeting."""
+
+        if self._sock:
+            return
+
+        started = time.perf_counter() if self.timing else 0.0
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self._timeout)
+        try:
+            sock.connect(self._control_socket)
+        except OSError as err:
+            sock.close()
+            raise BirdClientError(f"Failed to connect to BIRD socket '{self._control_socket}': {err}") from err
+        self._sock = sock
+        self._buffer.clear()
+        _LOGGER.debug("Connected to BIRD socket '%s'", self._control_socket)
+
+        # BIRD sends us a single line greeting before accepting commands, which we don't count as part of the reply
+        timing = self.timing
+        self.timing = None
+        try:
+            self._greeting = self.read_reply_lines()
+        finally:
+            self.timing = timing
+        if timing:
+            timing.connect += time.perf_counter() - started
+
+    def close(self) -> None:
+        """Close the connection."""
+
+        # A reader thread may be closing the connection at the same time
+        sock, self._sock = self._sock, None
+        if sock:
+            # Shutting the socket down first wakes up a reader thread waiting to receive from it
+            with suppress(OSError):
+                sock.shutdown(socket.SHUT_RDWR)
+            sock.close()
+            _LOGGER.debug("Closed connection to BIRD socket '%s'", self._control_socket)
+        self._buffer.clear()
+
+    def send(self, query: str | list[str]) -> None:
+        """Send a query to BIRD without waiting for the reply."""
+
+        self._send_queries([query])
+
+    def iter_reply(self, read_ahead: int = 0) -> Iterator[list[str]]:
+        """
+        Yield the lines of the next reply in batches as they are received, the last batch ends with the reply end line.
+
+        If ``read_ahead`` is set, the reply is received and decoded by a separate thread which queues up to that many batches
+        ahead of us, so receiving the reply overlaps with whatever we do with each batch. The reader waits when the queue is full,
+        which bounds the memory used when we can't keep up.
+
+        If the iterator is closed before the end of the reply, the rest of the reply is discarded, see ``discard_reply()``.
+        """
+
+        if read_ahead > 0:
+            return self._iter_reply_read_ahead(read_ahead)
+        return self._iter_reply()
+
+    def _iter_reply(self) -> Iterator[list[str]]:
+        """Yield the lines of the next reply in batches as they are received."""
+
+        buffer = self._buffer
+        complete = False
+        try:
+            while True:
+                # Check if the reply end line is in what we have so far, the buffer always starts at the beginning of a line
+                end = _reply_end(buffer)
+                if end >= 0:
+                    block = buffer[:end]
+                    del buffer[:end]
+                    complete = True
+                    yield self._decode(block)
+                    return
+                # Return all complete lines we have so far
+                last_newline = buffer.rfind(b"\n")
+                if last_newline >= 0:
+                    block = buffer[: last_newline + 1]
+                    del buffer[: last_newline + 1]
+                    yield self._decode(block)
+                buffer.extend(self._recv())
+        except GeneratorExit:
+            # We were stopped part way through the reply, if discarding the rest fails the connection is closed anyway
+            if not complete:
+                with suppress(BirdClientError):
+                    self.discard_reply()
+            raise
+
+    def _iter_reply_read_ahead(self, read_ahead: int) -> Iterator[list[str]]:
+        """Yield the lines of the next reply in batches, received by a reader thread up to ``read_ahead`` batches ahead of us."""
+
+        # Batches of lines, followed by None at the end of the reply or the error the reader hit
+        batches: queue.Queue[list[str] | Exception | None] = queue.Queue(read_ahead)
+        stop = threading.Event()
+
+        def reader() -> None:
+            reply = self._iter_reply()
+            try:
+                for batch in reply:
+                    batches.put(batch)
+                    if stop.is_set():
+                        break
+            except Exception as err:  # noqa: BLE001
+                batches.put(err)
+                return
+            finally:
+                # Discard the rest of the reply if we were stopped part way through
+                reply.close()
+            batches.put(None)
+
+        thread = threading.Thread(target=reader, name="birdclient-reader", daemon=True)
+        thread.start()
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    return
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            # Stop the reader, taking anything it queues so it doesn't block on a full queue
+            stop.set()
+            while thread.is_alive():
+                try:
+                    batches.get_nowait()
+                except queue.Empty:
+                    thread.join(0.01)
+
+    def discard_reply(self) -> None:
+        """
+        Discard the rest of the reply being received without decoding it, leaving the connection ready for the next reply.
+
+        If more than ``drain_limit`` bytes are discarded without reaching the end of the reply, the connection is closed instead,
+        which makes BIRD abort the command rather than us waiting for all of its output.
+        """
+
+        buffer = self._buffer
+        discarded = 0
+        while self._sock:
+            end = _reply_end(buffer)
+            if end >= 0:
+                del buffer[:end]
+                _LOGGER.debug("Discarded %d bytes of BIRD reply", discarded + end)
+                return
+            # Only keep the last partial line, which could be the start of the reply end line
+            last_newline = buffer.rfind(b"\n")
+            if last_newline >= 0:
+                discarded += last_newline + 1
+                del buffer[: last_newline + 1]
+            if discarded > self._drain_limit:
+                _LOGGER.debug("Closing connection to abort BIRD reply after discarding %d bytes", discarded)
+                self.close()
+                return
+            buffer.extend(self._recv())
+
+    def read_reply_lines(self) -> list[str]:
+        """Read the next reply and return its lines."""
+
+        lines: list[str] = []
+        for batch in self.iter_reply():
+            lines.extend(batch)
+        return lines
+
+    def read_reply(self) -> list[str]:
+        """Read the next reply, returning the lines prefixed with the greeting as if it was a new connection."""
+
+        return self._greeting + self.read_reply_lines()
+
+    def query(self, query: str | list[str]) -> list[str]:
+        """Send a query and return the reply lines prefixed with the greeting."""
+
+        self.send(query)
+        return self.read_reply()
+
+    def query_pipelined(self, queries: Iterable[str | list[str]], window: int = 32) -> list[list[str]]:
+        """
+        Send a number of queries and return their replies, keeping up to ``window`` queries in flight at a time.
+
+        Pipelining the queries avoids waiting a round trip between each query and the next, which adds up when running many small
+        queries.
+        """
+
+        queries = list(queries)
+        res = []
+        sent = 0
+        for received in range(len(queries)):
+            # Top up the queries in flight
+            if sent < len(queries) and sent - received < window:
+                send_to = min(len(queries), received + window)
+                self._send_queries(queries[sent:send_to])
+                sent = send_to
+            res.append(self.read_reply())
+
+        return res
+
+    def _send_queries(self, queries: list[str | list[str]]) -> None:
+        """Send queries to BIRD in one go."""
+
+        if not self._sock:
+            raise BirdClientError("BIRD connection is not open")
+
+        # Build queries
+        payload = "".join(f"{' '.join(query) if isinstance(query, list) else query}\n" for query in queries)
+
+        timing = self.timing
+        started = time.perf_counter() if timing else 0.0
+        try:
+            self._sock.sendall(payload.encode())
+        except OSError as err:
+            self.close()
+            raise BirdClientError(f"Failed to send query to BIRD: {err}") from err
+        if timing:
+            timing.sent_at = time.perf_counter()
+            timing.send += timing.sent_at - started
+
+    def _recv(self) -> bytes:
+        """Receive the next chunk of data from BIRD."""
+
+        # Keep our own reference, as the connection can be closed by another thread while we wait
+        sock = self._sock
+        if not sock:
+            raise BirdClientError("BIRD connection is not open")
+
+        timing = self.timing
+        started = time.perf_counter() if timing else 0.0
+        try:
+            chunk = sock.recv(self._recv_size)
+        except TimeoutError as err:
+            self.close()
+            raise BirdClientError(f"Timeout waiting for reply from BIRD after {self._timeout}s") from err
+        except OSError as err:
+            self.close()
+            raise BirdClientError(f"Failed to receive reply from BIRD: {err}") from err
+
+        if not chunk:
+            self.close()
+            raise BirdClientError("BIRD closed the connection before the reply was complete")
+
+        if self._capture:
+            self._capture.write(chunk)
+
+        if timing:
+            now = time.perf_counter()
+            timing.wait += now - started
+            if not timing.bytes_received:
+                timing.first_byte = now - timing.sent_at
+            timing.last_byte = now - timing.sent_at
+            timing.bytes_received += len(chunk)
+
+        return chunk
+
+    def _decode(self, block: bytearray) -> list[str]:
+        """Decode a block of received lines."""
+
+        timing = self.timing
+        if not timing:
+            return block.decode("UTF-8").splitlines()
+
+        started = time.perf_counter()
+        lines = block.decode("UTF-8").splitlines()
+        timing.decode += time.perf_counter() - started
+        timing.lines += len(lines)
+        return lines
+
+
+class BirdConnectionPool:
+    """
+    Thread safe pool of persistent BIRD connections.
+
+    At most ``size`` connections are open at any one time, threads wanting a connection when they are all in use will block until
+    one is released.
+    """
+
+    # Socket file
+    _control_socket: str
+    # Socket timeout
+    _timeout: float
+    # Idle connections available for use
+    _idle: list[BirdConnection]
+    # Lock protecting the idle list
+    _lock: threading.Lock
+    # Semaphore limiting the number of connections in use
+    _slots: threading.BoundedSemaphore
+    # Sink for the raw data received
+    _capture: RawCapture | None
+
+    def __init__(self, control_socket: str, size: int = 4, timeout: float = 300, capture: RawCapture | None = None) -> None:
+        """Initialize the object."""
+
+        if size < 1:
+            raise BirdClientError("BIRD connection pool size must be at least 1")
+
+        self._control_socket = control_socket
+        self._timeout = timeout
+        self._capture = capture
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def __enter__(self) -> Self:
+        """Return ourselves when used as a context manager."""
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Close all idle connections when leaving the context."""
+        self.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[BirdConnection]:
+        """Borrow an open connection from the pool, returning it to the pool afterwards if it is still usable."""
+
+        self._slots.acquire()
+        try:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = BirdConnection(self._control_socket, timeout=self._timeout, capture=self._capture)
+            conn.open()
+
+            try:
+                yield conn
+            except BaseException:
+                # We don't know what state the connection is in, so don't reuse it
+                conn.close()
+                raise
+
+            # Return the connection to the pool if it is still open
+            if conn.is_open:
+                with self._lock:
+                    self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+        for conn in idle:
+            conn.close()
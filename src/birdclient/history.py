@@ -0,0 +1,498 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Route history stored in SQLite."""
+
+import datetime as dt
+import hashlib
+import json
+import os
+import sqlite3
+from collections.abc import Iterable, Iterator, Mapping
+from types import TracebackType
+from typing import Any, Self
+
+from .addresses import prefix_to_str
+from .exceptions import BirdClientNotFoundError
+from .sinks import source_as_path, source_communities
+
+__all__ = ["RouteHistory"]
+
+
+# Schema version, stored in the database using 'PRAGMA user_version'
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    prefixes INTEGER NOT NULL DEFAULT 0,
+    sources INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS snapshots_table_name ON snapshots (table_name, id);
+
+CREATE TABLE IF NOT EXISTS prefixes (
+    id INTEGER PRIMARY KEY,
+    prefix TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS as_paths (
+    id INTEGER PRIMARY KEY,
+    as_path TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS attribute_sets (
+    id INTEGER PRIMARY KEY,
+    attributes TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS communities (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    community TEXT NOT NULL,
+    UNIQUE (community, kind)
+);
+
+CREATE TABLE IF NOT EXISTS attribute_set_communities (
+    attribute_set_id INTEGER NOT NULL REFERENCES attribute_sets (id),
+    community_id INTEGER NOT NULL REFERENCES communities (id),
+    PRIMARY KEY (attribute_set_id, community_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS attribute_set_communities_community_id ON attribute_set_communities (community_id);
+
+-- Each source is stored once for as long as it stays the same, from the snapshot it was added in until the snapshot it was
+-- removed or changed in
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    hash BLOB NOT NULL,
+    added_snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    removed_snapshot_id INTEGER REFERENCES snapshots (id),
+    prefix_id INTEGER NOT NULL REFERENCES prefixes (id),
+    protocol TEXT,
+    since TEXT,
+    origin_as INTEGER,
+    as_path_id INTEGER REFERENCES as_paths (id),
+    attribute_set_id INTEGER REFERENCES attribute_sets (id),
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sources_current ON sources (table_name, hash) WHERE removed_snapshot_id IS NULL;
+CREATE INDEX IF NOT EXISTS sources_prefix_id ON sources (prefix_id);
+CREATE INDEX IF NOT EXISTS sources_origin_as ON sources (origin_as);
+CREATE INDEX IF NOT EXISTS sources_attribute_set_id ON sources (attribute_set_id);
+CREATE INDEX IF NOT EXISTS sources_removed_snapshot_id ON sources (removed_snapshot_id);
+
+-- The position of each source among the sources of its prefix and whether it is the best path, which change without the source
+-- changing, so a source keeps its row when the sources of a prefix are reordered
+CREATE TABLE IF NOT EXISTS source_positions (
+    id INTEGER PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    source_id INTEGER NOT NULL REFERENCES sources (id),
+    added_snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    removed_snapshot_id INTEGER REFERENCES snapshots (id),
+    position INTEGER NOT NULL,
+    bestpath INTEGER
+);
+CREATE INDEX IF NOT EXISTS source_positions_current ON source_positions (table_name) WHERE removed_snapshot_id IS NULL;
+CREATE INDEX IF NOT EXISTS source_positions_source_id ON source_positions (source_id, added_snapshot_id);
+"""
+
+# Sources received for the snapshot being added, before they are normalised into the tables above
+_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS staged_sources (
+    hash BLOB NOT NULL PRIMARY KEY,
+    prefix TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    bestpath INTEGER,
+    protocol TEXT,
+    since TEXT,
+    origin_as INTEGER,
+    as_path TEXT,
+    attributes TEXT,
+    source TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TEMP TABLE IF NOT EXISTS staged_communities (
+    attributes TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    community TEXT NOT NULL,
+    PRIMARY KEY (attributes, kind, community)
+) WITHOUT ROWID;
+"""
+
+# Reusing an encoder skips json.dumps() creating one for each call
+_JSON_ENCODER = json.JSONEncoder(default=str, separators=(",", ":"))
+
+
+class RouteHistory:
+    """
+    History of routing tables stored in SQLite.
+
+    Each snapshot of a table added only stores the sources that were added or changed since the previous snapshot of the same
+    table, sources that were removed or changed are marked as removed in the new snapshot. The position of a source and whether it
+    is the best path are stored apart from it, so sources that were only reordered are not stored again. Prefixes, AS paths,
+    attribute sets and communities are each stored once and referenced by the sources.
+
+    Values are stored as JSON, so tuples like communities are returned as lists, and 'since', address and prefix values in
+    formats other than strings are returned as strings.
+    """
+
+    # Database connection
+    _conn: sqlite3.Connection
+    # Number of rows inserted per batch
+    _batch_size: int
+
+    def __init__(self, path: str | os.PathLike[str], *, batch_size: int = 10000) -> None:
+        """Open the history database at ``path``, creating it if it doesn't exist."""
+
+        self._conn = sqlite3.connect(path)
+        self._batch_size = batch_size
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._conn.executescript(_STAGING)
+
+    def __enter__(self) -> Self:
+        """Return ourselves when used as a context manager."""
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Close the database when leaving the context."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def add_snapshot(
+        self,
+        table: str,
+        routes: Mapping[Any, list[dict[str, Any]]] | Iterable[tuple[Any, list[dict[str, Any]]]],
+        *,
+        taken_at: dt.datetime | None = None,
+    ) -> int:
+        """
+        Add a snapshot of a table and return its ID.
+
+        The routes are the result of ``show_route_table()`` or ``show_route_table_iter()``, which are stored as they are received
+        in batches. The whole snapshot is added in a single transaction.
+        """
+
+        if taken_at is None:
+            taken_at = dt.datetime.now(dt.UTC)
+
+        conn = self._conn
+        with conn:
+            snapshot_id = conn.execute(
+                "INSERT INTO snapshots (table_name, taken_at) VALUES (?, ?)", (table, taken_at.isoformat())
+            ).lastrowid
+            prefixes = self._stage(routes.items() if isinstance(routes, Mapping) else routes)
+
+            # Add any new prefixes, AS paths, attribute sets and communities
+            conn.execute("INSERT OR IGNORE INTO prefixes (prefix) SELECT prefix FROM staged_sources")
+            conn.execute("INSERT OR IGNORE INTO as_paths (as_path) SELECT as_path FROM staged_sources WHERE as_path IS NOT NULL")
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO attribute_sets (attributes)
+                SELECT attributes FROM staged_sources WHERE attributes IS NOT NULL
+                """
+            )
+            conn.execute("INSERT OR IGNORE INTO communities (kind, community) SELECT kind, community FROM staged_communities")
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO attribute_set_communities (attribute_set_id, community_id)
+                SELECT attribute_sets.id, communities.id
+                FROM staged_communities
+                JOIN attribute_sets ON attribute_sets.attributes = staged_communities.attributes
+                JOIN communities
+                    ON communities.community = staged_communities.community AND communities.kind = staged_communities.kind
+                """
+            )
+
+            # Mark the sources which are no longer there as removed, then add the new ones
+            conn.execute(
+                """
+                UPDATE sources SET removed_snapshot_id = ?
+                WHERE table_name = ? AND removed_snapshot_id IS NULL AND hash NOT IN (SELECT hash FROM staged_sources)
+                """,
+                (snapshot_id, table),
+            )
+            conn.execute(
+                """
+                INSERT INTO sources (
+                    table_name, hash, added_snapshot_id, prefix_id, protocol, since, origin_as, as_path_id, attribute_set_id, source
+                )
+                SELECT
+                    ?, staged.hash, ?, prefixes.id, staged.protocol, staged.since, staged.origin_as, as_paths.id, attribute_sets.id,
+                    staged.source
+                FROM staged_sources AS staged
+                JOIN prefixes ON prefixes.prefix = staged.prefix
+                LEFT JOIN as_paths ON as_paths.as_path = staged.as_path
+                LEFT JOIN attribute_sets ON attribute_sets.attributes = staged.attributes
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM sources
+                    WHERE sources.table_name = ? AND sources.removed_snapshot_id IS NULL AND sources.hash = staged.hash
+                )
+                """,
+                (table, snapshot_id, table),
+            )
+
+            # Do the same for the positions of the sources, those of removed sources are removed along with them
+            conn.execute(
+                """
+                UPDATE source_positions SET removed_snapshot_id = ?
+                WHERE table_name = ? AND removed_snapshot_id IS NULL AND NOT EXISTS (
+                    SELECT 1 FROM sources
+                    JOIN staged_sources AS staged ON staged.hash = sources.hash
+                    WHERE sources.id = source_positions.source_id AND staged.position = source_positions.position
+                        AND staged.bestpath IS source_positions.bestpath
+                )
+                """,
+                (snapshot_id, table),
+            )
+            conn.execute(
+                """
+                INSERT INTO source_positions (table_name, source_id, added_snapshot_id, position, bestpath)
+                SELECT ?, sources.id, ?, staged.position, staged.bestpath
+                FROM staged_sources AS staged
+                JOIN sources ON sources.table_name = ? AND sources.removed_snapshot_id IS NULL AND sources.hash = staged.hash
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM source_positions AS positions
+                    WHERE positions.table_name = ? AND positions.removed_snapshot_id IS NULL AND positions.source_id = sources.id
+                )
+                """,
+                (table, snapshot_id, table, table),
+            )
+
+            sources = conn.execute("SELECT COUNT(*) FROM staged_sources").fetchone()[0]
+            conn.execute("UPDATE snapshots SET prefixes = ?, sources = ? WHERE id = ?", (prefixes, sources, snapshot_id))
+            conn.execute("DELETE FROM staged_sources")
+            conn.execute("DELETE FROM staged_communities")
+
+        return snapshot_id  # type: ignore[return-value]
+
+    def snapshots(self, table: str | None = None) -> list[dict[str, Any]]:
+        """Return the snapshots taken, optionally only those of ``table``."""
+
+        query = "SELECT id, table_name, taken_at, prefixes, sources FROM snapshots"
+        params: tuple[str, ...] = ()
+        if table is not None:
+            query += " WHERE table_name = ?"
+            params = (table,)
+        return [
+            {
+                "id": row[0],
+                "table": row[1],
+                "taken_at": dt.datetime.fromisoformat(row[2]),
+                "prefixes": row[3],
+                "sources": row[4],
+            }
+            for row in self._conn.execute(query + " ORDER BY id", params)
+        ]
+
+    def routes(
+        self,
+        snapshot_id: int,
+        *,
+        prefix: Any = None,  # noqa: ANN401
+        origin_as: int | None = None,
+        community: str | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Return the routes in a snapshot, optionally only those for a prefix, originated by an AS or tagged with a community.
+
+        Communities are given in BIRD's output format without the brackets, like "65000:100" or "rt:65000:100".
+        """
+
+        table = self._snapshot_table(snapshot_id)
+        where = ["sources.table_name = ?", "sources.added_snapshot_id <= ?"]
+        where.append("(sources.removed_snapshot_id IS NULL OR sources.removed_snapshot_id > ?)")
+        params: list[Any] = [table, snapshot_id, snapshot_id]
+        if prefix is not None:
+            where.append("prefixes.prefix = ?")
+            params.append(prefix_to_str(prefix))
+        if origin_as is not None:
+            where.append("sources.origin_as = ?")
+            params.append(origin_as)
+        if community is not None:
+            where.append(
+                """
+                sources.attribute_set_id IN (
+                    SELECT attribute_set_id FROM attribute_set_communities
+                    JOIN communities ON communities.id = attribute_set_communities.community_id
+                    WHERE communities.community = ?
+                )
+                """
+            )
+            params.append(community)
+
+        return self._query_routes(" AND ".join(where), params, snapshot_id)
+
+    def changes(self, snapshot_id: int) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        """
+        Return the sources added and removed in a snapshot compared to the previous snapshot of the same table.
+
+        Sources which changed are returned as removed and added, sources which only moved or became the best path are not returned.
+        Removed sources are returned with their position in the previous snapshot.
+        """
+
+        return {
+            "added": self._query_routes("sources.added_snapshot_id = ?", [snapshot_id], snapshot_id),
+            "removed": self._query_routes("sources.removed_snapshot_id = ?", [snapshot_id], snapshot_id, previous=True),
+        }
+
+    def _stage(self, routes: Iterable[tuple[Any, list[dict[str, Any]]]]) -> int:
+        """Stage the sources of the routes in batches, returning the number of prefixes."""
+
+        insert_sources = "INSERT OR IGNORE INTO staged_sources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        insert_communities = "INSERT OR IGNORE INTO staged_communities VALUES (?, ?, ?)"
+
+        prefixes = 0
+        source_rows: list[tuple[Any, ...]] = []
+        community_rows: list[tuple[str, str, str]] = []
+        for prefix, sources in routes:
+            prefixes += 1
+            prefix_str = prefix_to_str(prefix)
+            for position, source in enumerate(sources):
+                source_rows.append(self._source_row(prefix_str, position, source, community_rows))
+            if len(source_rows) >= self._batch_size:
+                self._conn.executemany(insert_sources, source_rows)
+                self._conn.executemany(insert_communities, community_rows)
+                source_rows.clear()
+                community_rows.clear()
+
+        self._conn.executemany(insert_sources, source_rows)
+        self._conn.executemany(insert_communities, community_rows)
+
+        return prefixes
+
+    def _source_row(
+        self, prefix: str, position: int, source: dict[str, Any], community_rows: list[tuple[str, str, str]]
+    ) -> tuple[Any, ...]:
+        """
+        Return the staging row of a source, adding the communities of its attributes to ``community_rows``.
+
+        Sources are identified by a hash of their prefix and contents, so any change results in a new source. Their position and
+        whether they are the best path are left out, these are staged alongside them.
+        """
+
+        base = {name: value for name, value in source.items() if name not in ("attributes", "bestpath")}
+        base_json = _to_json(base)
+
+        attributes_json = None
+        as_path_json = None
+        origin_as = None
+        attributes = source.get("attributes")
+        if attributes is not None:
+            attributes_json = _to_json(attributes)
+            as_path = source_as_path(source)
+            if as_path is not None:
+                as_path_json = _to_json(as_path)
+                if as_path:
+                    origin_as = as_path[-1]
+            community_rows.extend(
+                (attributes_json, kind, ":".join(map(str, community))) for kind, community in source_communities(source)
+            )
+
+        since = source.get("since")
+        row_hash = hashlib.blake2b(f"{prefix}\0{base_json}\0{attributes_json}".encode(), digest_size=16).digest()
+        bestpath = source.get("bestpath")
+
+        return (
+            row_hash,
+            prefix,
+            position,
+            None if bestpath is None else bool(bestpath),
+            source.get("protocol"),
+            None if since is None else str(since),
+            origin_as,
+            as_path_json,
+            attributes_json,
+            base_json,
+        )
+
+    def _query_routes(
+        self, where: str, params: list[Any], snapshot_id: int, *, previous: bool = False
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Return the routes matching a query on the sources, prefixes and attribute sets.
+
+        The sources are positioned as they were in a snapshot, or in the snapshot before it if ``previous`` is set.
+        """
+
+        if previous:
+            position_where = (
+                "positions.added_snapshot_id < ? AND (positions.removed_snapshot_id IS NULL OR positions.removed_snapshot_id >= ?)"
+            )
+        else:
+            position_where = (
+                "positions.added_snapshot_id <= ? AND (positions.removed_snapshot_id IS NULL OR positions.removed_snapshot_id > ?)"
+            )
+
+        res: dict[str, list[dict[str, Any]]] = {}
+        rows = self._conn.execute(
+            f"""
+            SELECT prefixes.prefix, sources.source, positions.bestpath, attribute_sets.attributes
+            FROM sources
+            JOIN prefixes ON prefixes.id = sources.prefix_id
+            JOIN source_positions AS positions ON positions.source_id = sources.id AND {position_where}
+            LEFT JOIN attribute_sets ON attribute_sets.id = sources.attribute_set_id
+            WHERE {where}
+            ORDER BY sources.prefix_id, positions.position
+            """,  # noqa: S608
+            [snapshot_id, snapshot_id, *params],
+        )
+        for prefix, source_json, bestpath, attributes_json in _iter_rows(rows):
+            source = json.loads(source_json)
+            if bestpath is not None:
+                source["bestpath"] = bool(bestpath)
+            if attributes_json is not None:
+                source["attributes"] = json.loads(attributes_json)
+            res.setdefault(prefix, []).append(source)
+        return res
+
+    def _snapshot_table(self, snapshot_id: int) -> str:
+        """Return the table a snapshot was taken of."""
+
+        row = self._conn.execute("SELECT table_name FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+        if row is None:
+            raise BirdClientNotFoundError(f"Snapshot {snapshot_id} not found")
+        return row[0]  # type: ignore[no-any-return]
+
+
+def _to_json(value: Any) -> str:  # noqa: ANN401
+    """Return a value as JSON, values JSON doesn't support are output as strings."""
+    return _JSON_ENCODER.encode(value)
+
+
+def _iter_rows(cursor: sqlite3.Cursor, size: int = 1000) -> Iterator[Any]:
+    """Yield the rows of a query, fetching them in batches."""
+
+    while rows := cursor.fetchmany(size):
+        yield from rows
@@ -0,0 +1,163 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Inverted indexes of routes."""
+
+import array
+from collections.abc import Iterable
+from typing import Any
+
+from .exceptions import BirdClientError
+from .sinks import source_as_path, source_communities
+
+__all__ = ["INDEX_DIMENSIONS", "RouteIndex"]
+
+
+# Dimensions routes can be indexed by
+INDEX_DIMENSIONS = (
+    "community",
+    "large_community",
+    "ext_community",
+    "origin_as",
+    "as_path",
+    "gateway",
+    "interface",
+    "protocol",
+)
+
+
+class RouteIndex:
+    """
+    Inverted indexes mapping communities, ASNs, next hops and protocols to the prefixes that have them.
+
+    The index is a route sink, so it can be built while the routes are parsed by passing it in the ``sinks`` of ``show_route()``
+    or any of the route iterators, or afterwards by calling ``add()``. Each prefix is given an integer ID, and each key of each
+    dimension maps to a compact array of the IDs of the prefixes with at least one source having that key.
+
+    Lookups return sets of prefix IDs, which can be combined using set operations before turning them back into prefixes using
+    ``prefixes()``. Communities are looked up as they are parsed, like ``(65000, 666)`` or ``("rt", 65000, 1)``, and gateways
+    in the address format the routes were parsed with.
+    """
+
+    # Prefixes by ID, and IDs by prefix
+    _prefixes: list[Any]
+    _ids: dict[Any, int]
+    # Prefix IDs by key, for each dimension we're indexing
+    _indexes: dict[str, dict[Any, "array.array[int]"]]
+
+    def __init__(self, dimensions: Iterable[str] | None = None) -> None:
+        """Initialize the object, indexing only ``dimensions`` if given, which are any of INDEX_DIMENSIONS."""
+
+        dimensions = INDEX_DIMENSIONS if dimensions is None else tuple(dimensions)
+        for dimension in dimensions:
+            if dimension not in INDEX_DIMENSIONS:
+                raise BirdClientError(f"Unknown index dimension '{dimension}', must be one of: {', '.join(INDEX_DIMENSIONS)}")
+
+        self._prefixes = []
+        self._ids = {}
+        self._indexes = {dimension: {} for dimension in dimensions}
+
+    def __len__(self) -> int:
+        """Return the number of prefixes indexed."""
+        return len(self._prefixes)
+
+    @property
+    def dimensions(self) -> list[str]:
+        """Return the dimensions being indexed."""
+        return list(self._indexes)
+
+    def add(self, prefix: Any, sources: list[dict[str, Any]]) -> None:  # noqa: ANN401,C901
+        """Add a prefix and its sources to the indexes."""
+
+        prefix_id = self._ids.get(prefix)
+        if prefix_id is None:
+            prefix_id = self._ids[prefix] = len(self._prefixes)
+            self._prefixes.append(prefix)
+
+        # Work out the keys of all the sources first, so a prefix is only added once for each key
+        keys: set[tuple[str, Any]] = set()
+        indexes = self._indexes
+        for source in sources:
+            if "protocol" in indexes:
+                keys.add(("protocol", source.get("protocol")))
+            for nexthop in source.get("nexthops", ()):
+                if "gateway" in indexes and "gateway" in nexthop:
+                    keys.add(("gateway", nexthop["gateway"]))
+                if "interface" in indexes and "interface" in nexthop:
+                    keys.add(("interface", nexthop["interface"]))
+            as_path = source_as_path(source)
+            if as_path:
+                if "origin_as" in indexes:
+                    keys.add(("origin_as", as_path[-1]))
+                if "as_path" in indexes:
+                    keys.update(("as_path", asn) for asn in as_path)
+            keys.update(community for community in source_communities(source) if community[0] in indexes)
+
+        for dimension, key in keys:
+            index = indexes[dimension]
+            prefix_ids = index.get(key)
+            if prefix_ids is None:
+                prefix_ids = index[key] = array.array("I")
+            prefix_ids.append(prefix_id)
+
+    def lookup(self, dimension: str, key: Any) -> set[int]:  # noqa: ANN401
+        """Return the IDs of the prefixes with ``key`` in ``dimension``."""
+        return set(self._index(dimension).get(key, ()))
+
+    def keys(self, dimension: str) -> list[Any]:
+        """Return the keys in ``dimension``."""
+        return list(self._index(dimension))
+
+    def counts(self, dimension: str) -> dict[Any, int]:
+        """Return the number of prefixes having each key in ``dimension``."""
+        return {key: len(set(prefix_ids)) for key, prefix_ids in self._index(dimension).items()}
+
+    def prefixes(self, prefix_ids: Iterable[int]) -> list[Any]:
+        """Return the prefixes with the given IDs, in the order they were added."""
+
+        prefixes = self._prefixes
+        return [prefixes[prefix_id] for prefix_id in sorted(prefix_ids)]
+
+    def find(self, **criteria: Any) -> list[Any]:  # noqa: ANN401
+        """
+        Return the prefixes matching all the criteria, which are keyword arguments of a dimension and a key.
+
+        For example ``find(community=(65000, 666), origin_as=64500)``.
+        """
+
+        prefix_ids: set[int] | None = None
+        for dimension, key in criteria.items():
+            found = self.lookup(dimension, key)
+            prefix_ids = found if prefix_ids is None else prefix_ids & found
+            if not prefix_ids:
+                return []
+        return self.prefixes(prefix_ids if prefix_ids is not None else range(len(self._prefixes)))
+
+    def _index(self, dimension: str) -> dict[Any, "array.array[int]"]:
+        """Return the index of a dimension."""
+
+        index = self._indexes.get(dimension)
+        if index is None:
+            raise BirdClientError(f"Dimension '{dimension}' is not indexed")
+        return index
@@ -0,0 +1,199 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Reading BIRD output saved to files."""
+
+import gzip
+import io
+import itertools
+import mmap
+import os
+import pathlib
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, BinaryIO, TextIO
+
+from .exceptions import BirdClientError
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+__all__ = ["ReplyData", "iter_chunk_lines", "iter_lines"]
+
+
+# BIRD output accepted in place of querying BIRD, a list or iterable of lines, the output itself, a file path or a file object
+ReplyData = str | os.PathLike[str] | BinaryIO | TextIO | Iterable[str] | Iterable[bytes]
+
+# Size of the blocks of lines decoded at a time
+CHUNK_SIZE = 1 << 20
+
+# Magic numbers at the start of compressed files
+_GZIP_MAGIC = b"\x1f\x8b"
+_BZIP2_MAGIC = b"BZh"
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def iter_lines(data: ReplyData) -> Iterable[str]:
+    """
+    Return the lines of BIRD output without line endings.
+
+    Lists of lines are returned as is. Strings spanning more than one line are taken to be the output itself and are split into
+    lines, other strings and path like objects are treated as a file path. Files are memory mapped where possible so they are
+    decoded in large blocks straight from the page cache without being read into memory first. Files compressed using gzip,
+    bzip2 or xz, or zstd if the zstandard package is installed, are decompressed as they are read.
+    """
+
+    if isinstance(data, list) and (not data or isinstance(data[0], str)):
+        return data
+    if isinstance(data, str) and "\n" in data:
+        return data.splitlines()
+    if isinstance(data, str | os.PathLike):
+        return itertools.chain.from_iterable(_iter_path_blocks(data))
+    if isinstance(data, io.TextIOBase):
+        return (line.rstrip("\r\n") for line in data)
+    if hasattr(data, "read"):
+        return itertools.chain.from_iterable(_iter_file_blocks(data))  # type: ignore[arg-type]
+    return _iter_iterable_lines(data)  # type: ignore[arg-type]
+
+
+def iter_chunk_lines(read: Callable[[int], bytes]) -> Iterator[str]:
+    """Return the lines of a binary stream, calling ``read`` for each chunk until it returns nothing."""
+    return itertools.chain.from_iterable(_iter_chunk_blocks(read))
+
+
+# The functions below yield blocks of lines rather than single lines, which are then chained together. This keeps the per line
+# work in C, as resuming a generator for every line costs more than decoding it.
+
+
+def _iter_path_blocks(path: str | os.PathLike[str]) -> Iterator[list[str]]:
+    """Yield blocks of lines of a file."""
+
+    with pathlib.Path(path).open("rb") as file:
+        yield from _iter_file_blocks(file)
+
+
+def _iter_file_blocks(file: BinaryIO) -> Iterator[list[str]]:
+    """Yield blocks of lines of a binary file object from its current position, memory mapping it if we can."""
+
+    decompressed = _open_decompressed(file)
+    if decompressed:
+        with decompressed:
+            yield from _iter_chunk_blocks(decompressed.read)
+        return
+
+    try:
+        start = file.tell()
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, AttributeError, io.UnsupportedOperation):
+        # Pipes, sockets, empty files and file like objects can't be mapped, so we read them in chunks instead
+        yield from _iter_chunk_blocks(file.read)
+        return
+
+    with mapped:
+        yield from _iter_mapped_blocks(mapped, start)
+    file.seek(0, os.SEEK_END)
+
+
+def _open_decompressed(file: BinaryIO) -> Any:  # noqa: ANN401
+    """Return a file object decompressing a compressed file as it is read, or None if the file is not compressed."""
+
+    magic = _peek(file, 6)
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=file, mode="rb")
+    # bz2 and lzma are only imported when needed, as they load their libraries along with them
+    if magic.startswith(_BZIP2_MAGIC):
+        import bz2  # noqa: PLC0415
+
+        return bz2.BZ2File(file, mode="rb")
+    if magic.startswith(_XZ_MAGIC):
+        import lzma  # noqa: PLC0415
+
+        return lzma.LZMAFile(file, mode="rb")
+    if magic.startswith(_ZSTD_MAGIC):
+        if zstandard is None:  # pragma: no cover
+            raise BirdClientError("Reading zstd compressed BIRD output requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().stream_reader(file, read_across_frames=True, closefd=False)  # pragma: no cover
+    return None
+
+
+def _peek(file: BinaryIO, size: int) -> bytes:
+    """Return the next bytes in a file without consuming them, or nothing if we can't."""
+
+    if hasattr(file, "peek"):
+        return file.peek(size)[:size]  # type: ignore[no-any-return]
+    try:
+        pos = file.tell()
+        res = file.read(size)
+        file.seek(pos)
+    except (OSError, AttributeError, io.UnsupportedOperation):
+        return b""
+    return res
+
+
+def _iter_mapped_blocks(mapped: mmap.mmap, start: int) -> Iterator[list[str]]:
+    """Yield blocks of lines of a memory mapped file, decoding them without copying them first."""
+
+    size = len(mapped)
+    view = memoryview(mapped)
+    try:
+        pos = start
+        while pos < size:
+            end = size
+            if pos + CHUNK_SIZE < size:
+                # End the block after the last line ending in it, or the first one after it for very long lines
+                end = mapped.rfind(b"\n", pos, pos + CHUNK_SIZE) + 1 or mapped.find(b"\n", pos + CHUNK_SIZE) + 1 or size
+            yield str(view[pos:end], "UTF-8").splitlines()
+            pos = end
+    finally:
+        # The memory map can only be closed once nothing is referencing it
+        view.release()
+
+
+def _iter_chunk_blocks(read: Callable[[int], bytes]) -> Iterator[list[str]]:
+    """Yield blocks of lines of a binary stream."""
+
+    pending = b""
+    while chunk := read(CHUNK_SIZE):
+        end = chunk.rfind(b"\n") + 1
+        if not end:
+            pending += chunk
+            continue
+        block = pending + chunk[:end] if pending else chunk[:end]
+        yield block.decode("UTF-8").splitlines()
+        pending = chunk[end:]
+
+    if pending:
+        yield pending.decode("UTF-8").splitlines()
+
+
+def _iter_iterable_lines(data: Iterable[str] | Iterable[bytes]) -> Iterator[str]:
+    """Yield the lines of an iterable of lines, decoding them and stripping line endings as needed."""
+
+    for line in data:
+        if isinstance(line, bytes):
+            yield line.decode("UTF-8").rstrip("\r\n")
+        else:
+            yield line.rstrip("\r\n")
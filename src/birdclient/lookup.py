@@ -0,0 +1,133 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Longest prefix match cache for route lookups."""
+
+import ipaddress
+import time
+from typing import Any
+
+__all__ = ["RouteLookupCache"]
+
+
+class RouteLookupCache:
+    """
+    Longest prefix match cache of 'show route for' results.
+
+    Each prefix resolved is checked to see if it contains any more specific networks, if it doesn't any other address within the
+    prefix will resolve to it too and can be answered from the cache. Results for prefixes with more specifics are only reused for
+    the exact same address.
+
+    The whole cache is invalidated once ``ttl`` seconds have passed since it was filled, or when the table signature changes. The
+    table signature is the route and network count of the table, which catches routes being added or withdrawn but not changes
+    to existing routes, these are only picked up once the cache expires. Counting the routes makes BIRD walk the whole table, so
+    callers can pass their own generation as the signature instead, or disable ``check_table`` and rely on ``ttl`` alone.
+    """
+
+    # Time to live in seconds
+    _ttl: float
+    # If we should check the table signature on each lookup
+    check_table: bool
+    # When the cache expires
+    _expires: float
+    # Signature of the table the cache was filled from
+    _signature: Any
+    # Cached prefixes without any more specifics, by IP version, then prefix length, then network
+    _leaves: dict[int, dict[int, dict[int, dict[str, list[dict[str, Any]]]]]]
+    # Prefix lengths we have leaves for by IP version, longest first
+    _lengths: dict[int, list[int]]
+    # Cached results for exact addresses
+    _addresses: dict[str, dict[str, list[dict[str, Any]]]]
+    # Prefixes we've checked for more specifics already
+    _checked: set[str]
+
+    def __init__(self, ttl: float = 60.0, check_table: bool = True) -> None:  # noqa: FBT001,FBT002
+        """Initialize the object."""
+
+        self._ttl = ttl
+        self.check_table = check_table
+        self._signature = None
+        self.invalidate()
+
+    def __len__(self) -> int:
+        """Return the number of cached prefixes and addresses."""
+        return sum(len(x) for lengths in self._leaves.values() for x in lengths.values()) + len(self._addresses)
+
+    def invalidate(self) -> None:
+        """Invalidate the cache."""
+
+        self._expires = time.monotonic() + self._ttl
+        self._leaves = {4: {}, 6: {}}
+        self._lengths = {4: [], 6: []}
+        self._addresses = {}
+        self._checked = set()
+
+    def validate(self, signature: Any = None) -> None:  # noqa: ANN401
+        """Invalidate the cache if it has expired or if the table signature changed."""
+
+        if time.monotonic() >= self._expires or signature != self._signature:
+            self.invalidate()
+        self._signature = signature
+
+    def lookup(self, address: str) -> dict[str, list[dict[str, Any]]] | None:
+        """Return the cached routes matching an address, or None if the address is not cached."""
+
+        res = self._addresses.get(address)
+        if res is not None:
+            return res
+
+        ip = ipaddress.ip_address(address)
+        ip_int = int(ip)
+        max_prefixlen = ip.max_prefixlen
+        leaves = self._leaves[ip.version]
+        # Longest prefix match against the leaf prefixes we have
+        for prefixlen in self._lengths[ip.version]:
+            res = leaves[prefixlen].get(ip_int >> (max_prefixlen - prefixlen))
+            if res is not None:
+                return res
+
+        return None
+
+    def is_checked(self, prefix: str) -> bool:
+        """Return True if a prefix has already been added to the cache."""
+        return prefix in self._checked
+
+    def add_address(self, address: str, routes: dict[str, list[dict[str, Any]]]) -> None:
+        """Add the routes for an exact address."""
+        self._addresses[address] = routes
+
+    def add_prefix(self, prefix: str, routes: dict[str, list[dict[str, Any]]], leaf: bool) -> None:  # noqa: FBT001
+        """Add the routes for a prefix, only prefixes without any more specifics are used for longest prefix matching."""
+
+        self._checked.add(prefix)
+        if not leaf:
+            return
+
+        network = ipaddress.ip_network(prefix)
+        prefixlen = network.prefixlen
+        leaves = self._leaves[network.version]
+        if prefixlen not in leaves:
+            leaves[prefixlen] = {}
+            self._lengths[network.version] = sorted(leaves, reverse=True)
+        leaves[prefixlen][int(network.network_address) >> (network.max_prefixlen - prefixlen)] = routes
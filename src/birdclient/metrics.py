@@ -0,0 +1,615 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Prometheus metrics exporter for BIRD."""
+
+import dataclasses
+import datetime as dt
+import http.server
+import itertools
+import math
+import operator
+import threading
+import time
+from collections.abc import Iterable, KeysView
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import BirdClientError
+from .timestamps import since_epoch
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import BirdClient
+
+__all__ = ["BirdMetrics"]
+
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metric help and type lines, keyed by metric name
+_METRICS = {
+    "bird_up": ("gauge", "Whether BIRD could be queried."),
+    "bird_info": ("gauge", "BIRD version and router ID."),
+    "bird_uptime_seconds": ("gauge", "Seconds since BIRD was started."),
+    "bird_reconfiguration_age_seconds": ("gauge", "Seconds since BIRD was last reconfigured."),
+    "bird_scrape_duration_seconds": ("gauge", "Seconds taken to query BIRD."),
+    "bird_scrape_errors": ("gauge", "BIRD queries that failed during the last scrape."),
+    "bird_protocol_up": ("gauge", "Whether the protocol is up."),
+    "bird_protocol_state_age_seconds": ("gauge", "Seconds since the protocol state last changed."),
+    "bird_channel_up": ("gauge", "Whether the protocol channel is up."),
+    "bird_channel_routes_imported": ("gauge", "Routes imported by the protocol channel."),
+    "bird_channel_routes_exported": ("gauge", "Routes exported by the protocol channel."),
+    "bird_channel_routes_preferred": ("gauge", "Preferred routes of the protocol channel."),
+    "bird_table_routes": ("gauge", "Routes in the table."),
+    "bird_table_routes_selected": ("gauge", "Selected routes in the table."),
+    "bird_table_networks": ("gauge", "Networks in the table."),
+}
+
+# Protocol and channel metrics pre-rendered for each protocol, in the order they are rendered
+_PROTOCOL_METRICS = (
+    "bird_protocol_up",
+    "bird_channel_up",
+    "bird_channel_routes_imported",
+    "bird_channel_routes_exported",
+    "bird_channel_routes_preferred",
+)
+
+# Number of protocols or tables whose pre-rendered lines are joined together at a time
+_BLOCK_SIZE = 128
+
+# Table metrics and the route counts they come from
+_TABLE_METRICS = {
+    "bird_table_routes": "routes_total",
+    "bird_table_routes_selected": "routes",
+    "bird_table_networks": "networks",
+}
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    """Return a Prometheus label string."""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+@dataclasses.dataclass(slots=True)
+class _ProtocolLines:
+    """Pre-rendered metric lines of a protocol, kept until the protocol changes or its details are refreshed."""
+
+    # Summary state and since the lines were rendered for
+    key: tuple[Any, Any]
+    # Protocol state age line up to the value, which depends on the time of the scrape
+    age_prefix: str
+    # Protocol state change time in seconds since the epoch
+    since: int | None
+    # Tables of the protocol channels
+    tables: list[str]
+
+
+class _LineBlocks:
+    """
+    Pre-rendered lines of a number of metrics for a number of keys.
+
+    The lines of each metric are joined a block of keys at a time, so a change to one key only joins its own block again.
+    """
+
+    # Number of metrics
+    _metrics: int
+    # Lines of each metric keyed by key, for each block, "" for metrics the key has no lines for
+    _blocks: list[dict[str, tuple[str, ...]]]
+    # Block each key is in
+    _key_blocks: dict[str, int]
+    # Joined lines of each metric for each block, None for blocks that changed
+    _joined: list[tuple[str, ...] | None]
+
+    def __init__(self, metrics: int) -> None:
+        """Initialize the object."""
+
+        self._metrics = metrics
+        self._blocks = []
+        self._key_blocks = {}
+        self._joined = []
+
+    def keys(self) -> KeysView[str]:
+        """Return the keys we have lines for."""
+        return self._key_blocks.keys()
+
+    def set(self, key: str, lines: tuple[str, ...]) -> None:
+        """Set the lines of each metric for a key."""
+
+        num = self._key_blocks.get(key)
+        if num is None:
+            if not self._blocks or len(self._blocks[-1]) >= _BLOCK_SIZE:
+                self._blocks.append({})
+                self._joined.append(None)
+            num = self._key_blocks[key] = len(self._blocks) - 1
+        elif self._blocks[num][key] == lines:
+            return
+        self._blocks[num][key] = lines
+        self._joined[num] = None
+
+    def discard(self, key: str) -> None:
+        """Remove the lines of a key if we have them."""
+
+        num = self._key_blocks.pop(key, None)
+        if num is not None:
+            del self._blocks[num][key]
+            self._joined[num] = None
+
+    def joined(self) -> list[str]:
+        """Return the lines of each metric for all keys joined together."""
+
+        for num, joined in enumerate(self._joined):
+            if joined is None:
+                lines = list(self._blocks[num].values())
+                self._joined[num] = tuple("\n".join(filter(None, map(operator.itemgetter(x), lines))) for x in range(self._metrics))
+        joined: list[tuple[str, ...]] = self._joined  # type: ignore[assignment]
+        return ["\n".join(filter(None, map(operator.itemgetter(x), joined))) for x in range(self._metrics)]
+
+
+class BirdMetrics:
+    """
+    Prometheus metrics exporter for BIRD.
+
+    Metrics are rendered in the Prometheus text exposition format from the BIRD status, protocols and table route counts. Each
+    refresh queries the cheap 'show protocols' summary, summary lines that are the same as last time are recognised without
+    parsing them. Only the protocols whose state or since changed are queried with 'show protocols all <name>', the lines of the
+    other protocols are kept as they were rendered. As the channel route counts only come with the details, the details of the
+    protocols that went longest without a refresh are also queried, so that each protocol is refreshed at least every
+    ``details_max_age`` seconds. The route counts of the protocol channel tables are refreshed along with the protocols, while
+    the route counts of the ``tables`` given are queried on every refresh.
+
+    The queries are run concurrently and the rendered snapshot is cached for ``max_age`` seconds, with concurrent scrapes sharing
+    the same refresh. A query that fails is counted in ``bird_scrape_errors`` and the metrics it would have returned are left out.
+    """
+
+    # Client we're querying with
+    _client: "BirdClient"
+    # Tables to retrieve route counts for, None to use the tables of all protocol channels
+    _tables: list[str] | None
+    # Maximum age of the cached snapshot
+    _max_age: float
+    # Maximum age of the protocol details
+    _details_max_age: float | None
+    # Timezone of BIRD timestamps
+    _tz: dt.tzinfo | None
+    # Last rendered snapshot and when it was taken
+    _snapshot: str
+    _snapshot_time: float
+    # Lock serializing refreshes
+    _lock: threading.Lock
+    # Protocol names keyed by their summary line from the last refresh
+    _summary_lines: dict[str, str]
+    # Pre-rendered protocol lines, ordered from the least recently refreshed protocol
+    _protocol_lines: dict[str, _ProtocolLines]
+    # Pre-rendered lines of the protocol metrics keyed by protocol, and of the table metrics keyed by protocol channel table
+    _protocol_blocks: _LineBlocks
+    _table_blocks: _LineBlocks
+    # When the protocol details were last refreshed
+    _details_time: float
+    # Pre-built label strings
+    _label_cache: dict[tuple[str, ...], str]
+
+    def __init__(
+        self,
+        client: "BirdClient",
+        *,
+        tables: list[str] | None = None,
+        max_age: float = 10.0,
+        details_max_age: float | None = 3600.0,
+        timezone: dt.tzinfo | None = None,
+    ) -> None:
+        """
+        Initialize the object.
+
+        The default ``max_age`` matches the usual 10 second scrape interval, so scrapes from more than one Prometheus server
+        share a refresh. Set ``details_max_age`` to None to only query the details of protocols that changed.
+        """
+
+        self._client = client
+        self._tables = tables
+        self._max_age = max_age
+        self._details_max_age = details_max_age
+        self._tz = timezone
+        self._snapshot = ""
+        self._snapshot_time = 0.0
+        self._lock = threading.Lock()
+        self._summary_lines = {}
+        self._protocol_lines = {}
+        self._protocol_blocks = _LineBlocks(len(_PROTOCOL_METRICS))
+        self._table_blocks = _LineBlocks(len(_TABLE_METRICS))
+        self._details_time = 0.0
+        self._label_cache = {}
+
+    def collect(self) -> str:
+        """Return the metrics, refreshing them from BIRD if the cached snapshot is too old."""
+
+        with self._lock:
+            if not self._snapshot or time.monotonic() - self._snapshot_time >= self._max_age:
+                self._snapshot = self.refresh()
+                self._snapshot_time = time.monotonic()
+            return self._snapshot
+
+    def refresh(self) -> str:
+        """Query BIRD and return freshly rendered metrics."""
+
+        started = time.monotonic()
+        errors = 0
+        status = None
+        protocols = False
+        counts: dict[str, dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            status_future = executor.submit(self._client.show_status)
+            if self._tables:
+                counts_future = executor.submit(self._table_counts, self._tables)
+            # Protocol errors are counted where they happen, as the route counts of the protocol tables can fail on their own
+            try:
+                errors += self._refresh_protocols()
+                protocols = True
+            except BirdClientError:
+                errors += 1
+            try:
+                status = status_future.result()
+            except BirdClientError:
+                errors += 1
+            if self._tables:
+                counts, count_errors = counts_future.result()
+                errors += count_errors
+
+        # If nothing could be queried, BIRD is down
+        if status is None and not protocols and not counts:
+            return self._render_lines(self._metric_lines("bird_up", [("", 0)]))
+
+        return self._render(status, counts, protocols=protocols, errors=errors, duration=time.monotonic() - started)
+
+    def render(
+        self,
+        status: dict[str, Any],
+        protocols: dict[str, dict[str, Any]],
+        counts: dict[str, dict[str, Any]],
+        *,
+        duration: float | None = None,
+        now: float | None = None,
+    ) -> str:
+        """Render metrics from the parsed status, protocols and 'show route table <name> count' output for each table."""
+
+        self._summary_lines = {}
+        self._protocol_lines = {}
+        self._protocol_blocks = _LineBlocks(len(_PROTOCOL_METRICS))
+        self._table_blocks = _LineBlocks(len(_TABLE_METRICS))
+        self._label_cache.clear()
+        for name, protocol in protocols.items():
+            self._update_protocol(name, (protocol["state"], protocol.get("since")), protocol)
+
+        return self._render(status, counts, duration=duration, now=now)
+
+    def _render(  # noqa: PLR0913
+        self,
+        status: dict[str, Any] | None,
+        counts: dict[str, dict[str, Any]],
+        *,
+        protocols: bool = True,
+        errors: int = 0,
+        duration: float | None = None,
+        now: float | None = None,
+    ) -> str:
+        """Render metrics from the status, the pre-rendered protocol and table lines, and the route counts of other tables."""
+
+        if now is None:
+            now = time.time()
+
+        lines = self._metric_lines("bird_up", [("", 1)])
+        lines += self._metric_lines("bird_scrape_errors", [("", errors)])
+        if status is not None:
+            lines += self._status_lines(status)
+        if duration is not None:
+            lines += self._metric_lines("bird_scrape_duration_seconds", [("", round(duration, 6))])
+
+        # Protocol metrics, only the state age needs rendering on each scrape
+        if protocols:
+            joined = self._protocol_blocks.joined()
+            lines += self._joined_lines("bird_protocol_up", joined[0], [])
+            now_int = int(now)
+            ages = [f"{x.age_prefix}{now_int - x.since}" for x in self._protocol_lines.values() if x.since is not None]
+            lines += self._joined_lines("bird_protocol_state_age_seconds", "", ages)
+            for name, text in zip(_PROTOCOL_METRICS[1:], joined[1:], strict=True):
+                lines += self._joined_lines(name, text, [])
+
+        # Table metrics, the counts for each table contain the table itself
+        table_counts = [
+            (self._label("table", table), table_counts)
+            for count in counts.values()
+            for table, table_counts in count["tables"].items()
+        ]
+        for (name, key), text in zip(_TABLE_METRICS.items(), self._table_blocks.joined(), strict=True):
+            lines += self._joined_lines(name, text, [f"{name}{labels} {x[key]}" for labels, x in table_counts])
+
+        return self._render_lines(lines)
+
+    @staticmethod
+    def _joined_lines(name: str, joined: str, samples: list[str]) -> list[str]:
+        """Return the lines of a metric, with its pre-rendered samples joined together followed by the samples given."""
+
+        if joined:
+            samples.insert(0, joined)
+        if not samples:
+            return []
+        metric_type, metric_help = _METRICS[name]
+        return [f"# HELP {name} {metric_help}", f"# TYPE {name} {metric_type}", *samples]
+
+    def _refresh_protocols(self) -> int:
+        """
+        Update the pre-rendered protocol lines, querying the details of the protocols that changed or are due a refresh.
+
+        Returns the number of failed route count queries of the protocol channel tables.
+        """
+
+        summary_lines, summaries, removed = self._query_summaries()
+        if removed:
+            self._remove_protocols(removed)
+
+        # Protocols that are new or changed state since the last refresh, topped up with those due a refresh
+        keys = {name: (summary["state"], summary.get("since")) for name, summary in summaries.items()}
+        changed = [name for name, key in keys.items() if name not in self._protocol_lines or self._protocol_lines[name].key != key]
+        changed += self._due_protocols(changed)
+
+        if not changed:
+            self._summary_lines = summary_lines
+            return 0
+
+        if not self._protocol_lines:
+            # Every protocol is new, a single query for all of them saves BIRD a query per protocol
+            details = self._client.show_protocols()
+        else:
+            details = {}
+            replies = self._client.query_many([["show", "protocols", "all", name] for name in changed])
+            for reply in replies:
+                details.update(self._client.show_protocols(data=reply))
+
+        for name in changed:
+            # Use the summary of protocols that went away since we got it
+            protocol = details.get(name) or summaries.get(name)
+            if protocol is not None:
+                self._update_protocol(name, keys[name] if name in keys else self._protocol_lines[name].key, protocol)
+        # Only remember the summary lines once the protocols they belong to are rendered, so a failed query is retried
+        self._summary_lines = summary_lines
+
+        # Refresh the route counts of the tables of the protocols we refreshed
+        if self._tables is not None:
+            return 0
+        return self._refresh_tables(
+            sorted({table for name in changed if name in self._protocol_lines for table in self._protocol_lines[name].tables})
+        )
+
+    def _query_summaries(self) -> tuple[dict[str, str], dict[str, dict[str, Any]], set[str]]:
+        """
+        Query the protocol summaries.
+
+        Summary lines which are the same as last time belong to protocols that haven't changed, so these are only looked up. We
+        return the protocol names keyed by summary line, the parsed summaries of the protocols that are new or changed, and the
+        protocols that went away.
+        """
+
+        reply = list(self._client.query_iter(["show", "protocols"]))
+        summary_lines = self._summary_lines
+        changed_lines = [line for line in reply if line not in summary_lines]
+        summaries = self._client.show_protocols(data=changed_lines, details=False) if changed_lines else {}
+
+        # Without summary lines from last time, any protocols we have came from render()
+        removed = set() if summary_lines else self._protocol_lines.keys() - summaries.keys()
+        # Drop the lines of protocols that changed or went away
+        if len(reply) - len(changed_lines) < len(summary_lines):
+            summary_lines = dict(summary_lines)
+            for line in summary_lines.keys() - set(reply):
+                name = summary_lines.pop(line)
+                if name not in summaries:
+                    removed.add(name)
+
+        if summaries:
+            summary_lines = dict(summary_lines) if summary_lines is self._summary_lines else summary_lines
+            for line in changed_lines:
+                # Protocol summary lines start with the name, after the reply code of the first or a single space for the others
+                name = (line[5:] if line.startswith("1002-") else line[1:] if line[:1] == " " else "").split(" ", 1)[0]
+                if name in summaries:
+                    summary_lines[line] = name
+
+        return summary_lines, summaries, removed
+
+    def _remove_protocols(self, names: Iterable[str]) -> None:
+        """Remove the lines of protocols that went away, along with the lines of tables no protocol uses anymore."""
+
+        for name in names:
+            self._protocol_lines.pop(name, None)
+            self._protocol_blocks.discard(name)
+        self._label_cache.clear()
+        tables = {table for x in self._protocol_lines.values() for table in x.tables}
+        for table in self._table_blocks.keys() - tables:
+            self._table_blocks.discard(table)
+
+    def _due_protocols(self, changed: list[str]) -> list[str]:
+        """Return the protocols due a refresh of their details, besides those that changed."""
+
+        now = time.monotonic()
+        last, self._details_time = self._details_time, now
+        if self._details_max_age is None or not last:
+            return []
+
+        # Each refresh takes its share of the protocols, those that went longest without a refresh are first in the dict
+        due = math.ceil(len(self._protocol_lines) * (now - last) / self._details_max_age) - len(changed)
+        if due <= 0:
+            return []
+        changed_set = set(changed)
+        return list(itertools.islice((x for x in self._protocol_lines if x not in changed_set), due))
+
+    def _refresh_tables(self, tables: list[str]) -> int:
+        """Update the pre-rendered lines of protocol channel tables, returning the number of failed queries."""
+
+        counts, errors = self._table_counts(tables)
+        for count in counts.values():
+            for table, table_counts in count["tables"].items():
+                labels = self._label("table", table)
+                self._table_blocks.set(table, tuple(f"{name}{labels} {table_counts[key]}" for name, key in _TABLE_METRICS.items()))
+        return errors
+
+    def _update_protocol(self, name: str, key: tuple[Any, Any], protocol: dict[str, Any]) -> None:
+        """Render the lines of a protocol, moving it to the end of the refresh order."""
+
+        labels = self._label("protocol", name, protocol["proto"])
+        lines: dict[str, list[str]] = {"bird_protocol_up": [f"bird_protocol_up{labels} {int(protocol['state'] == 'up')}"]}
+        tables = []
+        for channel_name, channel in protocol.get("channels", {}).items():
+            channel_labels = self._label("channel", name, protocol["proto"], channel_name)
+            lines.setdefault("bird_channel_up", []).append(f"bird_channel_up{channel_labels} {int(channel.get('state') == 'up')}")
+            for kind in ("imported", "exported", "preferred"):
+                if f"routes_{kind}" in channel:
+                    metric = f"bird_channel_routes_{kind}"
+                    lines.setdefault(metric, []).append(f"{metric}{channel_labels} {channel[f'routes_{kind}']}")
+            if channel.get("table"):
+                tables.append(channel["table"])
+
+        self._protocol_lines.pop(name, None)
+        self._protocol_lines[name] = _ProtocolLines(
+            key, f"bird_protocol_state_age_seconds{labels} ", self._since_epoch(protocol.get("since")), tables
+        )
+        self._protocol_blocks.set(name, tuple("\n".join(lines.get(metric, ())) for metric in _PROTOCOL_METRICS))
+
+    def _table_counts(self, tables: list[str]) -> tuple[dict[str, dict[str, Any]], int]:
+        """Return the route counts of a number of tables queried over a single connection, and the number of failed queries."""
+
+        if not tables:
+            return {}, 0
+        try:
+            replies = self._client.query_many([["show", "route", "table", table, "count"] for table in tables])
+        except BirdClientError:
+            return {}, len(tables)
+
+        counts = {}
+        errors = 0
+        for table, reply in zip(tables, replies, strict=True):
+            # An unknown table only costs us its metrics
+            try:
+                counts[table] = self._client.show_route_count(data=reply)
+            except BirdClientError:
+                errors += 1
+        return counts, errors
+
+    def _status_lines(self, status: dict[str, Any]) -> list[str]:
+        """Return the lines for the BIRD status metrics."""
+
+        lines = self._metric_lines("bird_info", [(_labels(version=status["version"], router_id=status["router_id"]), 1)])
+        # Work out the uptime and time since reconfiguration using the BIRD server time
+        if status["server_time"]:
+            server_time = since_epoch(status["server_time"], self._tz)
+            if status["last_reboot"]:
+                uptime = server_time - since_epoch(status["last_reboot"], self._tz)
+                lines += self._metric_lines("bird_uptime_seconds", [("", uptime)])
+            if status["last_reconfiguration"]:
+                age = server_time - since_epoch(status["last_reconfiguration"], self._tz)
+                lines += self._metric_lines("bird_reconfiguration_age_seconds", [("", age)])
+        return lines
+
+    def serve(self, address: str = "", port: int = 9324) -> None:  # pragma: no cover
+        """Serve the metrics over HTTP until interrupted."""
+
+        metrics = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            """Metrics request handler."""
+
+            def do_GET(self) -> None:
+                """Return the metrics."""
+
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.collect().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                """Don't log requests."""
+
+        with http.server.ThreadingHTTPServer((address, port), Handler) as server:
+            server.serve_forever()
+
+    def _label(self, kind: str, *values: str) -> str:
+        """Return a cached label string for a protocol, channel or table."""
+
+        key = (kind, *values)
+        res = self._label_cache.get(key)
+        if res is None:
+            if kind == "protocol":
+                res = _labels(name=values[0], proto=values[1])
+            elif kind == "channel":
+                res = _labels(name=values[0], proto=values[1], channel=values[2])
+            else:
+                res = _labels(table=values[0])
+            self._label_cache[key] = res
+        return res
+
+    def _since_epoch(self, value: Any) -> int | None:  # noqa: ANN401
+        """Return a 'since' field as seconds since the epoch, whatever format the client returns it in."""
+
+        if not value:
+            return None
+        if isinstance(value, dt.datetime):
+            return int(value.timestamp())
+        if isinstance(value, int):
+            return value
+        return since_epoch(value, self._tz)
+
+    @staticmethod
+    def _protocol_tables(protocols: dict[str, dict[str, Any]]) -> list[str]:
+        """Return the tables used by the protocol channels."""
+
+        tables = {
+            channel["table"]
+            for protocol in protocols.values()
+            for channel in protocol.get("channels", {}).values()
+            if channel.get("table")
+        }
+        return sorted(tables)
+
+    @staticmethod
+    def _metric_lines(name: str, samples: list[tuple[str, Any]]) -> list[str]:
+        """Return the lines for a metric and its samples."""
+
+        if not samples:
+            return []
+        metric_type, metric_help = _METRICS[name]
+        lines = [f"# HELP {name} {metric_help}", f"# TYPE {name} {metric_type}"]
+        lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+        return lines
+
+    @staticmethod
+    def _render_lines(lines: list[str]) -> str:
+        """Return the exposition text for a number of lines."""
+        return "\n".join([*lines, ""])
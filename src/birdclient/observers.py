@@ -0,0 +1,180 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""BIRD query timing and observers."""
+
+import bisect
+import dataclasses
+import threading
+from collections.abc import Callable
+from typing import Any
+
+__all__ = ["QueryTiming", "TimingAggregator"]
+
+
+# Default histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Timing phases kept by the aggregator by default
+DEFAULT_PHASES = ("total", "connect", "first_byte", "transfer", "parse")
+
+
+@dataclasses.dataclass
+class QueryTiming:
+    """
+    Timing breakdown of a BirdClient call, all times are in seconds.
+
+    ``first_byte`` and ``last_byte`` are measured from when the query was sent, ``wait`` is the time spent waiting on the socket
+    for data and ``decode`` the time spent decoding it into lines. ``parse`` is the rest of the time spent in the call.
+    """
+
+    command: str
+    connect: float = 0.0
+    send: float = 0.0
+    first_byte: float = 0.0
+    last_byte: float = 0.0
+    wait: float = 0.0
+    decode: float = 0.0
+    parse: float = 0.0
+    total: float = 0.0
+    bytes_received: int = 0
+    lines: int = 0
+    result_size: int = 0
+    error: str | None = None
+    # When the query was sent, used to work out the time to the first and last byte
+    sent_at: float = dataclasses.field(default=0.0, repr=False)
+
+    @property
+    def transfer(self) -> float:
+        """Return the time taken to receive the reply after the first byte."""
+        return self.last_byte - self.first_byte
+
+    def finish(self, total: float) -> None:
+        """Set the total time of the call and work out the time spent parsing."""
+
+        self.total = total
+        self.parse = max(0.0, total - self.connect - self.send - self.wait - self.decode)
+
+
+# Observers are called with the timing of each call
+Observer = Callable[[QueryTiming], None]
+
+
+class TimingAggregator:
+    """
+    Observer keeping latency histograms per command.
+
+    Add it to a client with ``BirdClient.add_observer()``, each call made is counted in histograms of the phases given, keyed by
+    the command.
+    """
+
+    # Histogram bucket upper bounds
+    _buckets: tuple[float, ...]
+    # Timing phases we keep histograms of
+    _phases: tuple[str, ...]
+    # Histograms by command and phase, the counts per bucket with the last being for values above all the buckets, and the sum
+    _histograms: dict[str, dict[str, tuple[list[int], list[float]]]]
+    # Number of errors by command
+    _errors: dict[str, int]
+    # Lock protecting our histograms
+    _lock: threading.Lock
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, phases: tuple[str, ...] = DEFAULT_PHASES) -> None:
+        """Initialize the object."""
+
+        self._buckets = tuple(sorted(buckets))
+        self._phases = phases
+        self._histograms = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, timing: QueryTiming) -> None:
+        """Count the timing of a call."""
+
+        with self._lock:
+            histograms = self._histograms.get(timing.command)
+            if histograms is None:
+                histograms = {phase: ([0] * (len(self._buckets) + 1), [0.0]) for phase in self._phases}
+                self._histograms[timing.command] = histograms
+            for phase, (counts, total) in histograms.items():
+                value = getattr(timing, phase)
+                counts[bisect.bisect_left(self._buckets, value)] += 1
+                total[0] += value
+            if timing.error:
+                self._errors[timing.command] = self._errors.get(timing.command, 0) + 1
+
+    @property
+    def commands(self) -> list[str]:
+        """Return the commands we have seen."""
+
+        with self._lock:
+            return sorted(self._histograms)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the histograms by command and phase.
+
+        Each histogram has the "count", "sum" and cumulative "buckets" as a list of (upper bound, count) tuples, the last with an
+        upper bound of infinity. Each command also has its number of "errors".
+        """
+
+        res: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for command, histograms in self._histograms.items():
+                res[command] = {"errors": self._errors.get(command, 0)}
+                for phase, (counts, total) in histograms.items():
+                    cumulative = []
+                    running = 0
+                    for bound, count in zip((*self._buckets, float("inf")), counts, strict=True):
+                        running += count
+                        cumulative.append((bound, running))
+                    res[command][phase] = {"count": running, "sum": total[0], "buckets": cumulative}
+        return res
+
+    def quantile(self, command: str, quantile: float, phase: str = "total") -> float | None:
+        """Return an estimate of a latency quantile from the histogram, interpolating within the bucket it falls in."""
+
+        histogram = self.snapshot().get(command, {}).get(phase)
+        if not histogram or not histogram["count"]:
+            return None
+
+        rank = quantile * histogram["count"]
+        lower_bound = 0.0
+        lower_count = 0
+        for bound, count in histogram["buckets"]:
+            if count >= rank:
+                # Values above our largest bucket can only be given as the largest bucket
+                if bound == float("inf"):
+                    return lower_bound
+                return lower_bound + (bound - lower_bound) * (rank - lower_count) / max(count - lower_count, 1)
+            lower_bound = bound
+            lower_count = count
+        return lower_bound  # pragma: no cover
+
+    def reset(self) -> None:
+        """Clear all histograms."""
+
+        with self._lock:
+            self._histograms = {}
+            self._errors = {}
@@ -0,0 +1,194 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Route origin validation using ROAs."""
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from .addresses import prefix_as_int
+from .exceptions import BirdClientParseError
+from .sinks import source_as_path, source_origin_as
+
+__all__ = ["ROA_INVALID", "ROA_UNKNOWN", "ROA_VALID", "RoaTable"]
+
+
+# Route origin validation states, as defined in RFC 6811
+ROA_VALID = "valid"
+ROA_INVALID = "invalid"
+ROA_UNKNOWN = "unknown"
+
+# Address length of each family
+_FAMILY_BITS = {4: 32, 6: 128}
+
+
+class RoaTable:
+    """
+    Table of ROAs used to validate route origins as described in RFC 6811.
+
+    ROAs are kept in a prefix trie per address family. The trie is stored by level, each level holding the nodes with a prefix
+    of that length in a dict keyed by network, as looking up each level that has ROAs is quicker in Python than walking the trie
+    one bit at a time. Each node holds the set of (max length, ASN) pairs of its ROAs.
+
+    The table is a route sink, so it can be filled while a BIRD ROA table is parsed by passing it in the ``sinks`` of
+    ``show_route()``, or from the parsed routes using ``update()``.
+    """
+
+    # Nodes by prefix length and network, for each address family
+    _levels: dict[int, dict[int, dict[int, set[tuple[int, int]]]]]
+    # Prefix lengths that have nodes, longest first, for each address family
+    _lengths: dict[int, list[int]]
+    # Number of ROAs
+    _count: int
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+
+        self._levels = {4: {}, 6: {}}
+        self._lengths = {4: [], 6: []}
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of ROAs."""
+        return self._count
+
+    def add(self, prefix: Any, sources: list[dict[str, Any]]) -> None:  # noqa: ANN401
+        """Add the ROAs of a prefix from a parsed BIRD ROA table, sources which aren't ROAs are ignored."""
+
+        for source in sources:
+            if "ROA.asn" in source:
+                self.add_roa(prefix, source["ROA.max"], source["ROA.asn"])
+
+    def add_roa(self, prefix: Any, max_length: int, asn: int | str) -> None:  # noqa: ANN401
+        """Add a ROA, the ASN can be given as an integer or a string like '65000' or 'AS65000'."""
+
+        network, length, family = prefix_as_int(prefix)
+        levels = self._levels[family]
+        level = levels.get(length)
+        if level is None:
+            level = levels[length] = {}
+            self._lengths[family] = sorted(levels, reverse=True)
+
+        roas = level.get(network)
+        if roas is None:
+            roas = level[network] = set()
+        roa = (max_length, _asn(asn))
+        if roa not in roas:
+            roas.add(roa)
+            self._count += 1
+
+    def update(self, routes: Mapping[Any, list[dict[str, Any]]] | Iterable[tuple[Any, list[dict[str, Any]]]]) -> None:
+        """Add the ROAs from a parsed BIRD ROA table, from ``show_route()`` or any of the route iterators."""
+
+        for prefix, sources in routes.items() if isinstance(routes, Mapping) else routes:
+            self.add(prefix, sources)
+
+    def validate(self, prefix: Any, origin_as: int | None) -> str:  # noqa: ANN401
+        """
+        Return the validation state of a route, ``origin_as`` is None if the route has no origin AS, like with an AS_SET.
+
+        The route is unknown if no ROA covers its prefix, valid if a covering ROA matches its origin AS and allows its length, and
+        invalid otherwise. ROAs for AS0 never match.
+        """
+
+        network, length, family = prefix_as_int(prefix)
+        return self._validate(network, length, family, origin_as)
+
+    def validate_routes(
+        self,
+        routes: Mapping[Any, list[dict[str, Any]]] | Iterable[tuple[Any, list[dict[str, Any]]]],
+        *,
+        local_as: int | None = None,
+    ) -> Iterator[tuple[Any, dict[str, Any], str]]:
+        """
+        Yield each prefix and source of parsed BGP routes along with its validation state.
+
+        The routes are the result of ``show_route()`` or any of the route iterators, so a table can be validated as it is
+        received from BIRD. The origin AS is the last AS in the AS path, routes with an empty AS path are originated by
+        ``local_as`` and routes with an AS path ending in an AS_SET have no origin AS.
+        """
+
+        # The sources of a prefix often share their origin, so we remember the results for the prefix we're busy with
+        for prefix, sources in routes.items() if isinstance(routes, Mapping) else routes:
+            network, length, family = prefix_as_int(prefix)
+            states: dict[int | None, str] = {}
+            for source in sources:
+                origin_as = source_origin_as(source) if source_as_path(source) else local_as
+                state = states.get(origin_as)
+                if state is None:
+                    state = states[origin_as] = self._validate(network, length, family, origin_as)
+                yield prefix, source, state
+
+    def count_states(
+        self,
+        routes: Mapping[Any, list[dict[str, Any]]] | Iterable[tuple[Any, list[dict[str, Any]]]],
+        *,
+        key: str = "protocol",
+        local_as: int | None = None,
+    ) -> dict[Any, dict[str, int]]:
+        """
+        Return the number of valid, invalid and unknown sources of parsed BGP routes for each value of the source ``key``.
+
+        By default the sources are counted per protocol, which gives the counts per BGP peer.
+        """
+
+        res: dict[Any, dict[str, int]] = {}
+        for _, source, state in self.validate_routes(routes, local_as=local_as):
+            counts = res.get(source.get(key))
+            if counts is None:
+                counts = res[source.get(key)] = {ROA_VALID: 0, ROA_INVALID: 0, ROA_UNKNOWN: 0}
+            counts[state] += 1
+        return res
+
+    def _validate(self, network: int, length: int, family: int, origin_as: int | None) -> str:
+        """Return the validation state of a route."""
+
+        bits = _FAMILY_BITS[family]
+        levels = self._levels[family]
+        covered = False
+        for roa_length in self._lengths[family]:
+            if roa_length > length:
+                continue
+            shift = bits - roa_length
+            roas = levels[roa_length].get(network >> shift << shift)
+            if roas is None:
+                continue
+            covered = True
+            if origin_as is not None:
+                for max_length, asn in roas:
+                    if asn == origin_as and length <= max_length and asn != 0:
+                        return ROA_VALID
+
+        return ROA_INVALID if covered else ROA_UNKNOWN
+
+
+def _asn(asn: int | str) -> int:
+    """Return an ASN as an integer."""
+
+    if isinstance(asn, int):
+        return asn
+    try:
+        return int(asn.removeprefix("AS"))
+    except ValueError as err:
+        raise BirdClientParseError(f"Failed to parse ASN '{asn}'") from err
@@ -0,0 +1,91 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Sinks receiving routes as they are parsed."""
+
+from collections.abc import Iterator
+from typing import Any, Protocol
+
+__all__ = ["AS_PATH_ATTRIBUTES", "COMMUNITY_ATTRIBUTES", "RouteSink", "source_as_path", "source_communities", "source_origin_as"]
+
+
+# Attributes holding the AS path, BIRD 3 renamed "BGP.as_path" to "bgp_path"
+AS_PATH_ATTRIBUTES = ("BGP.as_path", "bgp_path")
+
+# Attributes holding communities and the kind of community they hold, BIRD 3 renamed the "BGP." attributes to "bgp_"
+COMMUNITY_ATTRIBUTES = {
+    "BGP.community": "community",
+    "bgp_community": "community",
+    "BGP.ext_community": "ext_community",
+    "bgp_ext_community": "ext_community",
+    "BGP.large_community": "large_community",
+    "bgp_large_community": "large_community",
+}
+
+
+class RouteSink(Protocol):
+    """Sink receiving each prefix and its sources as they are parsed, see the ``sinks`` parameter of ``show_route()``."""
+
+    def add(self, prefix: Any, sources: list[dict[str, Any]]) -> None:  # noqa: ANN401
+        """Add a prefix and its sources."""
+
+
+def source_as_path(source: dict[str, Any]) -> list[int] | None:
+    """Return the AS path of a source, or None if it doesn't have one."""
+
+    attributes = source.get("attributes")
+    if not attributes:
+        return None
+    for name in AS_PATH_ATTRIBUTES:
+        as_path = attributes.get(name)
+        if as_path is not None:
+            return as_path  # type: ignore[no-any-return]
+    return None
+
+
+def source_origin_as(source: dict[str, Any]) -> int | None:
+    """
+    Return the origin AS of a source, or None if it doesn't have one.
+
+    The AS path is parsed as a flat list of ASes, which loses AS_SETs, so the origin AS BIRD shows on the first line of BGP
+    sources is used where we have it. BIRD leaves it out when the AS path is empty or ends with an AS_SET, which has no single
+    origin AS.
+    """
+
+    if "bgp_type" in source:
+        asn = source.get("asn")
+        return int(asn[2:]) if asn else None
+    as_path = source_as_path(source)
+    return as_path[-1] if as_path else None
+
+
+def source_communities(source: dict[str, Any]) -> Iterator[tuple[str, tuple[Any, ...]]]:
+    """Yield the kind of each community of a source and the community, the kind is one of the values of COMMUNITY_ATTRIBUTES."""
+
+    attributes = source.get("attributes")
+    if not attributes:
+        return
+    for name, kind in COMMUNITY_ATTRIBUTES.items():
+        for community in attributes.get(name, ()):
+            yield kind, community
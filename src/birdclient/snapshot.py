@@ -0,0 +1,595 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Compact binary snapshots of parsed routing tables."""
+
+import bisect
+import datetime as dt
+import hashlib
+import ipaddress
+import mmap
+import os
+import pathlib
+import struct
+from collections.abc import Iterable, Iterator, Mapping
+from types import TracebackType
+from typing import Any, Self
+
+from .addresses import prefix_to_int, prefix_to_str
+from .exceptions import BirdClientError, BirdClientParseError
+from .timestamps import BirdTimestamp
+
+__all__ = ["SNAPSHOT_VERSION", "RouteSnapshot"]
+
+
+# Snapshot file format version, bumped whenever the format changes
+SNAPSHOT_VERSION = 1
+
+# The snapshot file starts with a header holding the format, the number of entries in each section and their offsets. The
+# sections are, in order:
+#   - prefix index: fixed size records sorted by prefix key, with the index of the first source of the prefix and its count
+#   - sources: fixed size records referencing the values holding the source without its 'since' and attributes, its 'since' and
+#     its attributes, so sources that only differ in when they were received share the rest of their values
+#   - value offsets and values: encoded values, each distinct value is only stored once
+#   - string offsets and strings: UTF-8 strings referenced by the values, each distinct string is only stored once
+_MAGIC = b"BIRDSNAP"
+_HEADER = struct.Struct("<8sHBxIIII6Q")
+# Prefix keys are the family, network in big endian and length, so sorting the keys as bytes sorts the prefixes
+_INDEX = struct.Struct("<18sIII")
+_KEY = struct.Struct(">B16sB")
+_SOURCE = struct.Struct("<III")
+_OFFSET = struct.Struct("<Q")
+
+# Prefix formats, matching the address formats of BirdClient
+_PREFIX_FORMATS = ("str", "int", "ipaddress")
+
+# Family of prefixes which aren't IP prefixes, their key is a hash of the prefix and the prefix itself is stored as a value
+_OTHER_FAMILY = 0
+
+# Value used when there is no value, like for sources without attributes
+_NO_VALUE = 0xFFFFFFFF
+
+# Marker for values not decoded yet
+_MISSING = object()
+
+# Number of decoded values kept before the cache is cleared
+_VALUE_CACHE_SIZE = 1 << 20
+
+# Value types
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_STR = 4
+_LIST = 5
+_TUPLE = 6
+_DICT = 7
+_FLOAT = 8
+_DATETIME = 9
+_TIMESTAMP = 10
+_IPV4_ADDRESS = 11
+_IPV6_ADDRESS = 12
+_IPV4_NETWORK = 13
+_IPV6_NETWORK = 14
+
+_FLOAT_VALUE = struct.Struct("<d")
+
+
+class RouteSnapshot(Mapping[Any, list[dict[str, Any]]]):
+    """
+    Read only, memory mapped snapshot of a parsed routing table.
+
+    Snapshots are written using ``RouteSnapshot.write()`` from the result of ``show_route()`` or any of the route iterators.
+    Opening a snapshot only reads its header, looking up a prefix is a binary search of the prefix index and only decodes the
+    sources of that prefix. As the file is memory mapped, processes opening the same snapshot share the memory it uses, and
+    snapshot objects can be pickled to pass them to other processes.
+
+    Prefixes are returned in the address format they were written in, while they can be looked up using any address format.
+    Each distinct value is only decoded once, so sources share the values they have in common, like their attributes. Copy the
+    values of a source before modifying them.
+    """
+
+    # Path of the snapshot file
+    _path: str
+    # Snapshot file mapped into memory
+    _mmap: mmap.mmap
+    # Format prefixes were written in
+    _prefix_format: str
+    # Number of prefixes, sources, values and strings
+    _prefix_count: int
+    _source_count: int
+    _value_count: int
+    _string_count: int
+    # Section offsets
+    _index_offset: int
+    _sources_offset: int
+    _value_offsets_offset: int
+    _values_offset: int
+    _string_offsets_offset: int
+    _strings_offset: int
+    # Strings decoded so far
+    _strings: list[str | None]
+    # Values decoded so far
+    _values: dict[int, Any]
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open a snapshot."""
+
+        self._path = os.fspath(path)
+        with pathlib.Path(self._path).open("rb") as file:
+            try:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as err:
+                raise BirdClientError(f"Route snapshot '{self._path}' is empty") from err
+
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise BirdClientError(f"Route snapshot '{self._path}' is truncated")
+        (
+            magic,
+            version,
+            prefix_format,
+            self._prefix_count,
+            self._source_count,
+            self._value_count,
+            self._string_count,
+            self._index_offset,
+            self._sources_offset,
+            self._value_offsets_offset,
+            self._values_offset,
+            self._string_offsets_offset,
+            self._strings_offset,
+        ) = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise BirdClientError(f"File '{self._path}' is not a route snapshot")
+        if version != SNAPSHOT_VERSION:
+            self._mmap.close()
+            raise BirdClientError(f"Route snapshot '{self._path}' has unsupported version {version}")
+
+        self._prefix_format = _PREFIX_FORMATS[prefix_format]
+        self._strings = [None] * self._string_count
+        self._values = {}
+
+    def __enter__(self) -> Self:
+        """Return ourselves when used as a context manager."""
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Close the snapshot when leaving the context."""
+        self.close()
+
+    def __reduce__(self) -> tuple[type["RouteSnapshot"], tuple[str]]:
+        """Pickle the snapshot as its path, so it is mapped again when unpickled."""
+        return (RouteSnapshot, (self._path,))
+
+    def __len__(self) -> int:
+        """Return the number of prefixes."""
+        return self._prefix_count
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the prefixes in prefix order."""
+
+        for index in range(self._prefix_count):
+            key, _, _, prefix_value = _INDEX.unpack_from(self._mmap, self._index_offset + index * _INDEX.size)
+            yield self._prefix(key, prefix_value)
+
+    def __getitem__(self, prefix: Any) -> list[dict[str, Any]]:  # noqa: ANN401
+        """Return the sources of a prefix."""
+
+        key = _prefix_key(prefix)
+        index = bisect.bisect_left(_IndexKeys(self), key)
+        if index < self._prefix_count:
+            found, first, count, _ = _INDEX.unpack_from(self._mmap, self._index_offset + index * _INDEX.size)
+            if found == key:
+                return [self._source(source) for source in range(first, first + count)]
+        raise KeyError(prefix)
+
+    @property
+    def prefix_format(self) -> str:
+        """Return the address format prefixes are returned in."""
+        return self._prefix_format
+
+    def items(self) -> Iterator[tuple[Any, list[dict[str, Any]]]]:  # type: ignore[override]
+        """Iterate over the prefixes and their sources in prefix order."""
+
+        for index in range(self._prefix_count):
+            key, first, count, prefix_value = _INDEX.unpack_from(self._mmap, self._index_offset + index * _INDEX.size)
+            yield self._prefix(key, prefix_value), [self._source(source) for source in range(first, first + count)]
+
+    def to_dict(self) -> dict[Any, list[dict[str, Any]]]:
+        """Return all the prefixes and their sources, like ``show_route()`` does."""
+        return dict(self.items())
+
+    def close(self) -> None:
+        """Close the snapshot."""
+        self._mmap.close()
+
+    @staticmethod
+    def write(path: str | os.PathLike[str], routes: Mapping[Any, list[dict[str, Any]]] | Iterable[tuple[Any, Any]]) -> int:
+        """
+        Write a snapshot of routes, returning the number of prefixes written.
+
+        The routes are the result of ``show_route()`` or any of the route iterators, so a table can be written as it is received
+        from BIRD. The snapshot is written to a temporary file which then replaces ``path``, so snapshots already open are not
+        affected.
+        """
+
+        writer = _SnapshotWriter()
+        for prefix, sources in routes.items() if isinstance(routes, Mapping) else routes:
+            writer.add(prefix, sources)
+
+        tmp_path = pathlib.Path(f"{os.fspath(path)}.tmp")
+        with tmp_path.open("wb") as file:
+            writer.write(file)
+        tmp_path.replace(path)
+
+        return len(writer.index)
+
+    def _prefix(self, key: bytes, prefix_value: int) -> Any:  # noqa: ANN401
+        """Return a prefix from its key."""
+
+        family, network, length = _KEY.unpack(key)
+        if family == _OTHER_FAMILY:
+            return self._value(prefix_value)
+
+        network_int = int.from_bytes(network)
+        if self._prefix_format == "int":
+            return (network_int, length, family)
+        if self._prefix_format == "ipaddress":
+            if family == 4:  # noqa: PLR2004
+                return ipaddress.IPv4Network((network_int, length))
+            return ipaddress.IPv6Network((network_int, length))
+        return prefix_to_str((network_int, length, family))
+
+    def _source(self, index: int) -> dict[str, Any]:
+        """Return a source."""
+
+        base, since, attributes = _SOURCE.unpack_from(self._mmap, self._sources_offset + index * _SOURCE.size)
+        source: dict[str, Any] = self._value(base).copy()
+        if since != _NO_VALUE:
+            source["since"] = self._value(since)
+        if attributes != _NO_VALUE:
+            source["attributes"] = self._value(attributes)
+        return source
+
+    def _value(self, index: int) -> Any:  # noqa: ANN401
+        """Return a value, decoding it on first use."""
+
+        res = self._values.get(index, _MISSING)
+        if res is not _MISSING:
+            return res
+
+        if len(self._values) >= _VALUE_CACHE_SIZE:
+            self._values.clear()
+        start, end = struct.unpack_from("<QQ", self._mmap, self._value_offsets_offset + index * _OFFSET.size)
+        res, _ = self._decode(self._mmap[self._values_offset + start : self._values_offset + end], 0)
+        self._values[index] = res
+        return res
+
+    def _string(self, index: int) -> str:
+        """Return a string, decoding it on first use."""
+
+        res = self._strings[index]
+        if res is None:
+            start, end = struct.unpack_from("<QQ", self._mmap, self._string_offsets_offset + index * _OFFSET.size)
+            res = self._mmap[self._strings_offset + start : self._strings_offset + end].decode("UTF-8")
+            self._strings[index] = res
+        return res
+
+    def _decode(self, data: bytes, pos: int) -> tuple[Any, int]:  # noqa: C901,PLR0911,PLR0912
+        """Decode the value at ``pos``, returning it and the position after it."""
+
+        tag = data[pos]
+        pos += 1
+        if tag == _STR:
+            # Most values are small, so we skip the function call to read them when they fit in a single byte
+            index = data[pos]
+            if index < 0x80:  # noqa: PLR2004
+                pos += 1
+            else:
+                index, pos = _read_varint(data, pos)
+            res = self._strings[index]
+            return (self._string(index) if res is None else res), pos
+        if tag == _INT:
+            value = data[pos]
+            if value < 0x80:  # noqa: PLR2004
+                pos += 1
+            else:
+                value, pos = _read_varint(data, pos)
+            return (value >> 1) ^ -(value & 1), pos
+        if tag == _DICT:
+            count, pos = _read_varint(data, pos)
+            res = {}
+            for _ in range(count):
+                key, pos = self._decode(data, pos)
+                res[key], pos = self._decode(data, pos)
+            return res, pos
+        if tag in (_LIST, _TUPLE):
+            count, pos = _read_varint(data, pos)
+            items = []
+            for _ in range(count):
+                item, pos = self._decode(data, pos)
+                items.append(item)
+            return (items if tag == _LIST else tuple(items)), pos
+        if tag == _TRUE:
+            return True, pos
+        if tag == _FALSE:
+            return False, pos
+        if tag == _NONE:
+            return None, pos
+        if tag == _TIMESTAMP:
+            index, pos = _read_varint(data, pos)
+            return BirdTimestamp(self._string(index)), pos
+        if tag == _DATETIME:
+            index, pos = _read_varint(data, pos)
+            return dt.datetime.fromisoformat(self._string(index)), pos
+        if tag == _IPV4_ADDRESS:
+            return ipaddress.IPv4Address(data[pos : pos + 4]), pos + 4
+        if tag == _IPV6_ADDRESS:
+            return ipaddress.IPv6Address(data[pos : pos + 16]), pos + 16
+        if tag == _IPV4_NETWORK:
+            return ipaddress.IPv4Network((int.from_bytes(data[pos : pos + 4]), data[pos + 4])), pos + 5
+        if tag == _IPV6_NETWORK:
+            return ipaddress.IPv6Network((int.from_bytes(data[pos : pos + 16]), data[pos + 16])), pos + 17
+        if tag == _FLOAT:
+            return _FLOAT_VALUE.unpack_from(data, pos)[0], pos + _FLOAT_VALUE.size
+        raise BirdClientError(f"Route snapshot '{self._path}' is corrupt, unknown value type {tag}")
+
+
+class _IndexKeys:
+    """Sequence of the prefix keys in a snapshot, used to binary search the prefix index."""
+
+    __slots__ = ("_snapshot",)
+
+    def __init__(self, snapshot: RouteSnapshot) -> None:
+        """Initialize the object."""
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        """Return the number of prefixes."""
+        return self._snapshot._prefix_count  # noqa: SLF001
+
+    def __getitem__(self, index: int) -> bytes:
+        """Return the key of a prefix."""
+
+        snapshot = self._snapshot
+        start = snapshot._index_offset + index * _INDEX.size  # noqa: SLF001
+        return snapshot._mmap[start : start + _KEY.size]  # noqa: SLF001
+
+
+class _SnapshotWriter:
+    """Builder of a snapshot, collecting the prefixes and deduplicating their sources."""
+
+    # Prefix index records by key
+    index: dict[bytes, tuple[int, int, int]]
+    # Source records
+    sources: list[tuple[int, int, int]]
+    # Encoded values and their indexes, values are deduplicated by their encoding as equal values can differ in type
+    values: dict[bytes, int]
+    # Strings and their indexes
+    strings: dict[str, int]
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+
+        self.prefix_format = "str"
+        self.index = {}
+        self.sources = []
+        self.values = {}
+        self.strings = {}
+
+    def add(self, prefix: Any, sources: list[dict[str, Any]]) -> None:  # noqa: ANN401
+        """Add a prefix and its sources."""
+
+        if not self.index:
+            if isinstance(prefix, tuple):
+                self.prefix_format = "int"
+            elif isinstance(prefix, ipaddress.IPv4Network | ipaddress.IPv6Network):
+                self.prefix_format = "ipaddress"
+
+        key = _prefix_key(prefix)
+        # The sources of a prefix are stored together, so a prefix can't be added again later on
+        if key in self.index:
+            raise BirdClientError(f"Prefix '{prefix}' appears more than once in the routes written to the snapshot")
+        prefix_value = _NO_VALUE
+        if key[0] == _OTHER_FAMILY:
+            prefix_value = self._value(prefix)
+
+        first = len(self.sources)
+        for source in sources:
+            base = {name: value for name, value in source.items() if name not in ("since", "attributes")}
+            since = source.get("since")
+            attributes = source.get("attributes")
+            self.sources.append(
+                (
+                    self._value(base),
+                    _NO_VALUE if since is None else self._value(since),
+                    _NO_VALUE if attributes is None else self._value(attributes),
+                )
+            )
+        self.index[key] = (first, len(self.sources) - first, prefix_value)
+
+    def write(self, file: Any) -> None:  # noqa: ANN401
+        """Write the snapshot to a file."""
+
+        values = list(self.values)
+        strings = [string.encode("UTF-8") for string in self.strings]
+
+        # Work out the section offsets
+        index_offset = _HEADER.size
+        sources_offset = index_offset + len(self.index) * _INDEX.size
+        value_offsets_offset = sources_offset + len(self.sources) * _SOURCE.size
+        values_offset = value_offsets_offset + (len(values) + 1) * _OFFSET.size
+        string_offsets_offset = values_offset + sum(len(value) for value in values)
+        strings_offset = string_offsets_offset + (len(strings) + 1) * _OFFSET.size
+
+        file.write(
+            _HEADER.pack(
+                _MAGIC,
+                SNAPSHOT_VERSION,
+                _PREFIX_FORMATS.index(self.prefix_format),
+                len(self.index),
+                len(self.sources),
+                len(values),
+                len(strings),
+                index_offset,
+                sources_offset,
+                value_offsets_offset,
+                values_offset,
+                string_offsets_offset,
+                strings_offset,
+            )
+        )
+        file.write(b"".join(_INDEX.pack(key, *self.index[key]) for key in sorted(self.index)))
+        file.write(b"".join(_SOURCE.pack(*source) for source in self.sources))
+        _write_blobs(file, values)
+        _write_blobs(file, strings)
+
+    def _value(self, value: Any) -> int:  # noqa: ANN401
+        """Return the index of a value, adding it if we don't have it yet."""
+
+        out = bytearray()
+        self._encode(value, out)
+        data = bytes(out)
+        index = self.values.get(data)
+        if index is None:
+            index = self.values[data] = len(self.values)
+        return index
+
+    def _string(self, value: str) -> int:
+        """Return the index of a string, adding it if we don't have it yet."""
+
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def _encode(self, value: Any, out: bytearray) -> None:  # noqa: ANN401,C901,PLR0912
+        """Encode a value."""
+
+        # Subclasses need checking before their base classes, BirdTimestamp before str and bool before int
+        if isinstance(value, BirdTimestamp):
+            out.append(_TIMESTAMP)
+            _write_varint(out, self._string(value))
+        elif isinstance(value, str):
+            out.append(_STR)
+            _write_varint(out, self._string(value))
+        elif isinstance(value, bool):
+            out.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                self._encode(key, out)
+                self._encode(item, out)
+        elif isinstance(value, list | tuple):
+            out.append(_LIST if isinstance(value, list) else _TUPLE)
+            _write_varint(out, len(value))
+            for item in value:
+                self._encode(item, out)
+        elif value is None:
+            out.append(_NONE)
+        elif isinstance(value, dt.datetime):
+            out.append(_DATETIME)
+            _write_varint(out, self._string(value.isoformat()))
+        elif isinstance(value, ipaddress.IPv4Address | ipaddress.IPv6Address):
+            out.append(_IPV4_ADDRESS if value.version == 4 else _IPV6_ADDRESS)  # noqa: PLR2004
+            out += value.packed
+        elif isinstance(value, ipaddress.IPv4Network | ipaddress.IPv6Network):
+            out.append(_IPV4_NETWORK if value.version == 4 else _IPV6_NETWORK)  # noqa: PLR2004
+            out += value.network_address.packed
+            out.append(value.prefixlen)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _FLOAT_VALUE.pack(value)
+        else:
+            raise BirdClientError(f"Values of type '{type(value).__name__}' can't be stored in a route snapshot")
+
+
+def _prefix_key(prefix: Any) -> bytes:  # noqa: ANN401
+    """Return the key of a prefix in any of our address formats."""
+
+    if isinstance(prefix, tuple):
+        network, length, family = prefix
+    elif isinstance(prefix, ipaddress.IPv4Network | ipaddress.IPv6Network):
+        network, length, family = int(prefix.network_address), prefix.prefixlen, prefix.version
+    else:
+        # Strings which wouldn't be output the same way from their key, like those with host bits set, are kept as is
+        try:
+            network, length, family = prefix_to_int(prefix)
+            canonical = prefix_to_str((network, length, family)) == prefix
+        except (BirdClientParseError, ValueError):
+            canonical = False
+        if not canonical:
+            return _other_prefix_key(prefix)
+    return _KEY.pack(family, network.to_bytes(16), length)
+
+
+def _other_prefix_key(prefix: str) -> bytes:
+    """Return the key of a prefix which isn't an IP prefix."""
+    return _KEY.pack(_OTHER_FAMILY, hashlib.blake2b(prefix.encode("UTF-8"), digest_size=16).digest(), 0)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Write an unsigned variable length integer, 7 bits at a time."""
+
+    while value > 0x7F:  # noqa: PLR2004
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Read an unsigned variable length integer, returning it and the position after it."""
+
+    byte = data[pos]
+    if byte < 0x80:  # noqa: PLR2004
+        return byte, pos + 1
+    res = byte & 0x7F
+    shift = 7
+    while True:
+        pos += 1
+        byte = data[pos]
+        res |= (byte & 0x7F) << shift
+        if byte < 0x80:  # noqa: PLR2004
+            return res, pos + 1
+        shift += 7
+
+
+def _write_blobs(file: Any, blobs: list[bytes]) -> None:  # noqa: ANN401
+    """Write the offsets of a list of blobs followed by the blobs themselves."""
+
+    offset = 0
+    offsets = [0]
+    for blob in blobs:
+        offset += len(blob)
+        offsets.append(offset)
+    file.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+    file.write(b"".join(blobs))
@@ -0,0 +1,299 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Streaming statistics of routes."""
+
+import hashlib
+import heapq
+import itertools
+import math
+from collections import Counter
+from collections.abc import Hashable, Iterable, Iterator
+from typing import Any
+
+from .exceptions import BirdClientError
+from .sinks import source_as_path, source_communities
+
+__all__ = ["HyperLogLog", "RouteStats", "TopK"]
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch estimating the number of distinct values added, using ``2^precision`` bytes of memory.
+
+    The standard error of the estimate is about ``1.04 / sqrt(2^precision)``, which is 1.6% for the default precision.
+    """
+
+    # Number of bits of the hash used to pick a register, and the number of registers
+    _precision: int
+    _size: int
+    # Registers holding the longest run of zero bits seen for values hashed to them, plus one
+    _registers: bytearray
+
+    def __init__(self, precision: int = 12) -> None:
+        """Initialize the object."""
+
+        if not 4 <= precision <= 16:  # noqa: PLR2004
+            raise BirdClientError(f"HyperLogLog precision must be between 4 and 16, not {precision}")
+        self._precision = precision
+        self._size = 1 << precision
+        self._registers = bytearray(self._size)
+
+    def __len__(self) -> int:
+        """Return the estimated number of distinct values added."""
+
+        size = self._size
+        estimate = _hll_alpha(size) * size * size / sum(2.0**-register for register in self._registers)
+        # Use linear counting for small cardinalities, where HyperLogLog is biased
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+    def add(self, value: Hashable) -> None:
+        """Add a value."""
+
+        # Python's own hash isn't suitable, small integers hash to themselves
+        hashed = int.from_bytes(hashlib.blake2b(repr(value).encode(), digest_size=8).digest())
+        index = hashed >> (64 - self._precision)
+        rest = hashed & ((1 << (64 - self._precision)) - 1)
+        rank = 64 - self._precision - rest.bit_length() + 1
+        self._registers[index] = max(self._registers[index], rank)
+
+    def update(self, values: Iterable[Hashable]) -> None:
+        """Add a number of values."""
+
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merge another sketch with the same precision into this one."""
+
+        if other._precision != self._precision:  # noqa: SLF001
+            raise BirdClientError("Only HyperLogLog sketches with the same precision can be merged")
+        self._registers = bytearray(map(max, self._registers, other._registers))  # noqa: SLF001
+
+
+class TopK:
+    """
+    Space-Saving sketch of the ``k`` most frequent values added, using memory proportional to ``k``.
+
+    Any value added more than ``total / k`` times is guaranteed to be kept. When a new value is added while the sketch is full it
+    replaces the least frequent value and inherits its count, so counts may be overestimated by at most the count they inherit.
+    """
+
+    # Number of values kept
+    _k: int
+    # Counts of the values kept
+    _counts: dict[Hashable, int]
+    # Heap of (count, sequence, value) used to find the least frequent value, entries are updated lazily when they are popped
+    _heap: list[tuple[int, int, Hashable]]
+    # Sequence numbers of heap entries, so values themselves are never compared
+    _sequence: Iterator[int]
+
+    def __init__(self, k: int) -> None:
+        """Initialize the object."""
+
+        if k < 1:
+            raise BirdClientError(f"TopK size must be at least 1, not {k}")
+        self._k = k
+        self._counts = {}
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        """Return the number of values kept."""
+        return len(self._counts)
+
+    def add(self, value: Hashable, count: int = 1) -> None:
+        """Add a value ``count`` times."""
+
+        counts = self._counts
+        current = counts.get(value)
+        if current is not None:
+            counts[value] = current + count
+            return
+
+        if len(counts) < self._k:
+            counts[value] = count
+            heapq.heappush(self._heap, (count, next(self._sequence), value))  # type: ignore[call-overload]
+            return
+
+        # Find the least frequent value, updating the stale heap entries we come across
+        heap = self._heap
+        while True:
+            entry_count, _, entry_value = heap[0]
+            if counts[entry_value] == entry_count:
+                break
+            heapq.heapreplace(heap, (counts[entry_value], next(self._sequence), entry_value))  # type: ignore[call-overload]
+
+        del counts[entry_value]
+        counts[value] = entry_count + count
+        heapq.heapreplace(heap, (entry_count + count, next(self._sequence), value))  # type: ignore[call-overload]
+
+    def update(self, values: Iterable[Hashable]) -> None:
+        """Add a number of values once each."""
+
+        for value in values:
+            self.add(value)
+
+    def most_common(self, n: int | None = None) -> list[tuple[Hashable, int]]:
+        """Return the ``n`` most frequent values and their counts, or all the values kept if ``n`` is None."""
+
+        items = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        return items if n is None else items[:n]
+
+
+class RouteStats:
+    """
+    Streaming statistics of parsed routes.
+
+    The statistics are a route sink, so they can be accumulated while routes are parsed by passing them in the ``sinks`` of
+    ``show_route()`` or any of the route iterators, without keeping the routes themselves.
+
+    Prefix, source and bestpath counts per protocol, prefixes per prefix length and the AS path length distribution are always
+    exact. The number of prefixes per origin AS, per gateway and per community are exact by default, which uses memory
+    proportional to the number of distinct values. If ``top_k`` is set, only the ``top_k`` most frequent values of each are
+    kept using a TopK sketch and the number of distinct values is estimated using a HyperLogLog sketch of ``precision``, which
+    bounds the memory used however many routes there are.
+    """
+
+    # Number of prefixes, sources and bestpaths
+    prefixes: int
+    sources: int
+    bestpaths: int
+    # Number of prefixes, sources and bestpaths for each protocol
+    _protocols: dict[Any, list[int]]
+    # Number of prefixes for each family and prefix length
+    _prefix_lengths: Counter[tuple[int, int]]
+    # Number of sources for each AS path length
+    _as_path_lengths: Counter[int]
+    # Number of prefixes for each origin AS, gateway and community, exact or sketched
+    _frequencies: dict[str, Counter[Any] | TopK]
+    # Estimated distinct origin ASes, gateways and communities when sketching
+    _distinct: dict[str, HyperLogLog] | None
+
+    def __init__(self, *, top_k: int | None = None, precision: int = 12) -> None:
+        """Initialize the object."""
+
+        self.prefixes = 0
+        self.sources = 0
+        self.bestpaths = 0
+        self._protocols = {}
+        self._prefix_lengths = Counter()
+        self._as_path_lengths = Counter()
+        dimensions = ("origin_as", "gateway", "community")
+        if top_k is None:
+            self._frequencies = {dimension: Counter() for dimension in dimensions}
+            self._distinct = None
+        else:
+            self._frequencies = {dimension: TopK(top_k) for dimension in dimensions}
+            self._distinct = {dimension: HyperLogLog(precision) for dimension in dimensions}
+
+    def add(self, prefix: Any, sources: list[dict[str, Any]]) -> None:  # noqa: ANN401,C901
+        """Add a prefix and its sources."""
+
+        self.prefixes += 1
+        self._prefix_lengths[_prefix_family_length(prefix)] += 1
+
+        # Values are counted once per prefix, however many sources have them
+        protocols: set[Any] = set()
+        origins: set[int] = set()
+        gateways: set[Any] = set()
+        communities: set[Any] = set()
+        for source in sources:
+            self.sources += 1
+            protocol = source.get("protocol")
+            counts = self._protocols.get(protocol)
+            if counts is None:
+                counts = self._protocols[protocol] = [0, 0, 0]
+            if protocol not in protocols:
+                protocols.add(protocol)
+                counts[0] += 1
+            counts[1] += 1
+            if source.get("bestpath"):
+                self.bestpaths += 1
+                counts[2] += 1
+
+            as_path = source_as_path(source)
+            if as_path is not None:
+                self._as_path_lengths[len(as_path)] += 1
+                if as_path:
+                    origins.add(as_path[-1])
+            for nexthop in source.get("nexthops", ()):
+                if "gateway" in nexthop:
+                    gateways.add(nexthop["gateway"])
+            communities.update(community for _, community in source_communities(source))
+
+        for dimension, values in (("origin_as", origins), ("gateway", gateways), ("community", communities)):
+            if values:
+                self._frequencies[dimension].update(values)
+                if self._distinct is not None:
+                    self._distinct[dimension].update(values)
+
+    def result(self, top: int | None = None) -> dict[str, Any]:
+        """Return the statistics, with only the ``top`` most frequent origin ASes, gateways and communities if set."""
+
+        res: dict[str, Any] = {
+            "prefixes": self.prefixes,
+            "sources": self.sources,
+            "bestpaths": self.bestpaths,
+            "protocols": {
+                protocol: {"prefixes": counts[0], "sources": counts[1], "bestpaths": counts[2]}
+                for protocol, counts in self._protocols.items()
+            },
+            "prefix_lengths": {},
+            "as_path_lengths": dict(sorted(self._as_path_lengths.items())),
+            "distinct": {},
+        }
+        for (family, length), count in sorted(self._prefix_lengths.items()):
+            res["prefix_lengths"].setdefault(family, {})[length] = count
+        for dimension, frequencies in self._frequencies.items():
+            res[dimension] = dict(frequencies.most_common(top))
+            res["distinct"][dimension] = len(frequencies if self._distinct is None else self._distinct[dimension])
+
+        return res
+
+
+def _hll_alpha(size: int) -> float:
+    """Return the HyperLogLog bias correction constant for a number of registers."""
+
+    if size == 16:  # noqa: PLR2004
+        return 0.673
+    if size == 32:  # noqa: PLR2004
+        return 0.697
+    if size == 64:  # noqa: PLR2004
+        return 0.709
+    return 0.7213 / (1 + 1.079 / size)
+
+
+def _prefix_family_length(prefix: Any) -> tuple[int, int]:  # noqa: ANN401
+    """Return the family and length of a prefix in any of our address formats."""
+
+    if isinstance(prefix, str):
+        # Splitting the string is quicker than parsing it
+        return (6 if ":" in prefix else 4), int(prefix.rpartition("/")[2])
+    if isinstance(prefix, tuple):
+        return prefix[2], prefix[1]
+    return prefix.version, prefix.prefixlen
@@ -0,0 +1,148 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""BIRD timestamp handling."""
+
+import datetime as dt
+import functools
+from collections.abc import Callable
+from typing import Any
+
+from .exceptions import BirdClientError, BirdClientParseError
+
+__all__ = ["SINCE_FORMATS", "BirdTimestamp", "parse_since", "since_converter", "since_epoch"]
+
+
+# Formats we can return 'since' fields in
+SINCE_FORMATS = ("str", "timestamp", "datetime", "epoch")
+
+
+class BirdTimestamp(str):
+    """
+    BIRD timestamp string, which is parsed into a datetime when first needed.
+
+    Parsing is memoised, so the many routes sharing the same timestamp only parse it once.
+    """
+
+    __slots__ = ()
+
+    def to_datetime(self, tz: dt.tzinfo | None = None) -> dt.datetime:
+        """Return the timestamp as a timezone aware datetime, BIRD timestamps are in the timezone ``tz`` or local time if None."""
+        return parse_since(self, tz)
+
+    @property
+    def epoch(self) -> int:
+        """Return the timestamp as seconds since the epoch."""
+        return since_epoch(self)
+
+    @property
+    def datetime(self) -> dt.datetime:
+        """Return the timestamp as a timezone aware datetime in the local timezone."""
+        return parse_since(self)
+
+
+def parse_since(value: str, tz: dt.tzinfo | None = None, now: dt.datetime | None = None) -> dt.datetime:
+    """
+    Parse a BIRD timestamp into a timezone aware datetime.
+
+    BIRD outputs timestamps in the local time of the host it runs on, ``tz`` can be used if that is not our local time. Without
+    'timeformat ... iso long' BIRD only outputs the time for timestamps less than a day old, these are taken to be the last time
+    the clock showed that time before ``now``.
+    """
+
+    # Check if we have a date
+    if value[4:5] == "-":
+        return _parse_since_datetime(value, tz)
+
+    # Work out the most recent time in the past that matches
+    if now is None:
+        now = dt.datetime.now(tz).astimezone(tz)
+    res = _localize(dt.datetime.combine(now.date(), _parse_since_time(value)), tz)
+    if res > now:
+        res = _localize(dt.datetime.combine(now.date() - dt.timedelta(days=1), _parse_since_time(value)), tz)
+    return res
+
+
+def since_epoch(value: str, tz: dt.tzinfo | None = None) -> int:
+    """Return a BIRD timestamp as seconds since the epoch."""
+
+    # Only memoise timestamps with a date, those without change meaning over time
+    if value[4:5] == "-":
+        return _since_epoch_datetime(value, tz)
+    return int(parse_since(value, tz).timestamp())
+
+
+def since_converter(since_format: str, tz: dt.tzinfo | None = None) -> Callable[[str], Any]:
+    """Return a function converting 'since' fields into the format requested."""
+
+    if since_format == "str":
+        return str
+    if since_format == "timestamp":
+        return _timestamp
+    if since_format == "datetime":
+        return functools.partial(parse_since, tz=tz)
+    if since_format == "epoch":
+        return functools.partial(since_epoch, tz=tz)
+    raise BirdClientError(f"Unknown since format '{since_format}', must be one of: {', '.join(SINCE_FORMATS)}")
+
+
+@functools.lru_cache(maxsize=65536)
+def _timestamp(value: str) -> BirdTimestamp:
+    """Return a shared BirdTimestamp for a value."""
+    return BirdTimestamp(value)
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_since_datetime(value: str, tz: dt.tzinfo | None) -> dt.datetime:
+    """Parse a BIRD timestamp with a date."""
+
+    try:
+        res = dt.datetime.fromisoformat(value)
+    except ValueError as err:
+        raise BirdClientParseError(f"Failed to parse timestamp '{value}'") from err
+    return _localize(res, tz)
+
+
+@functools.lru_cache(maxsize=65536)
+def _since_epoch_datetime(value: str, tz: dt.tzinfo | None) -> int:
+    """Return a BIRD timestamp with a date as seconds since the epoch."""
+    return int(_parse_since_datetime(value, tz).timestamp())
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_since_time(value: str) -> dt.time:
+    """Parse a BIRD timestamp without a date."""
+
+    try:
+        return dt.time.fromisoformat(value)
+    except ValueError as err:
+        raise BirdClientParseError(f"Failed to parse timestamp '{value}'") from err
+
+
+def _localize(value: dt.datetime, tz: dt.tzinfo | None) -> dt.datetime:
+    """Attach a timezone to a naive datetime, using the local timezone if none is given."""
+
+    if tz is None:
+        return value.astimezone()
+    return value.replace(tzinfo=tz)
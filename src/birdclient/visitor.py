@@ -0,0 +1,64 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Visitor receiving the parts of BIRD routes as they are parsed."""
+
+from typing import Any
+
+__all__ = ["RouteVisitor"]
+
+
+class RouteVisitor:
+    """
+    Base class for visitors receiving the parts of BIRD routes as they are parsed, see ``show_route_visit()``.
+
+    The methods do nothing, subclasses override the ones for the parts they need. Parts of the routes the visitor doesn't override
+    the method for are skipped by the parser without being converted, which makes visitors the cheapest way to pull a few fields
+    out of a large table.
+    """
+
+    def on_prefix(self, prefix: Any) -> None:  # noqa: ANN401
+        """Start of a prefix, the sources that follow belong to it."""
+
+    def on_source(self, protocol: str, since: Any, bestpath: bool, pref: int) -> None:  # noqa: ANN401,FBT001
+        """Start of a source of the current prefix, the fields, nexthops and attributes that follow belong to it."""
+
+    def on_field(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Other field of the current source, named as the key in the sources returned by ``show_route()``."""
+
+    def on_nexthop(
+        self,
+        gateway: Any,  # noqa: ANN401
+        interface: str,
+        mpls: str | None,
+        onlink: bool,  # noqa: FBT001
+        weight: int | None,
+    ) -> None:
+        """Nexthop of the current source, ``gateway`` is None for nexthops that are a device."""
+
+    def on_attribute(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Attribute of the current source, an attribute spanning multiple lines is passed once per line."""
+
+    def on_end(self) -> None:
+        """End of the routes, which isn't called if parsing them failed."""
@@ -0,0 +1,187 @@
+#
+# SPDX-License-Identifier: MIT
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""BIRD protocol change watcher."""
+
+import dataclasses
+import time
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import BirdClient
+
+__all__ = ["ProtocolEvent", "ProtocolWatcher"]
+
+
+# Summary fields we compare to detect protocol changes
+_SUMMARY_FIELDS = ("state", "since", "info")
+
+
+@dataclasses.dataclass(frozen=True)
+class ProtocolEvent:
+    """
+    Protocol change event.
+
+    The ``event`` is one of "added", "removed", "up", "down", "flap" when the protocol went down and came back to the same state
+    between polls, or "changed" for any other change in state or info.
+    """
+
+    name: str
+    event: str
+    old: dict[str, Any] | None
+    new: dict[str, Any] | None
+
+
+class ProtocolWatcher:
+    """
+    Protocol change watcher using two tier polling.
+
+    Each poll queries the cheap 'show protocols' summary and compares the state, since and info of each protocol with the
+    previous poll. Only the protocols that changed are queried in detail with 'show protocols all <name>', these queries are
+    pipelined over a single connection. On the first poll all protocols are new, so their details are queried at once with
+    'show protocols all'.
+    """
+
+    # Client we're polling with
+    _client: "BirdClient"
+    # Optional callback for each event
+    _callback: Callable[[ProtocolEvent], None] | None
+    # If we should retrieve details of changed protocols
+    _details: bool
+    # Protocol summaries from the last poll
+    _summaries: dict[str, dict[str, Any]] | None
+    # Last known protocols, with details if we retrieved them
+    _protocols: dict[str, dict[str, Any]]
+
+    def __init__(
+        self,
+        client: "BirdClient",
+        *,
+        callback: Callable[[ProtocolEvent], None] | None = None,
+        details: bool = True,
+    ) -> None:
+        """Initialize the object."""
+
+        self._client = client
+        self._callback = callback
+        self._details = details
+        self._summaries = None
+        self._protocols = {}
+
+    @property
+    def protocols(self) -> dict[str, dict[str, Any]]:
+        """Return the last known protocols."""
+        return self._protocols
+
+    def poll(self) -> list[ProtocolEvent]:
+        """Poll BIRD for protocol changes and return the change events, the first poll returns no events."""
+
+        summaries = self._client.show_protocols(details=False)
+
+        # Work out which protocols are new or changed
+        changed = [name for name, summary in summaries.items() if self._summary_changed(name, summary)]
+
+        # Grab the details for those that changed
+        details: dict[str, dict[str, Any]] = {}
+        if self._details and changed and self._summaries is None:
+            # Every protocol is new on the first poll, a single query for all of them saves BIRD a query per protocol
+            details = {name: protocol for name, protocol in self._client.show_protocols(details=True).items() if name in summaries}
+        elif self._details and changed:
+            replies = self._client.query_many([["show", "protocols", "all", name] for name in changed])
+            for name, reply in zip(changed, replies, strict=True):
+                protocol = self._client.show_protocols(data=reply).get(name)
+                if protocol:
+                    details[name] = protocol
+
+        events = self.update(summaries, details)
+
+        if self._callback:
+            for event in events:
+                self._callback(event)
+
+        return events
+
+    def update(self, summaries: dict[str, dict[str, Any]], details: dict[str, dict[str, Any]]) -> list[ProtocolEvent]:
+        """Update our state from protocol summaries and the details of changed protocols, returning the change events."""
+
+        first_poll = self._summaries is None
+        events = []
+
+        for name, summary in summaries.items():
+            if not self._summary_changed(name, summary):
+                continue
+            new = details.get(name, summary)
+            old = self._protocols.get(name)
+            self._protocols[name] = new
+            if first_poll:
+                continue
+            # Classify using the summaries, as the state in the details can be overridden by channel states
+            event = self._classify(self._summaries.get(name) if self._summaries else None, summary)
+            events.append(ProtocolEvent(name=name, event=event, old=old, new=new))
+
+        # Check for protocols that were removed
+        for name in [x for x in self._protocols if x not in summaries]:
+            old = self._protocols.pop(name)
+            if not first_poll:
+                events.append(ProtocolEvent(name=name, event="removed", old=old, new=None))
+
+        self._summaries = summaries
+
+        return events
+
+    def watch(self, interval: float = 5.0) -> Iterator[ProtocolEvent]:  # pragma: no cover
+        """Poll BIRD every ``interval`` seconds, yielding change events as they happen."""
+
+        while True:
+            started = time.monotonic()
+            yield from self.poll()
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def _summary_changed(self, name: str, summary: dict[str, Any]) -> bool:
+        """Return True if a protocol summary is new or differs from the last poll."""
+
+        if self._summaries is None:
+            return True
+        old = self._summaries.get(name)
+        if old is None:
+            return True
+        return any(old.get(field) != summary.get(field) for field in _SUMMARY_FIELDS)
+
+    @staticmethod
+    def _classify(old: dict[str, Any] | None, new: dict[str, Any]) -> str:
+        """Classify a protocol change."""
+
+        if old is None:
+            return "added"
+        if old["state"] != new["state"]:
+            if new["state"] == "up":
+                return "up"
+            if old["state"] == "up":
+                return "down"
+            return "changed"
+        # Same state, but it changed since the last poll, so it must have gone through another state in between
+        if old["since"] != new["since"]:
+            return "flap"
+        return "changed"
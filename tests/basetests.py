@@ -21,10 +21,23 @@
 
 """Test base class for BirdClient."""
 
+import ipaddress
 import os.path
-from typing import List
+import re
+from typing import Iterable, List
 
-__all__ = ["BirdClientTestBaseCase"]
+from birdclient import BirdConnection
+
+__all__ = ["BirdClientTestBaseCase", "FakeBirdRoutes"]
+
+
+# Reply sent by BIRD for commands it doesn't understand
+SYNTAX_ERROR = ["9001 syntax error, unexpected CF_SYM_UNDEFINED"]
+# Reply sent by BIRD for lookups which don't match any network
+NOT_FOUND = ["8001 Network not found"]
+
+# First line of a network in 'show route' output
+_NETWORK_MATCH = re.compile(r"^(?:1007-| )(?P<prefix>\S+/\d+)\s")
 
 
 class BirdClientTestBaseCase:
@@ -36,3 +49,124 @@ class BirdClientTestBaseCase:
         with open(f"{testdir}/{filename}", "r", encoding="UTF-8") as datafile:
             data = datafile.read()
         return data.splitlines()
+
+
+class FakeBirdRoutes:
+    """
+    Replies to route queries for a table, in place of the BIRD daemon.
+
+    The table is loaded from 'show route all' output. Queries of the form
+    'show route table <table> [in <prefix> | for <address> | <prefix>] <all | count | stats>' are answered, lookups of a prefix or
+    address which don't match any network get the BIRD "Network not found" error.
+    """
+
+    def __init__(self, table: str, lines: Iterable[str]) -> None:
+        """Initialize the object."""
+
+        self.table = table
+        # Queries answered, in order
+        self.queries = []
+        # Lines of each network and the number of routes it has, by network
+        self._networks = {}
+
+        network = None
+        for line in lines:
+            if line.startswith(("0001 ", "0000", "1007-Table ")):
+                continue
+            match = _NETWORK_MATCH.match(line)
+            if match:
+                network = ipaddress.ip_network(match.group("prefix"))
+                # We always start a network with the reply code, as it may not be the first line of our reply
+                self._networks[network] = ([f"1007-{line[5:] if line.startswith('1007-') else line[1:]}"], 1)
+            elif network is not None:
+                network_lines, routes = self._networks[network]
+                # Routes after the first one for a network start with a code and no prefix
+                if line.startswith("1007-"):
+                    routes += 1
+                network_lines.append(line)
+                self._networks[network] = (network_lines, routes)
+
+    def __call__(self, query: str) -> List[str]:
+        """Return the reply to a query."""
+
+        self.queries.append(query)
+
+        words = query.split()
+        if words[:4] != ["show", "route", "table", self.table] or len(words) not in (5, 6, 7):
+            return SYNTAX_ERROR
+        selector, output = words[4:-1], words[-1]
+        if output not in ("all", "count", "stats"):
+            return SYNTAX_ERROR
+
+        if not selector:
+            networks = list(self._networks)
+        elif selector[0] == "in" and len(selector) == 2:
+            within = ipaddress.ip_network(selector[1])
+            networks = [x for x in self._networks if x.version == within.version and x.subnet_of(within)]
+        elif selector[0] == "for" and len(selector) == 2:
+            address = ipaddress.ip_address(selector[1])
+            matches = [x for x in self._networks if x.version == address.version and address in x]
+            if not matches:
+                return NOT_FOUND
+            networks = [max(matches, key=lambda x: x.prefixlen)]
+        elif len(selector) == 1:
+            network = ipaddress.ip_network(selector[0])
+            if network not in self._networks:
+                return NOT_FOUND
+            networks = [network]
+        else:
+            return SYNTAX_ERROR
+
+        routes = sum(self._networks[x][1] for x in networks)
+        summary = f"1007-{routes} of {routes} routes for {len(networks)} networks in table {self.table}"
+        if output == "count":
+            return [summary, "0000 "]
+
+        reply = [f"1007-Table {self.table}:"]
+        for network in networks:
+            reply.extend(self._networks[network][0])
+        if output == "stats":
+            reply.append(summary)
+        reply.append("0000 ")
+        return reply
+
+    def patch(self, monkeypatch) -> None:
+        """Answer the queries sent over BIRD connections ourselves, instead of connecting to the BIRD socket."""
+
+        def open_connection(conn) -> None:
+            if conn.is_open:
+                return
+            conn._sock = _FakeBirdSocket(self)  # pylint: disable=protected-access
+            conn._buffer.clear()  # pylint: disable=protected-access
+            conn._greeting = conn.read_reply_lines()  # pylint: disable=protected-access
+
+        monkeypatch.setattr(BirdConnection, "open", open_connection)
+
+
+class _FakeBirdSocket:
+    """Socket connected to our fake BIRD, sending the greeting and the replies to the queries sent over it."""
+
+    def __init__(self, replies) -> None:
+        """Initialize the object."""
+
+        self._replies = replies
+        self._pending = bytearray(b"0001 BIRD 2.0.4 ready.\n")
+
+    def sendall(self, data: bytes) -> None:
+        """Queue the replies to the queries sent."""
+
+        for query in data.decode("UTF-8").splitlines():
+            self._pending.extend("".join(f"{line}\n" for line in self._replies(query)).encode("UTF-8"))
+
+    def recv(self, size: int) -> bytes:
+        """Return the next chunk of the replies."""
+
+        chunk = bytes(self._pending[:size])
+        del self._pending[:size]
+        return chunk
+
+    def shutdown(self, how: int) -> None:
+        """Shut down the socket."""
+
+    def close(self) -> None:
+        """Close the socket."""
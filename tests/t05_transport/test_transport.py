@@ -0,0 +1,328 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""End to end tests of the BIRD control socket transport using a fake BIRD server."""
+
+import logging
+import pathlib
+import time
+
+import pytest
+
+from benchmarks.fakebird import FakeBirdServer
+from benchmarks.synthetic import BirdOutputGenerator
+from birdclient import BirdClient, BirdClientError, BirdConnection, BirdConnectionPool
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestTransport"]
+
+
+class TestTransport(BirdClientTestBaseCase):
+    """Test the BIRD control socket transport."""
+
+    def _replies(self, testpath: str) -> dict[str, list[str] | None]:
+        """Return the replies for our fake BIRD server."""
+
+        return {
+            "show status": self.load_test_data(testpath, "test_transport_status.txt"),
+            "show protocols all": self.load_test_data(testpath, "test_transport_protocols.txt"),
+            "show route table t_bgp4 all": self.load_test_data(testpath, "test_transport_routes.txt"),
+            "show route table master4 count": ["1007-12 of 12 routes for 10 networks in table master4", "0000 "],
+            "show route table missing count": ["8001 Table 'missing' not found"],
+            "show hang": None,
+        }
+
+    @pytest.mark.parametrize(("chunk_size", "slow_start"), [(1, 0), (7, 0), (65536, 0), (4096, 1)])
+    def test_transport_chunks(self, testpath: str, chunk_size: int, slow_start: int) -> None:
+        """Test replies are received correctly however they are split up."""
+
+        expected = BirdClient().show_route_table("t_bgp4", data=self.load_test_data(testpath, "test_transport_routes.txt"))
+
+        with FakeBirdServer(self._replies(testpath), chunk_size=chunk_size, slow_start=slow_start) as server:
+            birdclient = BirdClient(server.path)
+            assert birdclient.show_route_table("t_bgp4") == expected
+            assert birdclient.show_status()["router_id"] == "172.16.10.1"
+
+    def test_transport_greeting(self, testpath: str) -> None:
+        """Test the greeting is read on connect and prefixed to replies."""
+
+        with FakeBirdServer(self._replies(testpath), version="3.0.1") as server, BirdConnection(server.path) as conn:
+            assert conn.greeting == ["0001 BIRD 3.0.1 ready."]
+            assert conn.query("show route table master4 count") == [
+                "0001 BIRD 3.0.1 ready.",
+                "1007-12 of 12 routes for 10 networks in table master4",
+                "0000 ",
+            ]
+
+    def test_transport_persistent(self, testpath: str) -> None:
+        """Test a number of queries over a persistent connection."""
+
+        with FakeBirdServer(self._replies(testpath), chunk_size=100) as server, BirdConnection(server.path) as conn:
+            for _ in range(3):
+                assert conn.query(["show", "status"])[-1] == "0013 Daemon is up and running"
+                assert conn.query(["show", "route", "table", "master4", "count"])[-1] == "0000 "
+
+            assert server.connections == 1
+            assert len(server.queries) == 6
+
+    def test_transport_pipelined(self, testpath: str) -> None:
+        """Test pipelined queries are answered in order."""
+
+        queries = ["show status", "show route table master4 count", "show protocols all", "show route table missing count"] * 5
+
+        with FakeBirdServer(self._replies(testpath), chunk_size=512) as server:
+            birdclient = BirdClient(server.path)
+            replies = birdclient.query_many(queries)
+
+            assert server.queries == queries
+            assert server.connections == 1
+            assert [reply[-1] for reply in replies[:4]] == [
+                "0013 Daemon is up and running",
+                "0000 ",
+                "0000 ",
+                "8001 Table 'missing' not found",
+            ]
+            assert replies[4:8] == replies[:4]
+
+            with BirdConnection(server.path) as conn:
+                assert conn.query_pipelined(queries, window=3) == replies
+
+    def test_transport_streaming(self, testpath: str) -> None:
+        """Test routes are parsed as they are received."""
+
+        data = list(BirdOutputGenerator().routes(2000))
+
+        with FakeBirdServer({"show route table t_bgp4 all": data}, chunk_size=8192) as server:
+            birdclient = BirdClient(server.path)
+            routes = birdclient.show_route_table_iter("t_bgp4")
+            prefix, _ = next(routes)
+            assert prefix == data[2].split()[0]
+            assert len(list(routes)) == 1999
+
+    def test_transport_error_codes(self, testpath: str) -> None:
+        """Test BIRD error replies are raised."""
+
+        with FakeBirdServer(self._replies(testpath)) as server:
+            birdclient = BirdClient(server.path)
+            with pytest.raises(BirdClientError, match="Table 'missing' not found"):
+                birdclient.show_route_count(["table", "missing"])
+            # Unknown commands get a syntax error
+            with pytest.raises(BirdClientError, match="syntax error"):
+                birdclient.show_route_count(["unknown"])
+
+    def test_transport_timeout(self, testpath: str) -> None:
+        """Test a query which is never answered times out."""
+
+        with FakeBirdServer(self._replies(testpath)) as server, BirdConnection(server.path, timeout=0.2) as conn:
+            with pytest.raises(BirdClientError, match="Timeout waiting for reply from BIRD"):
+                conn.query("show hang")
+            assert not conn.is_open
+
+    def test_transport_disconnect(self, testpath: str) -> None:
+        """Test the connection closing part way through a reply."""
+
+        with FakeBirdServer(self._replies(testpath), chunk_size=64, disconnect_after=200) as server:
+            birdclient = BirdClient(server.path)
+            with pytest.raises(BirdClientError, match="BIRD closed the connection before the reply was complete"):
+                birdclient.show_route_table("t_bgp4")
+
+    def test_transport_not_running(self, testpath: str) -> None:
+        """Test connecting to a socket nobody is listening on."""
+
+        with FakeBirdServer(self._replies(testpath)) as server:
+            path = server.path
+            conn = BirdConnection(path)
+            server.stop()
+            with pytest.raises(BirdClientError, match="Failed to connect to BIRD socket"):
+                conn.open()
+
+    def test_transport_pool(self, testpath: str) -> None:
+        """Test connections are reused by the pool."""
+
+        with FakeBirdServer(self._replies(testpath)) as server, BirdConnectionPool(server.path, size=2) as pool:
+            for _ in range(3):
+                with pool.connection() as conn:
+                    assert conn.query("show status")[-1] == "0013 Daemon is up and running"
+            # A connection which failed is not returned to the pool
+            with pytest.raises(RuntimeError), pool.connection() as conn:
+                raise RuntimeError
+            with pool.connection() as conn:
+                conn.send("show status")
+
+            assert server.connections == 2
+
+    def test_transport_route_counts(self, testpath: str) -> None:
+        """Test route counts for a number of tables over one connection."""
+
+        with FakeBirdServer(self._replies(testpath)) as server:
+            birdclient = BirdClient(server.path)
+            result = birdclient.show_route_counts(["master4"])
+
+            assert result["tables"]["master4"]["total"]["routes"] == 12
+            assert server.connections == 1
+
+    def test_transport_debug(self, testpath: str, caplog: pytest.LogCaptureFixture) -> None:
+        """Test the BIRD replies are logged in debug mode."""
+
+        caplog.set_level(logging.DEBUG, logger="birdclient")
+        with FakeBirdServer(self._replies(testpath)) as server:
+            birdclient = BirdClient(server.path, debug=True)
+            birdclient.show_status()
+            birdclient.show_protocols()
+            birdclient.query_many(["show status"])
+
+        replies = [record.getMessage() for record in caplog.records if record.name == "birdclient"]
+        assert len(replies) == 3
+        assert all("\n0001 BIRD 2.15.1 ready.\n" in reply for reply in replies)
+        assert "0013 Daemon is up and running" in replies[0]
+        assert "bgp_AS65000_as65000" in replies[1]
+        # Only the start of long replies is logged
+        assert replies[1].count("\n") == 21
+        assert " more lines" in replies[1]
+
+    def test_transport_debug_query_generator(self, testpath: str, caplog: pytest.LogCaptureFixture) -> None:
+        """Test the replies to pipelined queries given as a generator are logged."""
+
+        caplog.set_level(logging.DEBUG, logger="birdclient")
+        with FakeBirdServer(self._replies(testpath)) as server:
+            birdclient = BirdClient(server.path, debug=True)
+            replies = birdclient.query_many(query for query in ["show status", "show route table master4 count"])
+
+        assert [reply[-1] for reply in replies] == ["0013 Daemon is up and running", "0000 "]
+        logged = [record.getMessage() for record in caplog.records if record.name == "birdclient"]
+        assert len(logged) == 2
+        assert logged[1].startswith("BIRD reply to 'show route table master4 count', 3 lines:")
+
+    def test_transport_debug_sample(self, testpath: str, caplog: pytest.LogCaptureFixture) -> None:
+        """Test only a sample of the BIRD replies is logged."""
+
+        caplog.set_level(logging.DEBUG, logger="birdclient")
+        with FakeBirdServer(self._replies(testpath)) as server:
+            birdclient = BirdClient(server.path, debug=True, debug_sample=2)
+            for _ in range(4):
+                birdclient.show_status()
+
+        replies = [record for record in caplog.records if record.name == "birdclient"]
+        assert len(replies) == 2
+
+    def test_transport_debug_disabled(self, testpath: str, caplog: pytest.LogCaptureFixture) -> None:
+        """Test nothing is logged without debug mode."""
+
+        caplog.set_level(logging.DEBUG, logger="birdclient")
+        with FakeBirdServer(self._replies(testpath)) as server:
+            BirdClient(server.path).show_status()
+
+        assert not [record for record in caplog.records if record.name == "birdclient"]
+
+    def test_transport_capture(self, testpath: str, tmp_path: pathlib.Path) -> None:
+        """Test the raw data received from BIRD is captured."""
+
+        capture = tmp_path / "capture.raw"
+        with FakeBirdServer(self._replies(testpath)) as server:
+            birdclient = BirdClient(server.path, capture=capture)
+            birdclient.show_status()
+            birdclient.show_route_table("t_bgp4")
+            birdclient.close()
+
+        # The fake server replaces the greeting in our test data with its own
+        status = self.load_test_data(testpath, "test_transport_status.txt")[1:]
+        routes = self.load_test_data(testpath, "test_transport_routes.txt")[1:]
+        greeting = "0001 BIRD 2.15.1 ready.\n"
+        expected = greeting + "\n".join(status) + "\n" + greeting + "\n".join(routes) + "\n"
+        assert capture.read_bytes() == expected.encode()
+
+    def test_transport_limit(self, testpath: str) -> None:
+        """Test a limited number of routes are returned and BIRD is stopped once we have them."""
+
+        data = list(BirdOutputGenerator().routes(2000))
+        expected = list(BirdClient().show_route(data=data))[:5]
+
+        with FakeBirdServer(self._replies(testpath) | {"show route table t_bgp4 all": data}, chunk_size=8192) as server:
+            birdclient = BirdClient(server.path)
+            assert list(birdclient.show_route_table("t_bgp4", limit=5)) == expected
+            assert [prefix for prefix, _ in birdclient.show_route_table_iter("t_bgp4", limit=5)] == expected
+            assert birdclient.show_route_table("t_bgp4", limit=0) == {}
+            # Stopping part way through without a limit
+            routes = birdclient.show_route_table_iter("t_bgp4")
+            assert next(routes)[0] == expected[0]
+            routes.close()
+
+            # The server sees the connection closed part way through each reply it started sending
+            for _ in range(100):
+                if server.aborted == 3:
+                    break
+                time.sleep(0.05)
+            assert server.aborted == 3
+            assert len(server.queries) == 3
+            assert birdclient.show_status()["router_id"] == "172.16.10.1"
+
+    def test_transport_discard(self, testpath: str) -> None:
+        """Test the rest of a reply which is not read is discarded, leaving a persistent connection usable."""
+
+        data = list(BirdOutputGenerator().routes(200))
+
+        with FakeBirdServer(self._replies(testpath) | {"show route all": data}, chunk_size=1024) as server:
+            with BirdConnection(server.path) as conn:
+                for _ in range(2):
+                    conn.send("show route all")
+                    reply = conn.iter_reply()
+                    assert next(reply)[0].startswith("1007-")
+                    reply.close()
+                    assert conn.query("show status")[-1] == "0013 Daemon is up and running"
+                assert server.connections == 1
+
+            # Replies longer than the drain limit close the connection instead
+            with BirdConnection(server.path, drain_limit=0) as conn:
+                conn.send("show route all")
+                reply = conn.iter_reply()
+                next(reply)
+                reply.close()
+                assert not conn.is_open
+
+    @pytest.mark.parametrize("read_ahead", [1, 4])
+    def test_transport_read_ahead(self, testpath: str, read_ahead: int) -> None:
+        """Test replies received by a reader thread ahead of the parser."""
+
+        data = list(BirdOutputGenerator().routes(2000))
+        expected = BirdClient().show_route(data=data)
+        replies = self._replies(testpath) | {"show route table t_bgp4 all": data}
+
+        with FakeBirdServer(replies, chunk_size=4096) as server:
+            birdclient = BirdClient(server.path, read_ahead=read_ahead)
+            assert birdclient.show_route_table("t_bgp4") == expected
+            assert list(birdclient.show_route_table("t_bgp4", limit=3)) == list(expected)[:3]
+            assert birdclient.show_status()["router_id"] == "172.16.10.1"
+
+            # Stopping part way through a reply over a persistent connection
+            with BirdConnection(server.path) as conn:
+                conn.send("show route table t_bgp4 all")
+                reply = conn.iter_reply(read_ahead)
+                assert next(reply)[0].startswith("1007-")
+                reply.close()
+                assert conn.query("show status")[-1] == "0013 Daemon is up and running"
+
+        # Errors hit by the reader are raised in the parser
+        with FakeBirdServer(replies, chunk_size=64, disconnect_after=20000) as server:
+            birdclient = BirdClient(server.path, read_ahead=read_ahead)
+            with pytest.raises(BirdClientError, match="BIRD closed the connection before the reply was complete"):
+                birdclient.show_route_table("t_bgp4")
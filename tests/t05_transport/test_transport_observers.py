@@ -0,0 +1,144 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for query timing observers."""
+
+import pytest
+
+from benchmarks.fakebird import FakeBirdServer
+from birdclient import BirdClient, BirdClientError, QueryTiming, TimingAggregator
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestTransportObservers"]
+
+
+class TestTransportObservers(BirdClientTestBaseCase):
+    """Test query timing observers."""
+
+    def _replies(self, testpath: str) -> dict[str, list[str]]:
+        """Return the replies for our fake BIRD server."""
+
+        return {
+            "show route table t_bgp4 all": self.load_test_data(testpath, "test_transport_routes.txt"),
+            "show route table missing count": ["8001 Table 'missing' not found"],
+        }
+
+    def test_observer_timing(self, testpath: str) -> None:
+        """Test the timing breakdown of a query."""
+
+        data = self.load_test_data(testpath, "test_transport_routes.txt")
+        timings = []
+
+        with FakeBirdServer(self._replies(testpath), chunk_size=1024, delay=0.01) as server:
+            birdclient = BirdClient(server.path, observers=[timings.append])
+            result = birdclient.show_route_table("t_bgp4")
+
+        # Only the outer call is reported
+        assert len(timings) == 1
+        timing = timings[0]
+        assert timing.command == "show_route_table"
+        assert timing.error is None
+        assert timing.result_size == len(result)
+        # The greeting is not counted as part of the reply
+        assert timing.lines == len(data) - 1
+        assert timing.bytes_received == sum(len(line) + 1 for line in data[1:])
+        assert timing.connect > 0
+        assert 0 < timing.first_byte < timing.last_byte
+        assert timing.transfer == timing.last_byte - timing.first_byte
+        assert timing.wait >= timing.transfer
+        assert timing.total >= timing.connect + timing.send + timing.wait + timing.decode + timing.parse - 1e-6
+
+    def test_observer_iter(self, testpath: str) -> None:
+        """Test calls returning iterators are reported once the iterator is done."""
+
+        timings = []
+
+        with FakeBirdServer(self._replies(testpath)) as server:
+            birdclient = BirdClient(server.path)
+            birdclient.add_observer(timings.append)
+            routes = birdclient.show_route_table_iter("t_bgp4")
+            next(routes)
+            assert timings == []
+            count = 1 + len(list(routes))
+
+            # Stopping early still reports the call
+            routes = birdclient.show_route_table_iter("t_bgp4")
+            next(routes)
+            routes.close()
+
+        assert [timing.command for timing in timings] == ["show_route_table_iter", "show_route_table_iter"]
+        assert timings[0].result_size == count
+        assert timings[0].bytes_received > 0
+        assert timings[1].result_size == 1
+
+    def test_observer_error(self, testpath: str) -> None:
+        """Test errors are reported."""
+
+        timings = []
+
+        with FakeBirdServer(self._replies(testpath)) as server:
+            birdclient = BirdClient(server.path, observers=[timings.append])
+            with pytest.raises(BirdClientError):
+                birdclient.show_route_count(["table", "missing"])
+
+        assert timings[0].command == "show_route_count"
+        assert timings[0].error == "BIRD client error: Table 'missing' not found"
+
+    def test_observer_parse_only(self, testpath: str) -> None:
+        """Test parsing data we were given is reported with no transport timing, and removing observers."""
+
+        timings = []
+        birdclient = BirdClient(observers=[timings.append])
+        birdclient.show_route_table("t_bgp4", data=self.load_test_data(testpath, "test_transport_routes.txt"))
+        birdclient.remove_observer(timings.append)
+        birdclient.show_route_table("t_bgp4", data=self.load_test_data(testpath, "test_transport_routes.txt"))
+
+        assert len(timings) == 1
+        assert timings[0].bytes_received == 0
+        assert timings[0].parse == timings[0].total > 0
+
+    def test_timing_aggregator(self) -> None:
+        """Test the latency histograms kept by the aggregator."""
+
+        aggregator = TimingAggregator(buckets=(0.1, 0.01, 1.0))
+        for total in (0.005, 0.05, 0.05, 0.5, 5.0):
+            aggregator(QueryTiming("show_status", total=total, first_byte=total / 2))
+        aggregator(QueryTiming("show_route", total=0.2, error="BIRD client error"))
+
+        snapshot = aggregator.snapshot()
+
+        assert aggregator.commands == ["show_route", "show_status"]
+        assert snapshot["show_status"]["errors"] == 0
+        assert snapshot["show_route"]["errors"] == 1
+        assert snapshot["show_status"]["total"] == {
+            "count": 5,
+            "sum": pytest.approx(5.605),
+            "buckets": [(0.01, 1), (0.1, 3), (1.0, 4), (float("inf"), 5)],
+        }
+        assert snapshot["show_status"]["first_byte"]["buckets"][:2] == [(0.01, 1), (0.1, 3)]
+        assert aggregator.quantile("show_status", 0.5) == pytest.approx(0.01 + 0.09 * 1.5 / 2)
+        assert aggregator.quantile("show_status", 1.0) == 1.0
+        assert aggregator.quantile("show_bgp", 0.5) is None
+
+        aggregator.reset()
+        assert aggregator.snapshot() == {}
@@ -0,0 +1,60 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+"""Tests for the Python BirdClient class."""
+
+import ipaddress
+
+from birdclient import BirdClient
+
+from ...basetests import BirdClientTestBaseCase
+
+__all__ = ["TestBirdClientShowTBGP4AddressFormat"]
+
+
+class TestBirdClientShowTBGP4AddressFormat(BirdClientTestBaseCase):
+    """Test the BirdClient class."""
+
+    def test_show_t_bgp4_int(self, testpath: str) -> None:
+        """Test show t_bgp4 table with integer encoded prefixes and addresses."""
+
+        birdclient = BirdClient(address_format="int")
+        result = birdclient.show_route_table("t_bgp4", self.load_test_data(testpath, "test_show_t_bgp4.txt"))
+
+        assert sorted(result) == [(0x64640000, 24, 4), (0x64C90000, 24, 4)], "Prefixes are not integer encoded"
+
+        source = result[(0x64C90000, 24, 4)][0]
+        assert source["from"] == (0x64400A03, 4), "The 'from' address is not integer encoded"
+        assert source["nexthops"][0]["gateway"] == (0x64401401, 4), "The gateway is not integer encoded"
+        assert source["attributes"]["BGP.next_hop"] == [(0x6440280B, 4)], "The BGP next hop is not integer encoded"
+
+    def test_show_t_bgp4_ipaddress(self, testpath: str) -> None:
+        """Test show t_bgp4 table with ipaddress objects for prefixes and addresses."""
+
+        birdclient = BirdClient(address_format="ipaddress")
+        result = birdclient.show_route_table("t_bgp4", self.load_test_data(testpath, "test_show_t_bgp4.txt"))
+
+        assert sorted(result) == [ipaddress.ip_network("100.100.0.0/24"), ipaddress.ip_network("100.201.0.0/24")]
+
+        source = result[ipaddress.ip_network("100.201.0.0/24")][1]
+        assert source["from"] == ipaddress.ip_address("100.64.20.3"), "The 'from' address is not an ipaddress object"
+        assert source["nexthops"][0]["gateway"] == ipaddress.ip_address("100.64.20.1"), "The gateway is not an ipaddress object"
+        assert source["attributes"]["BGP.next_hop"] == [ipaddress.ip_address("100.64.43.2")]
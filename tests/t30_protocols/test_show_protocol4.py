@@ -59,6 +59,53 @@ class TestBirdClientShowProtocol4(BirdClientTestBaseCase):
             "routes_imported": 70,
             "state": "up",
             "table": "t_bgp4_AS65000_as65000_peer",
+            "channels": {
+                "ipv4": {
+                    "name": "ipv4",
+                    "state": "up",
+                    "table": "t_bgp4_AS65000_as65000_peer",
+                    "preference": 100,
+                    "input_filter": "f_bgp_AS65000_as65000_peer_import",
+                    "output_filter": "f_bgp_AS65000_as65000_peer_export",
+                    "import_limit": 400,
+                    "import_limit_action": "restart",
+                    "routes_imported": 70,
+                    "routes_exported": 24,
+                    "routes_preferred": 70,
+                    "route_change_stats": {
+                        "import_updates": {
+                            "received": 77,
+                            "rejected": 0,
+                            "filtered": 0,
+                            "ignored": 0,
+                            "accepted": 77,
+                        },
+                        "import_withdraws": {
+                            "received": 7,
+                            "rejected": 0,
+                            "filtered": None,
+                            "ignored": 0,
+                            "accepted": 7,
+                        },
+                        "export_updates": {
+                            "received": 106,
+                            "rejected": 77,
+                            "filtered": 0,
+                            "ignored": None,
+                            "accepted": 29,
+                        },
+                        "export_withdraws": {
+                            "received": 7,
+                            "rejected": None,
+                            "filtered": None,
+                            "ignored": None,
+                            "accepted": 0,
+                        },
+                    },
+                    "bgp_nexthop": "100.64.20.2",
+                    "igp_table": "master4",
+                },
+            },
         }
 
         assert result == correct_result, "The show_protocol4() result does not match what it should be"
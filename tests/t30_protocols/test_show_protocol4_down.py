@@ -56,6 +56,19 @@ class TestBirdClientShowProtocol4Down(BirdClientTestBaseCase):
             "since": "2023-12-06 14:26:45",
             "state": "down",
             "table": "t_bgp4_AS65000_as65000a_peer",
+            "channels": {
+                "ipv4": {
+                    "name": "ipv4",
+                    "state": "down",
+                    "table": "t_bgp4_AS65000_as65000a_peer",
+                    "preference": 100,
+                    "input_filter": "f_bgp_AS65000_as65000a_peer_import",
+                    "output_filter": "f_bgp_AS65000_as65000a_peer_export",
+                    "import_limit": 30,
+                    "import_limit_action": "restart",
+                    "igp_table": "master4",
+                },
+            },
         }
 
         assert result == correct_result, "The show_protocol4_down() result does not match what it should be"
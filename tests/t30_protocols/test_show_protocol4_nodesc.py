@@ -0,0 +1,74 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+"""Tests for the Python BirdClient class."""
+
+from birdclient import BirdClient
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestBirdClientShowProtocol4NoDesc"]
+
+
+class TestBirdClientShowProtocol4NoDesc(BirdClientTestBaseCase):
+    """Test the BirdClient class."""
+
+    def test_show_protocol4_nodesc(self, testpath: str) -> None:
+        """Test show protocol for IPv4 without a description, where the first detail line has a 1006 code."""
+
+        birdclient = BirdClient()
+        result = birdclient.show_protocol("bgp4_AS65000_as65000", self.load_test_data(testpath, "test_show_protocol4_nodesc.txt"))
+
+        correct_result = {
+            "channel": "ipv4",
+            "igp_table": "master4",
+            "info": "established",
+            "input_filter": "ACCEPT",
+            "local_as": 65001,
+            "name": "bgp4_AS65000_as65000",
+            "neighbor_address": "100.64.20.1",
+            "neighbor_as": 65000,
+            "output_filter": "REJECT",
+            "preference": 100,
+            "proto": "BGP",
+            "since": "2023-12-04 22:25:36",
+            "routes_exported": 24,
+            "routes_imported": 70,
+            "state": "up",
+            "table": "t_bgp4_AS65000_as65000_peer",
+            "channels": {
+                "ipv4": {
+                    "name": "ipv4",
+                    "state": "up",
+                    "table": "t_bgp4_AS65000_as65000_peer",
+                    "preference": 100,
+                    "input_filter": "ACCEPT",
+                    "output_filter": "REJECT",
+                    "routes_imported": 70,
+                    "routes_filtered": 3,
+                    "routes_exported": 24,
+                    "routes_preferred": 70,
+                    "igp_table": "master4",
+                },
+            },
+        }
+
+        assert result == correct_result, "The show_protocol() result does not match what it should be"
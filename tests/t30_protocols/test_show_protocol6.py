@@ -59,6 +59,53 @@ class TestBirdClientShowProtocol6(BirdClientTestBaseCase):
             "routes_imported": 14,
             "state": "up",
             "table": "t_bgp6_AS65000_as65000_peer",
+            "channels": {
+                "ipv6": {
+                    "name": "ipv6",
+                    "state": "up",
+                    "table": "t_bgp6_AS65000_as65000_peer",
+                    "preference": 100,
+                    "input_filter": "f_bgp_AS65000_as65000_peer_import",
+                    "output_filter": "f_bgp_AS65000_as65000_peer_export",
+                    "import_limit": 100,
+                    "import_limit_action": "restart",
+                    "routes_imported": 14,
+                    "routes_exported": 5,
+                    "routes_preferred": 14,
+                    "route_change_stats": {
+                        "import_updates": {
+                            "received": 15,
+                            "rejected": 0,
+                            "filtered": 0,
+                            "ignored": 0,
+                            "accepted": 15,
+                        },
+                        "import_withdraws": {
+                            "received": 1,
+                            "rejected": 0,
+                            "filtered": None,
+                            "ignored": 0,
+                            "accepted": 1,
+                        },
+                        "export_updates": {
+                            "received": 27,
+                            "rejected": 15,
+                            "filtered": 0,
+                            "ignored": None,
+                            "accepted": 12,
+                        },
+                        "export_withdraws": {
+                            "received": 5,
+                            "rejected": None,
+                            "filtered": None,
+                            "ignored": None,
+                            "accepted": 4,
+                        },
+                    },
+                    "bgp_nexthop": "fc20::2",
+                    "igp_table": "master6",
+                },
+            },
         }
 
         assert result == correct_result, "The show_protocol6() result does not match what it should be"
@@ -56,6 +56,19 @@ class TestBirdClientShowProtocol6Down(BirdClientTestBaseCase):
             "since": "2023-12-06 14:26:45",
             "state": "down",
             "table": "t_bgp6_AS65000_as65000a_peer",
+            "channels": {
+                "ipv6": {
+                    "name": "ipv6",
+                    "state": "down",
+                    "table": "t_bgp6_AS65000_as65000a_peer",
+                    "preference": 100,
+                    "input_filter": "f_bgp_AS65000_as65000a_peer_import",
+                    "output_filter": "f_bgp_AS65000_as65000a_peer_export",
+                    "import_limit": 10,
+                    "import_limit_action": "restart",
+                    "igp_table": "master6",
+                },
+            },
         }
 
         assert result == correct_result, "The show_protocol6_down() result does not match what it should be"
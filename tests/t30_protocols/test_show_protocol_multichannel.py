@@ -0,0 +1,91 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+"""Tests for the Python BirdClient class."""
+
+from birdclient import BirdClient
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestBirdClientShowProtocolMultiChannel"]
+
+
+class TestBirdClientShowProtocolMultiChannel(BirdClientTestBaseCase):
+    """Test the BirdClient class."""
+
+    def test_show_protocol_multichannel(self, testpath: str) -> None:
+        """Test show protocol with an IPv4 and IPv6 channel."""
+
+        birdclient = BirdClient()
+        result = birdclient.show_protocol(
+            "bgp_AS65000_as65000", self.load_test_data(testpath, "test_show_protocol_multichannel.txt")
+        )
+
+        correct_channels = {
+            "ipv4": {
+                "name": "ipv4",
+                "state": "up",
+                "table": "t_bgp4_AS65000_as65000_peer",
+                "preference": 100,
+                "input_filter": "f_import4",
+                "output_filter": "f_export4",
+                "receive_limit": 1000,
+                "receive_limit_action": "block",
+                "import_limit": 400,
+                "import_limit_action": "restart",
+                "routes_imported": 70,
+                "routes_filtered": 2,
+                "routes_exported": 24,
+                "routes_preferred": 68,
+                "route_change_stats": {
+                    "import_updates": {"received": 77, "rejected": 0, "filtered": 2, "ignored": 0, "accepted": 75},
+                    "import_withdraws": {"received": 7, "rejected": 0, "filtered": None, "ignored": 0, "accepted": 7},
+                    "export_updates": {"received": 106, "rejected": 77, "filtered": 0, "ignored": None, "accepted": 29},
+                    "export_withdraws": {"received": 7, "rejected": None, "filtered": None, "ignored": None, "accepted": 0},
+                },
+                "bgp_nexthop": "100.64.20.2",
+                "igp_table": "master4",
+            },
+            "ipv6": {
+                "name": "ipv6",
+                "state": "up",
+                "table": "t_bgp6_AS65000_as65000_peer",
+                "preference": 100,
+                "input_filter": "f_import6",
+                "output_filter": "f_export6",
+                "routes_imported": 14,
+                "routes_exported": 5,
+                "routes_preferred": 14,
+                "route_change_stats": {
+                    "import_updates": {"received": 15, "rejected": 0, "filtered": 0, "ignored": 0, "accepted": 15},
+                    "import_withdraws": {"received": 1, "rejected": 0, "filtered": None, "ignored": 0, "accepted": 1},
+                    "export_updates": {"received": 27, "rejected": 15, "filtered": 0, "ignored": None, "accepted": 12},
+                    "export_withdraws": {"received": 5, "rejected": None, "filtered": None, "ignored": None, "accepted": 4},
+                },
+                "bgp_nexthop": "fc20::2",
+                "igp_table": "master6",
+            },
+        }
+
+        assert result["channels"] == correct_channels, "The show_protocol() channels do not match what they should be"
+        # The flat fields keep the values of the last channel
+        assert result["channel"] == "ipv6", "The show_protocol() channel does not match what it should be"
+        assert result["routes_imported"] == 14, "The show_protocol() routes_imported does not match what it should be"
@@ -0,0 +1,64 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for the Python BirdClient class."""
+
+from birdclient import BirdClient
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestBirdClientShowProtocolsIter"]
+
+
+class TestBirdClientShowProtocolsIter(BirdClientTestBaseCase):
+    """Test the BirdClient class."""
+
+    def test_show_protocols_iter(self, testpath: str) -> None:
+        """Test show_protocols_iter yields the same protocols as show_protocols."""
+
+        birdclient = BirdClient()
+        data = self.load_test_data(testpath, "test_show_protocol_multichannel.txt")
+
+        protocols = list(birdclient.show_protocols_iter(data=data))
+
+        assert {protocol["name"]: protocol for protocol in protocols} == birdclient.show_protocols(data=data)
+
+    def test_show_protocols_iter_streaming(self, testpath: str) -> None:
+        """Test show_protocols_iter yields each protocol before reading the rest of the reply."""
+
+        birdclient = BirdClient()
+        data = self.load_test_data(testpath, "test_show_protocols.txt")
+        consumed = []
+
+        def lines():
+            for line in data:
+                consumed.append(line)
+                yield line
+
+        protocols = birdclient.show_protocols_iter(data=lines())
+
+        # The first protocol is complete as soon as the second protocol summary line is read
+        assert next(protocols)["name"] == "p_static4_to_kernel4"
+        assert consumed[-1].split()[0] == "p_static6_to_kernel6"
+
+        assert [protocol["name"] for protocol in protocols][-1] == "bgp6_AS65000_as65000b"
+        assert len(consumed) == len(data)
@@ -0,0 +1,52 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+"""Tests for the Python BirdClient class."""
+
+import datetime
+
+from birdclient import BirdClient
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestBirdClientShowProtocolsSince"]
+
+
+class TestBirdClientShowProtocolsSince(BirdClientTestBaseCase):
+    """Test the BirdClient class."""
+
+    def test_show_protocols_since_datetime(self, testpath: str) -> None:
+        """Test show_protocols returning 'since' as a datetime."""
+
+        birdclient = BirdClient(since_format="datetime", timezone=datetime.UTC)
+        result = birdclient.show_protocols(data=self.load_test_data(testpath, "test_show_protocols.txt"))
+
+        assert result["ospf4"]["since"] == datetime.datetime(2019, 9, 1, 13, 13, 28, tzinfo=datetime.UTC)
+        assert result["bgp6_AS65000_as65000b"]["since"] == datetime.datetime(2023, 12, 6, 14, 26, 45, tzinfo=datetime.UTC)
+
+    def test_show_protocols_since_epoch(self, testpath: str) -> None:
+        """Test show_protocols returning 'since' as an epoch timestamp."""
+
+        birdclient = BirdClient(since_format="epoch", timezone=datetime.UTC)
+        result = birdclient.show_protocols(data=self.load_test_data(testpath, "test_show_protocols.txt"))
+
+        assert result["ospf4"]["since"] == 1567343608
+        assert result["bgp6_AS65000_as65000b"]["since"] == 1701872805
@@ -0,0 +1,49 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+"""Tests for the Python BirdClient class."""
+
+from birdclient import BirdClient
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestBirdClientShowRouteCount"]
+
+
+class TestBirdClientShowRouteCount(BirdClientTestBaseCase):
+    """Test the BirdClient class."""
+
+    def test_show_route_count(self, testpath: str) -> None:
+        """Test show route count."""
+
+        birdclient = BirdClient()
+        result = birdclient.show_route_count(
+            args=["table", "master4"], data=self.load_test_data(testpath, "test_show_route_count.txt")
+        )
+
+        correct_result = {
+            "tables": {
+                "master4": {"routes": 12, "routes_total": 12, "networks": 10},
+            },
+            "total": {"routes": 12, "routes_total": 12, "networks": 10, "tables": 1},
+        }
+
+        assert result == correct_result, "The show_route_count() result does not match what it should be"
@@ -0,0 +1,59 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+"""Tests for the Python BirdClient class."""
+
+from benchmarks.fakebird import FakeBirdServer
+from birdclient import BirdClient
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestBirdClientShowRouteStats"]
+
+
+class TestBirdClientShowRouteStats(BirdClientTestBaseCase):
+    """Test the BirdClient class."""
+
+    correct_result = {
+        "tables": {
+            "t_static4": {"routes": 2, "routes_total": 2, "networks": 2},
+        },
+        "total": {"routes": 2, "routes_total": 2, "networks": 2, "tables": 1},
+    }
+
+    def test_show_route_stats(self, testpath: str) -> None:
+        """Test show route stats."""
+
+        birdclient = BirdClient()
+        result = birdclient.show_route_stats(
+            args=["table", "t_static4"], data=self.load_test_data(testpath, "test_show_route_stats.txt")
+        )
+
+        assert result == self.correct_result, "The show_route_stats() result does not match what it should be"
+
+    def test_show_route_stats_query(self, testpath: str) -> None:
+        """Test show route stats queried from BIRD."""
+
+        replies = {"show route table t_static4 stats": self.load_test_data(testpath, "test_show_route_stats.txt")}
+        with FakeBirdServer(replies) as server:
+            result = BirdClient(server.path).show_route_stats(args=["table", "t_static4"])
+
+        assert result == self.correct_result, "The show_route_stats() result does not match what it should be"
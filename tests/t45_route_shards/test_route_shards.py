@@ -0,0 +1,118 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for retrieving route tables in shards."""
+
+import pytest
+
+from birdclient import BirdClient, BirdClientError, RouteIndex, RouteStats
+
+from ..basetests import BirdClientTestBaseCase, FakeBirdRoutes
+
+__all__ = ["TestRouteShards"]
+
+
+class TestRouteShards(BirdClientTestBaseCase):
+    """Test retrieving route tables in shards."""
+
+    def _routes(self, testpath: str, table: str, monkeypatch) -> FakeBirdRoutes:
+        """Return the replies to route queries for a table, answering the queries of our BIRD connections."""
+
+        routes = FakeBirdRoutes(table, self.load_test_data(testpath, f"test_route_shards_{table}.txt"))
+        routes.patch(monkeypatch)
+        return routes
+
+    @pytest.mark.parametrize("family", [4, 6])
+    def test_sharded(self, testpath: str, tmp_path, monkeypatch, family: int) -> None:
+        """Test each network is returned exactly once, including those shorter than the shards."""
+
+        table = f"t_static{family}"
+        routes = self._routes(testpath, table, monkeypatch)
+        expected = BirdClient().show_route_table(table, self.load_test_data(testpath, f"test_route_shards_{table}.txt"))
+
+        birdclient = BirdClient(str(tmp_path))
+        prefixes = [prefix for prefix, _ in birdclient.show_route_table_sharded_iter(table, family=family, shard_bits=2)]
+        assert sorted(prefixes) == sorted(expected)
+        assert birdclient.show_route_table_sharded(table, family=family, shard_bits=2) == expected
+
+        exact = ["0.0.0.0/0", "0.0.0.0/1", "128.0.0.0/1"] if family == 4 else ["::/0", "::/1", "8000::/1"]
+        assert exact[0] in expected
+        assert exact[1] not in expected
+        assert exact[2] in expected
+        # Networks shorter than the shards are looked up exactly by each call, those which don't exist are skipped
+        queried = [query.split()[4] for query in routes.queries if query.split()[4] not in ("in", "all")]
+        assert sorted(queried) == sorted(exact * 2)
+
+    def test_sharded_split(self, testpath: str, tmp_path, monkeypatch) -> None:
+        """Test shards with too many networks are split and empty shards are skipped."""
+
+        routes = self._routes(testpath, "t_static4", monkeypatch)
+        expected = BirdClient().show_route_table("t_static4", self.load_test_data(testpath, "test_route_shards_t_static4.txt"))
+
+        birdclient = BirdClient(str(tmp_path))
+        assert birdclient.show_route_table_sharded("t_static4", shard_bits=1, max_shard_routes=3, workers=2) == expected
+
+        counted = [query.split()[5] for query in routes.queries if query.endswith(" count")]
+        retrieved = [query.split()[5] for query in routes.queries if query.endswith(" all") and " in " in query]
+        # Shards were split beyond the initial 2, each one retrieved was counted first and has networks up to the limit
+        assert len(retrieved) > 2
+        assert set(retrieved) < set(counted)
+        for shard in retrieved:
+            assert 0 < len(BirdClient().show_route(data=routes(f"show route table t_static4 in {shard} all"))) <= 3
+        # Shards without networks were counted but not retrieved
+        empty = [shard for shard in counted if routes(f"show route table t_static4 in {shard} count")[0].startswith("1007-0 ")]
+        assert empty
+        assert not set(empty) & set(retrieved)
+
+    def test_sharded_sinks(self, testpath: str, tmp_path, monkeypatch) -> None:
+        """Test each network is passed to the sinks as its shard is parsed."""
+
+        self._routes(testpath, "t_static4", monkeypatch)
+        index = RouteIndex(["gateway"])
+
+        result = BirdClient(str(tmp_path)).show_route_table_sharded("t_static4", shard_bits=3, sinks=[index])
+
+        assert len(index) == len(result)
+        assert sorted(index.find()) == sorted(result)
+        # Networks with a second route have one via the second gateway
+        assert sorted(index.find(gateway="192.168.0.5")) == sorted(prefix for prefix, sources in result.items() if len(sources) > 1)
+
+    def test_sharded_limit(self, testpath: str, tmp_path, monkeypatch) -> None:
+        """Test only the number of networks asked for are returned, and passed to the sinks."""
+
+        self._routes(testpath, "t_static4", monkeypatch)
+        expected = BirdClient().show_route_table("t_static4", self.load_test_data(testpath, "test_route_shards_t_static4.txt"))
+        stats = RouteStats()
+
+        birdclient = BirdClient(str(tmp_path))
+        result = birdclient.show_route_table_sharded("t_static4", shard_bits=3, limit=5, sinks=[stats])
+
+        assert len(result) == 5
+        assert all(expected[prefix] == sources for prefix, sources in result.items())
+        assert stats.prefixes == 5
+        assert birdclient.show_route_table_sharded("t_static4", limit=0) == {}
+
+    def test_sharded_family(self, tmp_path) -> None:
+        """Test an unknown address family is rejected."""
+
+        with pytest.raises(BirdClientError, match="Address family must be 4 or 6, not 5"):
+            BirdClient(str(tmp_path)).show_route_table_sharded("t_static4", family=5)
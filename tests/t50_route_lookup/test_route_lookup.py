@@ -0,0 +1,128 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for looking up routes by address."""
+
+from birdclient import BirdClient, RouteLookupCache
+
+from ..basetests import BirdClientTestBaseCase, FakeBirdRoutes
+
+__all__ = ["TestRouteLookup"]
+
+
+# Networks in the table, 10.0.0.0/8 has a more specific network within it
+_NETWORKS = ["10.0.0.0/8", "10.1.0.0/16", "192.0.2.0/24"]
+
+
+class TestRouteLookup(BirdClientTestBaseCase):
+    """Test looking up routes by address."""
+
+    def _routes(self, testpath: str, monkeypatch) -> FakeBirdRoutes:
+        """Return the replies to route queries for our table, answering the queries of our BIRD connections."""
+
+        routes = FakeBirdRoutes("t_static4", self.load_test_data(testpath, "test_route_lookup_t_static4.txt"))
+        routes.patch(monkeypatch)
+        return routes
+
+    def test_lookup(self, testpath: str, tmp_path, monkeypatch) -> None:
+        """Test addresses are resolved using the longest prefix match cache where possible."""
+
+        routes = self._routes(testpath, monkeypatch)
+        addresses = ["192.0.2.200", "10.1.2.3", "10.3.0.1", "198.51.100.1", "10.1.9.9", "10.2.0.1", "192.0.2.1"]
+
+        birdclient = BirdClient(str(tmp_path))
+        result = birdclient.lookup_routes(addresses, table="t_static4", window=1)
+
+        expected = {
+            address: birdclient.show_route(data=routes(f"show route table t_static4 for {address} all"))
+            for address in addresses
+            if not address.startswith("198.")
+        }
+        assert result == {**expected, "198.51.100.1": {}}
+        assert [str(next(iter(result[x]))) for x in sorted(expected)] == [
+            "10.1.0.0/16",
+            "10.1.0.0/16",
+            "10.0.0.0/8",
+            "10.0.0.0/8",
+            "192.0.2.0/24",
+            "192.0.2.0/24",
+        ]
+
+        queries = routes.queries[: -len(expected)]
+        # The table was counted to validate the cache
+        assert queries[0] == "show route table t_static4 count"
+        # Addresses within prefixes without more specifics were answered from the cache, the others were looked up
+        assert sorted(x.split()[5] for x in queries if " for " in x) == [
+            "10.1.2.3",
+            "10.2.0.1",
+            "10.3.0.1",
+            "192.0.2.1",
+            "198.51.100.1",
+        ]
+        # Each prefix found was checked for more specifics once
+        assert sorted(x.split()[5] for x in queries if " in " in x) == _NETWORKS
+
+    def test_lookup_batch(self, testpath: str, tmp_path, monkeypatch) -> None:
+        """Test lookups are batched and the cache is reused between calls."""
+
+        routes = self._routes(testpath, monkeypatch)
+        cache = RouteLookupCache()
+
+        birdclient = BirdClient(str(tmp_path))
+        first = birdclient.lookup_routes(["10.1.2.3", "10.1.9.9", "192.0.2.1"], table="t_static4", cache=cache)
+        # 10.1.9.9 waited for 10.1.2.3 to be resolved, and was answered from the prefix it resolved to
+        assert sorted(x.split()[5] for x in routes.queries if " for " in x) == ["10.1.2.3", "192.0.2.1"]
+
+        routes.queries.clear()
+        second = birdclient.lookup_routes(["10.1.200.1", "192.0.2.99"], table="t_static4", cache=cache)
+        # Only the table count was needed, the addresses were resolved from the cache
+        assert routes.queries == ["show route table t_static4 count"]
+
+        routes.queries.clear()
+        third = birdclient.lookup_routes(["10.1.200.1"], table="t_static4", cache=cache, generation=1)
+        # Passing a generation skips counting the table, the cache was reset as the signature changed
+        assert routes.queries == [
+            "show route table t_static4 for 10.1.200.1 all",
+            "show route table t_static4 in 10.1.0.0/16 count",
+        ]
+
+        routes.queries.clear()
+        birdclient.lookup_routes(["10.1.100.1"], table="t_static4", cache=cache, generation=1)
+        assert routes.queries == []
+
+        assert first["10.1.2.3"] == first["10.1.9.9"] == second["10.1.200.1"] == third["10.1.200.1"]
+        assert first["192.0.2.1"] == second["192.0.2.99"]
+
+    def test_lookup_same_prefix(self, testpath: str, tmp_path, monkeypatch) -> None:
+        """Test addresses sharing a prefix in the same window are only looked up once."""
+
+        routes = self._routes(testpath, monkeypatch)
+        addresses = [f"10.1.{x}.{x}" for x in range(0, 250, 10)] + [f"192.0.2.{x}" for x in range(1, 250, 10)]
+
+        birdclient = BirdClient(str(tmp_path))
+        result = birdclient.lookup_routes(addresses, table="t_static4", window=64)
+
+        assert {str(next(iter(result[x]))) for x in addresses} == {"10.1.0.0/16", "192.0.2.0/24"}
+        assert [x for x in routes.queries if " for " in x] == [
+            "show route table t_static4 for 10.1.0.0 all",
+            "show route table t_static4 for 192.0.2.1 all",
+        ]
@@ -0,0 +1,69 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+"""Tests for the Python BirdClient class."""
+
+from birdclient import RouteLookupCache
+
+__all__ = ["TestRouteLookupCache"]
+
+
+class TestRouteLookupCache:
+    """Test the RouteLookupCache class."""
+
+    def test_route_lookup_cache(self) -> None:
+        """Test longest prefix matching of cached routes."""
+
+        cache = RouteLookupCache()
+        cache.validate((10, 10))
+
+        default_routes = {"0.0.0.0/0": [{"protocol": "static4"}]}
+        leaf_routes = {"100.64.0.0/24": [{"protocol": "static4"}]}
+        leaf6_routes = {"fc00:101::/48": [{"protocol": "static6"}]}
+
+        # The default route has more specifics, so it can only be used for the address we looked up
+        cache.add_address("8.8.8.8", default_routes)
+        cache.add_prefix("0.0.0.0/0", default_routes, leaf=False)
+        cache.add_address("100.64.0.1", leaf_routes)
+        cache.add_prefix("100.64.0.0/24", leaf_routes, leaf=True)
+        cache.add_prefix("fc00:101::/48", leaf6_routes, leaf=True)
+
+        assert cache.lookup("8.8.8.8") == default_routes, "Exact address lookup failed"
+        assert cache.lookup("8.8.4.4") is None, "Address should not match a prefix with more specifics"
+        assert cache.lookup("100.64.0.200") == leaf_routes, "Longest prefix match failed"
+        assert cache.lookup("100.64.1.1") is None, "Address outside of the prefix matched"
+        assert cache.lookup("fc00:101::1234") == leaf6_routes, "IPv6 longest prefix match failed"
+        assert cache.is_checked("0.0.0.0/0"), "Prefix should be marked as checked"
+        assert len(cache) == 4, "Cache size is incorrect"
+
+        # Changing the table signature must invalidate the cache
+        cache.validate((11, 10))
+        assert cache.lookup("100.64.0.200") is None, "Cache was not invalidated when the table changed"
+        assert len(cache) == 0, "Cache was not emptied"
+
+    def test_route_lookup_cache_ttl(self) -> None:
+        """Test expiry of cached routes."""
+
+        cache = RouteLookupCache(ttl=0)
+        cache.add_prefix("100.64.0.0/24", {"100.64.0.0/24": []}, leaf=True)
+        cache.validate()
+
+        assert cache.lookup("100.64.0.1") is None, "Cache was not invalidated when it expired"
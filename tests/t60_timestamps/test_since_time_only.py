@@ -0,0 +1,60 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+"""Tests for the Python BirdClient class."""
+
+import datetime
+
+from birdclient import BirdClient, BirdTimestamp
+from birdclient.timestamps import parse_since
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestBirdClientSinceTimeOnly"]
+
+
+class TestBirdClientSinceTimeOnly(BirdClientTestBaseCase):
+    """Test the BirdClient class."""
+
+    def test_since_time_only(self, testpath: str) -> None:
+        """Test lazily parsed 'since' fields with and without a date."""
+
+        birdclient = BirdClient(since_format="timestamp")
+        result = birdclient.show_route_table("t_static4", self.load_test_data(testpath, "test_since_time_only.txt"))
+
+        since_time = result["100.101.0.0/24"][0]["since"]
+        since_datetime = result["100.102.0.0/24"][0]["since"]
+
+        assert isinstance(since_time, BirdTimestamp), "The 'since' field should be a BirdTimestamp"
+        assert since_time == "13:13:28.592", "The 'since' field should still compare equal to the BIRD output"
+        assert since_time.datetime.tzinfo is not None, "The 'since' datetime should be timezone aware"
+        assert since_time.datetime <= datetime.datetime.now().astimezone(), "A time only 'since' should be in the past"
+        assert since_datetime.to_datetime(datetime.UTC) == datetime.datetime(2019, 9, 1, 13, 13, 28, tzinfo=datetime.UTC)
+
+    def test_parse_since_time_only(self) -> None:
+        """Test that a time without a date resolves to the last time the clock showed it."""
+
+        now = datetime.datetime(2024, 1, 2, 1, 0, 0, tzinfo=datetime.UTC)
+
+        assert parse_since("00:30:00", datetime.UTC, now) == datetime.datetime(2024, 1, 2, 0, 30, 0, tzinfo=datetime.UTC)
+        assert parse_since("13:13:28.592", datetime.UTC, now) == datetime.datetime(
+            2024, 1, 1, 13, 13, 28, 592000, tzinfo=datetime.UTC
+        )
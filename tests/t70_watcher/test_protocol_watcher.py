@@ -0,0 +1,145 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for the ProtocolWatcher class."""
+
+from birdclient import BirdClient, ProtocolEvent, ProtocolWatcher
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestProtocolWatcher"]
+
+
+class FakeBirdClient(BirdClient):
+    """BirdClient returning canned replies instead of querying BIRD."""
+
+    def __init__(self, summaries):
+        """Initialize the object."""
+        super().__init__()
+        self.summaries = summaries
+        self.summary = []
+        self.details = {}
+        self.queries = []
+
+    def query_iter(self, query):
+        """Return the next protocol summary, or the details of all protocols falling back to the current summary."""
+        self.queries.append(query)
+        if query[-1] == "all":
+            return iter(self.details.get("all", self.summary))
+        self.summary = self.summaries.pop(0)
+        return iter(self.summary)
+
+    def query_many(self, queries):
+        """Return the protocol details for each query, falling back to the current summary."""
+        queries = list(queries)
+        self.queries.extend(queries)
+        return [self.details.get(query[-1], self.summary) for query in queries]
+
+
+class TestProtocolWatcher(BirdClientTestBaseCase):
+    """Test the ProtocolWatcher class."""
+
+    def _client(self, testpath: str) -> FakeBirdClient:
+        """Return a fake client with two polls worth of data."""
+        return FakeBirdClient(
+            [
+                self.load_test_data(testpath, "test_protocol_watcher_poll1.txt"),
+                self.load_test_data(testpath, "test_protocol_watcher_poll2.txt"),
+            ]
+        )
+
+    def test_protocol_watcher(self, testpath: str) -> None:
+        """Test the watcher reporting protocol changes."""
+
+        client = self._client(testpath)
+        received = []
+        watcher = ProtocolWatcher(client, callback=received.append)
+
+        # The first poll only records the baseline, querying the details of all protocols at once
+        assert watcher.poll() == []
+        assert client.queries == [["show", "protocols"], ["show", "protocols", "all"]]
+        assert sorted(watcher.protocols) == [
+            "bgp4_AS65000_as65000",
+            "bgp4_AS65001_as65001",
+            "bgp4_AS65002_as65002",
+            "device1",
+            "static4",
+        ]
+
+        client.queries = []
+        client.details["bgp4_AS65002_as65002"] = self.load_test_data(testpath, "test_protocol_watcher_details.txt")
+        events = watcher.poll()
+
+        assert {event.name: event.event for event in events} == {
+            "bgp4_AS65000_as65000": "down",
+            "bgp4_AS65001_as65001": "flap",
+            "bgp4_AS65002_as65002": "up",
+            "bgp4_AS65003_as65003": "added",
+            "static4": "removed",
+        }
+        assert received == events
+
+        # Only the protocols that changed are queried in detail, unchanged and removed protocols are not
+        assert client.queries == [
+            ["show", "protocols"],
+            ["show", "protocols", "all", "bgp4_AS65000_as65000"],
+            ["show", "protocols", "all", "bgp4_AS65001_as65001"],
+            ["show", "protocols", "all", "bgp4_AS65002_as65002"],
+            ["show", "protocols", "all", "bgp4_AS65003_as65003"],
+        ]
+
+        up = next(event for event in events if event.name == "bgp4_AS65002_as65002")
+        assert up.old["state"] == "down"
+        assert up.new["routes_imported"] == 12
+        assert up.new["neighbor_address"] == "100.64.20.3"
+
+        removed = next(event for event in events if event.name == "static4")
+        assert removed == ProtocolEvent(name="static4", event="removed", old=removed.old, new=None)
+        assert "static4" not in watcher.protocols
+        assert watcher.protocols["bgp4_AS65002_as65002"] is up.new
+
+    def test_protocol_watcher_first_poll(self, testpath: str) -> None:
+        """Test the details of all protocols from the first poll being used as the baseline."""
+
+        client = self._client(testpath)
+        client.details["all"] = self.load_test_data(testpath, "test_protocol_watcher_details.txt")
+        watcher = ProtocolWatcher(client)
+
+        assert watcher.poll() == []
+        assert client.queries == [["show", "protocols"], ["show", "protocols", "all"]]
+        assert watcher.protocols["bgp4_AS65002_as65002"]["neighbor_address"] == "100.64.20.3"
+        # Protocols missing from the details keep their summary
+        assert "neighbor_address" not in watcher.protocols["bgp4_AS65000_as65000"]
+        assert len(watcher.protocols) == 5
+
+    def test_protocol_watcher_nodetails(self, testpath: str) -> None:
+        """Test the watcher only using protocol summaries."""
+
+        client = self._client(testpath)
+        watcher = ProtocolWatcher(client, details=False)
+
+        watcher.poll()
+        events = watcher.poll()
+
+        assert len(events) == 5
+        assert client.queries == [["show", "protocols"], ["show", "protocols"]]
+        assert watcher.protocols["bgp4_AS65000_as65000"]["info_extra"] == "received: hold timer expired"
@@ -0,0 +1,179 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for the BirdMetrics class."""
+
+import datetime
+
+from birdclient import BirdClient, BirdClientError, BirdMetrics
+
+from ..basetests import SYNTAX_ERROR, BirdClientTestBaseCase
+
+__all__ = ["TestBirdMetrics"]
+
+
+class FakeBirdClient(BirdClient):
+    """BirdClient returning canned replies instead of querying BIRD."""
+
+    def __init__(self, replies, **kwargs):
+        """Initialize the object."""
+        super().__init__(**kwargs)
+        self.replies = replies
+        self.queries = []
+
+    def query(self, query):
+        """Return the canned reply for a query, by the whole query or failing that by its first argument."""
+        self.queries.append(query)
+        return self.replies.get(" ".join(query)) or self.replies[query[1]]
+
+    def query_iter(self, query):
+        """Return the canned reply for a query."""
+        return iter(self.query(query))
+
+    def query_many(self, queries):
+        """Return the canned reply for each query."""
+        return [self.query(query) for query in queries]
+
+
+class TestBirdMetrics(BirdClientTestBaseCase):
+    """Test the BirdMetrics class."""
+
+    def _client(self, testpath: str, **kwargs) -> FakeBirdClient:
+        """Return a fake client."""
+        return FakeBirdClient(
+            {
+                "status": self.load_test_data(testpath, "test_metrics_status.txt"),
+                "protocols": self.load_test_data(testpath, "test_metrics_protocols.txt"),
+                "route": self.load_test_data(testpath, "test_metrics_route_count.txt"),
+            },
+            **kwargs,
+        )
+
+    def test_metrics_render(self, testpath: str) -> None:
+        """Test rendering metrics."""
+
+        client = self._client(testpath, since_format="datetime", timezone=datetime.UTC)
+        metrics = BirdMetrics(client, timezone=datetime.UTC)
+
+        result = metrics.render(
+            client.show_status(),
+            client.show_protocols(),
+            {"master4": client.show_route_count(["table", "master4"])},
+            duration=0.25,
+            now=datetime.datetime(2024, 5, 1, 11, 0, 0, tzinfo=datetime.UTC).timestamp(),
+        )
+        lines = result.splitlines()
+
+        assert result.endswith("\n")
+        assert "# TYPE bird_protocol_up gauge" in lines
+        for line in [
+            "bird_up 1",
+            'bird_info{version="2.0.4",router_id="172.16.10.1"} 1',
+            "bird_uptime_seconds 4",
+            "bird_reconfiguration_age_seconds 4",
+            "bird_scrape_duration_seconds 0.25",
+            'bird_protocol_up{name="bgp_AS65000_as65000",proto="BGP"} 1',
+            'bird_protocol_state_age_seconds{name="bgp_AS65000_as65000",proto="BGP"} 3600',
+            'bird_channel_up{name="bgp_AS65000_as65000",proto="BGP",channel="ipv6"} 1',
+            'bird_channel_routes_imported{name="bgp_AS65000_as65000",proto="BGP",channel="ipv4"} 70',
+            'bird_channel_routes_exported{name="bgp_AS65000_as65000",proto="BGP",channel="ipv6"} 5',
+            'bird_channel_routes_preferred{name="bgp_AS65000_as65000",proto="BGP",channel="ipv4"} 68',
+            'bird_table_routes{table="master6"} 9',
+            'bird_table_routes_selected{table="master6"} 7',
+            'bird_table_networks{table="master4"} 10',
+        ]:
+            assert line in lines
+
+    def test_metrics_collect(self, testpath: str) -> None:
+        """Test collecting metrics is cached and queries the tables of the protocol channels."""
+
+        client = self._client(testpath)
+        metrics = BirdMetrics(client, max_age=60)
+
+        result = metrics.collect()
+
+        assert "bird_up 1" in result
+        assert sorted(query for query in client.queries if query[1] == "route") == [
+            ["show", "route", "table", "t_bgp4_AS65000_as65000_peer", "count"],
+            ["show", "route", "table", "t_bgp6_AS65000_as65000_peer", "count"],
+        ]
+
+        # The second collect is served from the cached snapshot
+        queries = len(client.queries)
+        assert metrics.collect() is result
+        assert len(client.queries) == queries
+
+    def test_metrics_collect_error(self, testpath: str) -> None:
+        """Test collecting metrics when BIRD cannot be queried."""
+
+        client = self._client(testpath)
+
+        def query(query):
+            raise BirdClientError("Failed to connect to BIRD socket")
+
+        client.query = query
+        metrics = BirdMetrics(client, tables=["master4"])
+
+        assert metrics.collect() == "# HELP bird_up Whether BIRD could be queried.\n# TYPE bird_up gauge\nbird_up 0\n"
+
+    def test_metrics_refresh_changed(self, testpath: str) -> None:
+        """Test refreshing metrics only queries the details of protocols that changed."""
+
+        client = self._client(testpath)
+        details = client.replies["protocols"]
+        client.replies["show protocols"] = [*details[:3], "0000 "]
+        metrics = BirdMetrics(client, max_age=0, details_max_age=None)
+        metrics.refresh()
+
+        # Nothing changed, so only the summary and status are queried
+        client.queries = []
+        result = metrics.refresh()
+        assert sorted(client.queries) == [["show", "protocols"], ["show", "status"]]
+        assert 'bird_channel_routes_imported{name="bgp_AS65000_as65000",proto="BGP",channel="ipv4"} 70' in result.splitlines()
+
+        # The protocol went down and back up, so its details and tables are queried again
+        client.replies["show protocols"][2] = client.replies["show protocols"][2].replace("10:00:00", "10:30:00")
+        client.replies["protocols"] = [line.replace("70 imported", "71 imported") for line in details]
+        client.queries = []
+        result = metrics.refresh()
+        assert sorted(client.queries) == [
+            ["show", "protocols"],
+            ["show", "protocols", "all", "bgp_AS65000_as65000"],
+            ["show", "route", "table", "t_bgp4_AS65000_as65000_peer", "count"],
+            ["show", "route", "table", "t_bgp6_AS65000_as65000_peer", "count"],
+            ["show", "status"],
+        ]
+        assert 'bird_channel_routes_imported{name="bgp_AS65000_as65000",proto="BGP",channel="ipv4"} 71' in result.splitlines()
+
+    def test_metrics_collect_table_error(self, testpath: str) -> None:
+        """Test collecting metrics when the route counts of a table cannot be queried."""
+
+        client = self._client(testpath)
+        client.replies["show route table nosuch count"] = ["0001 BIRD 2.15.1 ready.", *SYNTAX_ERROR]
+        metrics = BirdMetrics(client, tables=["master4", "nosuch"])
+
+        lines = metrics.collect().splitlines()
+
+        assert "bird_up 1" in lines
+        assert "bird_scrape_errors 1" in lines
+        assert 'bird_table_routes{table="master4"} 12' in lines
+        assert 'bird_protocol_up{name="bgp_AS65000_as65000",proto="BGP"} 1' in lines
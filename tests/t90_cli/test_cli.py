@@ -0,0 +1,121 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for the command line interface."""
+
+import io
+import json
+
+import pytest
+
+from birdclient import BirdClient, cli
+
+from ..basetests import BirdClientTestBaseCase
+
+__all__ = ["TestBirdClientCli"]
+
+
+class TestBirdClientCli(BirdClientTestBaseCase):
+    """Test the command line interface."""
+
+    @pytest.fixture(autouse=True)
+    def fake_client(self, testpath: str, monkeypatch: pytest.MonkeyPatch) -> list:
+        """Replace the client used by the command line interface with one returning canned replies."""
+
+        replies = {
+            "status": self.load_test_data(testpath, "test_cli_status.txt"),
+            "protocols": self.load_test_data(testpath, "test_cli_protocols.txt"),
+            "route": self.load_test_data(testpath, "test_cli_routes.txt"),
+        }
+        queries = []
+
+        class FakeBirdClient(BirdClient):
+            """BirdClient returning canned replies instead of querying BIRD."""
+
+            def query(self, query):
+                """Return the canned reply for a query."""
+                queries.append(query)
+                return replies[query[1]]
+
+            def query_iter(self, query):
+                """Return the canned reply for a query."""
+                return iter(self.query(query))
+
+        monkeypatch.setattr(cli, "BirdClient", FakeBirdClient)
+        return queries
+
+    def test_cli_status(self) -> None:
+        """Test the status command."""
+
+        out = io.StringIO()
+        assert cli.main(["status", "--fields", "version,router_id"], out=out) == 0
+        assert json.loads(out.getvalue()) == {"version": "2.0.4", "router_id": "172.16.10.1"}
+
+    def test_cli_protocols(self, fake_client: list) -> None:
+        """Test the protocols command."""
+
+        out = io.StringIO()
+        assert cli.main(["protocols", "--summary", "--fields", "name,state"], out=out) == 0
+
+        lines = out.getvalue().splitlines()
+        assert fake_client == [["show", "protocols"]]
+        assert json.loads(lines[0]) == {"name": "p_static4_to_kernel4", "state": "up"}
+        assert json.loads(lines[-1]) == {"name": "bgp6_AS65000_as65000b", "state": "up"}
+
+    def test_cli_protocols_names(self, fake_client: list) -> None:
+        """Test the protocols command with protocol names."""
+
+        out = io.StringIO()
+        assert cli.main(["protocols", "ospf4", "ospf6"], out=out) == 0
+        assert fake_client == [["show", "protocols", "all", "ospf4"], ["show", "protocols", "all", "ospf6"]]
+
+    def test_cli_routes(self, fake_client: list) -> None:
+        """Test the routes command outputs one prefix per line."""
+
+        out = io.StringIO()
+        assert cli.main(["--timeout", "10", "routes", "t_bgp4", "--fields", "protocol,bestpath"], out=out) == 0
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert fake_client == [["show", "route", "table", "t_bgp4", "all"]]
+        assert lines[0] == {
+            "prefix": "100.201.0.0/24",
+            "sources": [
+                {"protocol": "bgp_AS65000_rr1_peer4", "bestpath": True},
+                {"protocol": "bgp_AS65000_rr2_peer4", "bestpath": False},
+            ],
+        }
+        assert len(lines) == len({line["prefix"] for line in lines})
+
+    def test_cli_routes_limit(self) -> None:
+        """Test the routes command only outputs the first prefixes when limited."""
+
+        out = io.StringIO()
+        assert cli.main(["routes", "t_bgp4", "--limit", "2"], out=out) == 0
+        assert len(out.getvalue().splitlines()) == 2
+
+    def test_cli_error(self, capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test errors are reported with a non-zero exit code."""
+
+        # Use the real client
+        monkeypatch.undo()
+        assert cli.main(["--socket", "/nonexistent/bird.ctl", "routes", "t_bgp4"], out=io.StringIO()) == 1
+        assert capsys.readouterr().err == "ERROR: BIRD socket file '/nonexistent/bird.ctl' does not exist\n"
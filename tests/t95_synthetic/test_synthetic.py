@@ -0,0 +1,66 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for the synthetic BIRD output generator."""
+
+import pytest
+
+from benchmarks.synthetic import ROUTE_KINDS, BirdOutputGenerator
+from birdclient import BirdClient
+
+__all__ = ["TestSyntheticOutput"]
+
+
+class TestSyntheticOutput:
+    """Test the synthetic BIRD output generator."""
+
+    @pytest.mark.parametrize("version", [2, 3])
+    @pytest.mark.parametrize("family", [4, 6])
+    @pytest.mark.parametrize("kind", ROUTE_KINDS)
+    def test_synthetic_routes(self, kind: str, family: int, version: int) -> None:
+        """Test the generated routes can be parsed."""
+
+        data = list(BirdOutputGenerator(version=version).routes(200, kind=kind, family=family, max_sources=3))
+        result = BirdClient().show_route(data=data)
+
+        assert data[0] == f"0001 BIRD {'2.15.1' if version == 2 else '3.0.1'} ready."
+        assert len(result) == 200
+        # Some prefixes have more than one route, the first of which is the best
+        assert max(len(sources) for sources in result.values()) == (1 if kind == "roa" else 3)
+        assert all(sources[0]["bestpath"] for sources in result.values())
+        assert not any(source["bestpath"] for sources in result.values() for source in sources[1:])
+
+    def test_synthetic_routes_deterministic(self) -> None:
+        """Test the same seed generates the same output."""
+
+        assert list(BirdOutputGenerator(seed=5).routes(100)) == list(BirdOutputGenerator(seed=5).routes(100))
+        assert list(BirdOutputGenerator(seed=5).routes(100)) != list(BirdOutputGenerator(seed=6).routes(100))
+
+    def test_synthetic_protocols(self) -> None:
+        """Test the generated protocols can be parsed."""
+
+        result = BirdClient().show_protocols(data=list(BirdOutputGenerator().protocols(50)))
+
+        assert len(result) == 53
+        assert result["bgp4_AS64512_peer"]["info"] == "active"
+        assert result["bgp4_AS64561_peer"]["neighbor_as"] == 64561
+        assert result["bgp4_AS64513_peer"]["channels"]["ipv4"]["table"] == "t_bgp4_AS64513_peer"
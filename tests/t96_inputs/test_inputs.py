@@ -0,0 +1,155 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for parsing BIRD output saved to files."""
+
+import gzip
+import importlib
+import io
+import pathlib
+
+import pytest
+
+from benchmarks.synthetic import BirdOutputGenerator
+from birdclient import BirdClient, inputs
+
+__all__ = ["TestInputs"]
+
+
+class TestInputs:
+    """Test parsing BIRD output saved to files."""
+
+    @pytest.fixture
+    def routes(self) -> list[str]:
+        """Return synthetic BIRD routes."""
+        return list(BirdOutputGenerator().routes(300, max_sources=3))
+
+    @pytest.fixture
+    def dump(self, routes: list[str], tmp_path: pathlib.Path) -> pathlib.Path:
+        """Return a file the synthetic routes have been saved to."""
+
+        path = tmp_path / "routes.txt"
+        path.write_text("".join(f"{line}\n" for line in routes), encoding="UTF-8")
+        return path
+
+    @pytest.mark.parametrize("chunk_size", [64, 1 << 20])
+    def test_inputs_path(self, routes: list[str], dump: pathlib.Path, chunk_size: int, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test routes can be parsed from a file path, with the file decoded in blocks of lines."""
+
+        monkeypatch.setattr(inputs, "CHUNK_SIZE", chunk_size)
+        birdclient = BirdClient()
+        correct_result = birdclient.show_route(data=routes)
+
+        assert birdclient.show_route(data=dump) == correct_result
+        assert birdclient.show_route(data=str(dump)) == correct_result
+        assert list(inputs.iter_lines(dump)) == routes
+
+    @pytest.mark.parametrize("chunk_size", [64, 1 << 20])
+    def test_inputs_file(self, routes: list[str], dump: pathlib.Path, chunk_size: int, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test routes can be parsed from file objects, whether they can be memory mapped or not."""
+
+        monkeypatch.setattr(inputs, "CHUNK_SIZE", chunk_size)
+        birdclient = BirdClient()
+        correct_result = birdclient.show_route(data=routes)
+
+        with dump.open("rb") as binary_file:
+            assert birdclient.show_route(data=binary_file) == correct_result
+        with dump.open("r", encoding="UTF-8") as text_file:
+            assert birdclient.show_route(data=text_file) == correct_result
+        assert birdclient.show_route(data=io.BytesIO(dump.read_bytes())) == correct_result
+
+    def test_inputs_iterables(self, routes: list[str]) -> None:
+        """Test routes can be parsed from iterables of lines."""
+
+        birdclient = BirdClient()
+        correct_result = birdclient.show_route(data=routes)
+
+        assert birdclient.show_route(data=iter(routes)) == correct_result
+        assert birdclient.show_route(data=[f"{line}\n".encode() for line in routes]) == correct_result
+        assert birdclient.show_route(data=(f"{line}\n" for line in routes)) == correct_result
+
+    def test_inputs_text(self, routes: list[str], dump: pathlib.Path) -> None:
+        """Test routes can be parsed from the output as a string, as long as it spans more than one line."""
+
+        birdclient = BirdClient()
+        correct_result = birdclient.show_route(data=routes)
+
+        assert birdclient.show_route(data="\n".join(routes)) == correct_result
+        assert birdclient.show_route(data=dump.read_text(encoding="UTF-8")) == correct_result
+        assert list(inputs.iter_lines("\r\n".join(routes))) == routes
+
+    def test_inputs_status(self, tmp_path: pathlib.Path) -> None:
+        """Test the status can be parsed from a file, including one without a trailing line ending."""
+
+        path = tmp_path / "status.txt"
+        path.write_bytes(b"0001 BIRD 2.15.1 ready.\n1000-BIRD 2.15.1\n1011-Router ID is 192.0.2.1\n0013 Daemon is up and running")
+
+        result = BirdClient().show_status(path)
+
+        assert result["version"] == "2.15.1"
+        assert result["router_id"] == "192.0.2.1"
+
+    def test_inputs_empty(self, tmp_path: pathlib.Path) -> None:
+        """Test an empty file has no lines."""
+
+        path = tmp_path / "empty.txt"
+        path.touch()
+
+        assert not list(inputs.iter_lines(path))
+
+    @pytest.mark.parametrize("compression", ["gzip", "bz2", "lzma"])
+    def test_inputs_compressed(
+        self, routes: list[str], dump: pathlib.Path, compression: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test compressed files are decompressed as they are parsed."""
+
+        monkeypatch.setattr(inputs, "CHUNK_SIZE", 256)
+        module = importlib.import_module(compression)
+        compressed = dump.with_suffix(f".{compression}")
+        # Concatenated compressed streams are read as one, like with appended captures
+        half = len(dump.read_bytes()) // 2
+        compressed.write_bytes(module.compress(dump.read_bytes()[:half]) + module.compress(dump.read_bytes()[half:]))
+
+        birdclient = BirdClient()
+        correct_result = birdclient.show_route(data=routes)
+
+        assert birdclient.show_route(data=compressed) == correct_result
+        with compressed.open("rb") as compressed_file:
+            assert birdclient.show_route(data=compressed_file) == correct_result
+        assert birdclient.show_route(data=io.BytesIO(compressed.read_bytes())) == correct_result
+
+    def test_inputs_parse_route_dumps(self, tmp_path: pathlib.Path) -> None:
+        """Test a directory of saved routes is parsed in worker processes."""
+
+        birdclient = BirdClient(address_format="int")
+        correct_results = {}
+        for seed in range(3):
+            routes = list(BirdOutputGenerator(seed=seed).routes(100, max_sources=2))
+            path = tmp_path / f"routes-{seed}.txt.gz"
+            path.write_bytes(gzip.compress("".join(f"{line}\n" for line in routes).encode()))
+            correct_results[path] = birdclient.show_route(data=routes)
+
+        results = dict(birdclient.parse_route_dumps(tmp_path, workers=2))
+        first = sorted(correct_results)[0]
+
+        assert results == correct_results
+        assert dict(birdclient.parse_route_dumps([first])) == {first: correct_results[first]}
@@ -0,0 +1,161 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for route snapshots."""
+
+import ipaddress
+import pathlib
+import pickle
+
+import pytest
+
+from benchmarks.synthetic import ROUTE_KINDS, BirdOutputGenerator
+from birdclient import BirdClient, BirdClientError, BirdTimestamp, RouteSnapshot
+
+__all__ = ["TestRouteSnapshot"]
+
+
+class TestRouteSnapshot:
+    """Test route snapshots."""
+
+    def _routes(self, birdclient: BirdClient) -> dict:
+        """Return synthetic routes of all kinds, for both address families."""
+
+        res = {}
+        for family in (4, 6):
+            for seed, kind in enumerate(ROUTE_KINDS):
+                generator = BirdOutputGenerator(seed=seed)
+                res.update(birdclient.show_route(data=list(generator.routes(50, kind=kind, family=family, max_sources=3))))
+        return res
+
+    @pytest.mark.parametrize("address_format", ["str", "int", "ipaddress"])
+    @pytest.mark.parametrize("since_format", ["str", "timestamp", "datetime", "epoch"])
+    def test_snapshot(self, address_format: str, since_format: str, tmp_path: pathlib.Path) -> None:
+        """Test routes read back from a snapshot match the routes written."""
+
+        routes = self._routes(BirdClient(address_format=address_format, since_format=since_format))
+        path = tmp_path / "routes.snapshot"
+
+        assert RouteSnapshot.write(path, routes) == len(routes)
+        with RouteSnapshot(path) as snapshot:
+            assert snapshot.prefix_format == address_format
+            assert len(snapshot) == len(routes)
+            assert snapshot.to_dict() == routes
+            assert set(snapshot) == set(routes)
+            for prefix, sources in routes.items():
+                assert snapshot[prefix] == sources
+
+    def test_snapshot_lookup(self, tmp_path: pathlib.Path) -> None:
+        """Test prefixes can be looked up in any address format."""
+
+        routes = BirdClient().show_route(data=list(BirdOutputGenerator().routes(100)))
+        path = tmp_path / "routes.snapshot"
+        # Writing the routes as they are parsed gives the same snapshot
+        RouteSnapshot.write(path, BirdClient().show_route_iter(data=list(BirdOutputGenerator().routes(100))))
+
+        with RouteSnapshot(path) as snapshot:
+            prefix = next(iter(routes))
+            network = ipaddress.ip_network(prefix)
+            assert snapshot[prefix] == routes[prefix]
+            assert snapshot[network] == routes[prefix]
+            assert snapshot[(int(network.network_address), network.prefixlen, 4)] == routes[prefix]
+            assert "192.0.2.0/24" not in snapshot
+            assert snapshot.get("192.0.2.0/24") is None
+            with pytest.raises(KeyError):
+                snapshot["192.0.2.0/24"]  # pylint: disable=pointless-statement
+            # Sources share their attributes, but not the sources themselves
+            assert snapshot[prefix] is not snapshot[prefix]
+            assert snapshot[prefix][0] is not snapshot[prefix][0]
+
+    def test_snapshot_other_prefixes(self, tmp_path: pathlib.Path) -> None:
+        """Test prefixes which aren't IP prefixes are kept as is."""
+
+        routes = {
+            "10.0.0.0/8": [{"protocol": "static4", "since": "2024-05-01 10:00:00", "bestpath": True}],
+            "1:2 10.0.0.0/8": [{"protocol": "bgp_vpn", "pref": 100, "weight": 1.5, "nothing": None}],
+            "10.0.0.1/8": [{"protocol": "odd", "type": ("a", "b")}],
+        }
+        path = tmp_path / "routes.snapshot"
+        RouteSnapshot.write(path, routes)
+
+        with RouteSnapshot(path) as snapshot:
+            assert snapshot.to_dict() == routes
+            assert snapshot["1:2 10.0.0.0/8"] == routes["1:2 10.0.0.0/8"]
+
+    def test_snapshot_value_types(self, tmp_path: pathlib.Path) -> None:
+        """Test values which look the same but differ in type are each stored as they are."""
+
+        since = "2024-05-01 10:00:00"
+        routes = {
+            "10.0.0.0/8": [{"protocol": "static4", "attributes": {"tag": since}}],
+            "10.1.0.0/16": [{"protocol": "static4", "attributes": {"tag": BirdTimestamp(since)}}],
+        }
+        path = tmp_path / "routes.snapshot"
+        RouteSnapshot.write(path, routes)
+
+        with RouteSnapshot(path) as snapshot:
+            assert type(snapshot["10.0.0.0/8"][0]["attributes"]["tag"]) is str
+            assert type(snapshot["10.1.0.0/16"][0]["attributes"]["tag"]) is BirdTimestamp
+
+    def test_snapshot_duplicate_prefix(self, tmp_path: pathlib.Path) -> None:
+        """Test a prefix given more than once is rejected rather than losing its earlier sources."""
+
+        sources = [{"protocol": "static4"}]
+        with pytest.raises(BirdClientError, match="Prefix '10.0.0.0/8' appears more than once"):
+            RouteSnapshot.write(
+                tmp_path / "routes.snapshot", [("10.0.0.0/8", sources), (ipaddress.ip_network("10.0.0.0/8"), sources)]
+            )
+
+    def test_snapshot_pickle(self, tmp_path: pathlib.Path) -> None:
+        """Test snapshots are pickled as their path."""
+
+        routes = BirdClient().show_route(data=list(BirdOutputGenerator().routes(10)))
+        path = tmp_path / "routes.snapshot"
+        RouteSnapshot.write(path, routes)
+
+        with RouteSnapshot(path) as snapshot:
+            data = pickle.dumps(snapshot)
+            assert len(data) < 200
+        with pickle.loads(data) as snapshot:  # noqa: S301
+            assert snapshot.to_dict() == routes
+
+    def test_snapshot_invalid(self, tmp_path: pathlib.Path) -> None:
+        """Test invalid snapshots are rejected."""
+
+        path = tmp_path / "routes.snapshot"
+        path.write_bytes(b"")
+        with pytest.raises(BirdClientError, match="is empty"):
+            RouteSnapshot(path)
+        path.write_bytes(b"BIRDSNAP")
+        with pytest.raises(BirdClientError, match="is truncated"):
+            RouteSnapshot(path)
+        path.write_bytes(b"\x00" * 100)
+        with pytest.raises(BirdClientError, match="is not a route snapshot"):
+            RouteSnapshot(path)
+        RouteSnapshot.write(path, {})
+        data = bytearray(path.read_bytes())
+        data[8] = 99
+        path.write_bytes(data)
+        with pytest.raises(BirdClientError, match="unsupported version 99"):
+            RouteSnapshot(path)
+        with pytest.raises(BirdClientError, match="type 'set' can't be stored"):
+            RouteSnapshot.write(path, {"10.0.0.0/8": [{"protocol": {"static4"}}]})
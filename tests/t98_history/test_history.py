@@ -0,0 +1,134 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for the SQLite route history."""
+
+import datetime
+import pathlib
+
+import pytest
+
+from benchmarks.synthetic import BirdOutputGenerator
+from birdclient import BirdClient, BirdClientNotFoundError, RouteHistory
+
+__all__ = ["TestRouteHistory"]
+
+
+class TestRouteHistory:
+    """Test the SQLite route history."""
+
+    @pytest.fixture
+    def routes(self) -> dict:
+        """Return synthetic BGP routes."""
+        return BirdClient().show_route(data=list(BirdOutputGenerator().routes(200, max_sources=2)))
+
+    def test_history_snapshots(self, routes: dict, tmp_path: pathlib.Path) -> None:
+        """Test only changes are stored between snapshots, and each snapshot can be read back."""
+
+        prefixes = list(routes)
+        changed = dict(routes)
+        # Remove a prefix, change a source and add a prefix
+        del changed[prefixes[0]]
+        changed[prefixes[1]] = [{**routes[prefixes[1]][0], "pref": 1}] + routes[prefixes[1]][1:]
+        changed["192.0.2.0/24"] = [{"protocol": "static4", "since": "2024-05-01 10:00:00", "bestpath": True}]
+
+        with RouteHistory(tmp_path / "history.db", batch_size=50) as history:
+            taken_at = datetime.datetime(2024, 5, 1, tzinfo=datetime.UTC)
+            first = history.add_snapshot("master4", routes, taken_at=taken_at)
+            second = history.add_snapshot("master4", routes.items())
+            third = history.add_snapshot("master4", changed)
+
+            snapshots = history.snapshots("master4")
+            assert [snapshot["id"] for snapshot in snapshots] == [first, second, third]
+            assert snapshots[0]["taken_at"] == taken_at
+            assert snapshots[0]["prefixes"] == len(routes)
+            assert snapshots[0]["sources"] == sum(len(sources) for sources in routes.values())
+            assert not history.snapshots("master6")
+
+            # The unchanged snapshot doesn't store anything, the last one only stores what changed
+            assert history.changes(second) == {"added": {}, "removed": {}}
+            changes = history.changes(third)
+            assert set(changes["added"]) == {prefixes[1], "192.0.2.0/24"}
+            assert changes["added"][prefixes[1]][0]["pref"] == 1
+            assert set(changes["removed"]) == {prefixes[0], prefixes[1]}
+            source_count = history._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]  # noqa: SLF001
+            assert source_count == snapshots[0]["sources"] + 2
+
+            # Each snapshot reads back as it was, with tuples becoming lists
+            assert history.routes(first) == _as_json(routes)
+            assert history.routes(second) == _as_json(routes)
+            assert history.routes(third) == _as_json(changed)
+
+    def test_history_reordered(self, routes: dict, tmp_path: pathlib.Path) -> None:
+        """Test sources which are only reordered are not stored again, while each snapshot keeps its own order."""
+
+        prefix = next(prefix for prefix, sources in routes.items() if len(sources) == 2)
+        first_source, second_source = routes[prefix]
+        reordered = dict(routes)
+        reordered[prefix] = [
+            {**second_source, "bestpath": first_source["bestpath"]},
+            {**first_source, "bestpath": second_source["bestpath"]},
+        ]
+
+        with RouteHistory(tmp_path / "history.db") as history:
+            first = history.add_snapshot("master4", routes)
+            source_count = history._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]  # noqa: SLF001
+            second = history.add_snapshot("master4", reordered)
+
+            assert history._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0] == source_count  # noqa: SLF001
+            assert history.changes(second) == {"added": {}, "removed": {}}
+            assert history.routes(first, prefix=prefix) == _as_json({prefix: routes[prefix]})
+            assert history.routes(second, prefix=prefix) == _as_json({prefix: reordered[prefix]})
+
+    def test_history_filters(self, routes: dict, tmp_path: pathlib.Path) -> None:
+        """Test routes can be looked up by prefix, origin AS and community."""
+
+        prefix, sources = next(iter(routes.items()))
+        attributes = sources[0]["attributes"]
+        origin_as = attributes["BGP.as_path"][-1]
+        community = ":".join(str(part) for part in attributes["BGP.large_community"][0])
+
+        with RouteHistory(tmp_path / "history.db") as history:
+            snapshot = history.add_snapshot("master4", routes)
+
+            assert history.routes(snapshot, prefix=prefix) == _as_json({prefix: sources})
+            origin_routes = history.routes(snapshot, origin_as=origin_as)
+            assert prefix in origin_routes
+            assert all(source["attributes"]["BGP.as_path"][-1] == origin_as for source in origin_routes[prefix])
+            community_routes = history.routes(snapshot, community=community)
+            assert prefix in community_routes
+            assert not history.routes(snapshot, community="1:2:3:4")
+            with pytest.raises(BirdClientNotFoundError):
+                history.routes(snapshot + 1)
+
+
+def _as_json(routes: dict) -> dict:
+    """Return routes with tuples as lists, like they are returned from the history."""
+
+    def convert(value: object) -> object:
+        if isinstance(value, dict):
+            return {key: convert(item) for key, item in value.items()}
+        if isinstance(value, list | tuple):
+            return [convert(item) for item in value]
+        return value
+
+    return convert(routes)
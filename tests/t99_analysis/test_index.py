@@ -0,0 +1,83 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for the inverted route indexes."""
+
+import pytest
+
+from benchmarks.synthetic import BirdOutputGenerator
+from birdclient import BirdClient, BirdClientError, RouteIndex
+from birdclient.sinks import source_as_path, source_communities
+
+__all__ = ["TestRouteIndex"]
+
+
+class TestRouteIndex:
+    """Test the inverted route indexes."""
+
+    @pytest.mark.parametrize("version", [2, 3])
+    def test_index(self, version: int) -> None:
+        """Test the index built while parsing matches a scan of the routes."""
+
+        index = RouteIndex()
+        routes = BirdClient().show_route(data=list(BirdOutputGenerator(version=version).routes(300, max_sources=3)), sinks=[index])
+
+        assert len(index) == len(routes)
+        # Scan the routes for a community, origin AS and next hop to check the index against
+        sources = next(iter(routes.values()))
+        community = next(community for kind, community in source_communities(sources[0]) if kind == "large_community")
+        origin_as = source_as_path(sources[0])[-1]
+        gateway = sources[0]["nexthops"][0]["gateway"]
+
+        def scan(match: object) -> list:
+            return [prefix for prefix, sources in routes.items() if any(match(source) for source in sources)]
+
+        with_community = scan(lambda source: community in [value for _, value in source_communities(source)])
+        with_origin = scan(lambda source: source_as_path(source)[-1] == origin_as)
+        with_gateway = scan(lambda source: any(nexthop.get("gateway") == gateway for nexthop in source["nexthops"]))
+
+        assert index.prefixes(index.lookup("large_community", community)) == with_community
+        assert index.find(origin_as=origin_as) == with_origin
+        assert index.find(gateway=gateway) == with_gateway
+        assert index.find(large_community=community, origin_as=origin_as, gateway=gateway) == [
+            prefix for prefix in with_community if prefix in with_origin and prefix in with_gateway
+        ]
+        union = index.lookup("origin_as", origin_as) | index.lookup("gateway", gateway)
+        assert index.prefixes(union) == [prefix for prefix in routes if prefix in with_origin or prefix in with_gateway]
+        assert index.find(origin_as=origin_as, as_path=origin_as) == with_origin
+        assert index.find() == list(routes)
+        assert not index.find(origin_as=1, gateway=gateway)
+        assert sum(index.counts("protocol").values()) >= len(routes)
+        assert "eth0" in index.keys("interface")
+
+    def test_index_dimensions(self) -> None:
+        """Test only the dimensions asked for are indexed."""
+
+        index = RouteIndex(["protocol"])
+        BirdClient().show_route(data=list(BirdOutputGenerator().routes(10)), sinks=[index])
+
+        assert index.dimensions == ["protocol"]
+        assert index.keys("protocol")
+        with pytest.raises(BirdClientError, match="Dimension 'origin_as' is not indexed"):
+            index.find(origin_as=65000)
+        with pytest.raises(BirdClientError, match="Unknown index dimension 'colour'"):
+            RouteIndex(["colour"])
@@ -0,0 +1,153 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for route origin validation."""
+
+import ipaddress
+
+import pytest
+
+from benchmarks.synthetic import BirdOutputGenerator
+from birdclient import BirdClient, BirdClientParseError, RoaTable
+from birdclient.addresses import prefix_to_str
+from birdclient.sinks import source_as_path
+
+__all__ = ["TestRoaTable"]
+
+
+class TestRoaTable:
+    """Test route origin validation."""
+
+    @pytest.mark.parametrize(
+        ("prefix", "origin_as", "state"),
+        [
+            ("10.1.0.0/16", 65000, "valid"),
+            ("10.0.0.0/8", 65000, "valid"),
+            ("10.1.1.0/24", 65000, "invalid"),
+            ("10.1.0.0/16", 65001, "invalid"),
+            ("10.1.0.0/16", None, "invalid"),
+            ("10.2.3.0/24", 65002, "valid"),
+            ("10.2.3.0/24", 65000, "invalid"),
+            ("172.16.0.0/12", 65003, "invalid"),
+            ("192.0.2.0/24", 65000, "unknown"),
+            ("9.0.0.0/8", 65000, "unknown"),
+            ("2001:db8::/32", 65000, "valid"),
+            ("2001:db8:1::/48", 65000, "valid"),
+            ("2001:db8:1:1::/64", 65000, "invalid"),
+            ("2001:db9::/32", 65000, "unknown"),
+        ],
+    )
+    def test_roa_validate(self, prefix: str, origin_as: int | None, state: str) -> None:
+        """Test the validation states described in RFC 6811."""
+
+        roas = RoaTable()
+        roas.add_roa("10.0.0.0/8", 16, 65000)
+        roas.add_roa("10.2.0.0/16", 24, "AS65002")
+        roas.add_roa("172.16.0.0/12", 24, 0)
+        roas.add_roa("2001:db8::/32", 48, "65000")
+        # Duplicates are only counted once
+        roas.add_roa("2001:db8::/32", 48, 65000)
+
+        assert len(roas) == 4
+        assert roas.validate(prefix, origin_as) == state
+        network = ipaddress.ip_network(prefix)
+        assert roas.validate(network, origin_as) == state
+        assert roas.validate((int(network.network_address), network.prefixlen, network.version), origin_as) == state
+
+    @pytest.mark.parametrize("address_format", ["str", "int"])
+    def test_roa_routes(self, address_format: str) -> None:
+        """Test validating parsed BGP routes against a parsed ROA table matches checking each route against every ROA."""
+
+        birdclient = BirdClient(address_format=address_format)
+        roas = RoaTable()
+        roa_routes = birdclient.show_route(data=list(BirdOutputGenerator(seed=1).routes(200, kind="roa")), sinks=[roas])
+        routes = birdclient.show_route(data=list(BirdOutputGenerator(seed=1).routes(300, max_sources=3)))
+        # Make some of the routes valid
+        for prefix, sources in list(routes.items())[:20]:
+            roas.add_roa(prefix, 32, source_as_path(sources[0])[-1])
+            roa_routes[prefix] = [*roa_routes.get(prefix, []), {"ROA.max": 32, "ROA.asn": str(source_as_path(sources[0])[-1])}]
+
+        assert len(roas) == sum(len(sources) for sources in roa_routes.values())
+
+        # Check against a brute force implementation
+        roa_list = [
+            (ipaddress.ip_network(prefix_to_str(prefix)), source["ROA.max"], int(source["ROA.asn"]))
+            for prefix, sources in roa_routes.items()
+            for source in sources
+        ]
+        counts: dict[str, dict[str, int]] = {}
+        for prefix, source, state in roas.validate_routes(routes.items()):
+            network = ipaddress.ip_network(prefix_to_str(prefix))
+            origin_as = source_as_path(source)[-1]
+            covering = [roa for roa in roa_list if roa[0].version == network.version and network.subnet_of(roa[0])]
+            if not covering:
+                expected = "unknown"
+            elif any(asn == origin_as and network.prefixlen <= max_length for _, max_length, asn in covering):
+                expected = "valid"
+            else:
+                expected = "invalid"
+            assert state == expected
+            counts.setdefault(source["protocol"], {"valid": 0, "invalid": 0, "unknown": 0})[expected] += 1
+
+        assert roas.count_states(routes) == counts
+        assert sum(count["valid"] for count in counts.values()) >= 20
+        assert sum(count["invalid"] for count in counts.values())
+
+    def test_roa_as_set(self) -> None:
+        """Test routes with an AS path ending in an AS_SET have no origin AS, while an empty AS path is originated locally."""
+
+        routes = BirdClient().show_route(
+            data=[
+                "0001 BIRD 2.15.1 ready.",
+                "1007-Table master4:",
+                "  10.1.0.0/16          unicast [bgp1 2024-05-01 10:00:00 from 192.0.2.1] * (100) [i]",
+                " \tvia 192.0.2.1 on eth0",
+                "1008-\tType: BGP univ",
+                "1012-\tBGP.origin: IGP",
+                " \tBGP.as_path: 65001 {65002 65003}",
+                "1007-                     unicast [bgp2 2024-05-01 10:00:00 from 192.0.2.2] (100) [AS65003i]",
+                " \tvia 192.0.2.2 on eth0",
+                "1008-\tType: BGP univ",
+                "1012-\tBGP.origin: IGP",
+                " \tBGP.as_path: 65002 65003",
+                "1007-                     unicast [bgp3 2024-05-01 10:00:00 from 192.0.2.3] (100) [i]",
+                " \tvia 192.0.2.3 on eth0",
+                "1008-\tType: BGP univ",
+                "1012-\tBGP.origin: IGP",
+                " \tBGP.as_path: ",
+                "0000 ",
+            ]
+        )
+        roas = RoaTable()
+        roas.add_roa("10.0.0.0/8", 16, 65003)
+
+        assert [(source["protocol"], state) for _, source, state in roas.validate_routes(routes, local_as=65003)] == [
+            ("bgp1", "invalid"),
+            ("bgp2", "valid"),
+            ("bgp3", "valid"),
+        ]
+
+    def test_roa_invalid_asn(self) -> None:
+        """Test invalid ASNs are rejected."""
+
+        with pytest.raises(BirdClientParseError, match="Failed to parse ASN 'ASX'"):
+            RoaTable().add_roa("10.0.0.0/8", 8, "ASX")
@@ -0,0 +1,125 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for the streaming route statistics."""
+
+from collections import Counter
+
+import pytest
+
+from benchmarks.synthetic import BirdOutputGenerator
+from birdclient import BirdClient, BirdClientError, RouteStats
+from birdclient.sinks import source_as_path, source_communities
+from birdclient.stats import HyperLogLog, TopK
+
+__all__ = ["TestRouteStats"]
+
+
+class TestRouteStats:
+    """Test the streaming route statistics."""
+
+    @pytest.mark.parametrize("address_format", ["str", "int", "ipaddress"])
+    def test_stats(self, address_format: str) -> None:
+        """Test the exact statistics match counting the parsed routes."""
+
+        stats = RouteStats()
+        birdclient = BirdClient(address_format=address_format)
+        routes = birdclient.show_route(data=list(BirdOutputGenerator().routes(300, max_sources=3)), sinks=[stats])
+        routes.update(birdclient.show_route(data=list(BirdOutputGenerator().routes(50, family=6)), sinks=[stats]))
+        result = stats.result()
+
+        sources = [source for sources in routes.values() for source in sources]
+        assert result["prefixes"] == len(routes)
+        assert result["sources"] == len(sources)
+        assert result["bestpaths"] == sum(1 for source in sources if source["bestpath"])
+        assert result["protocols"] == {
+            protocol: {
+                "prefixes": sum(1 for sources in routes.values() if any(source["protocol"] == protocol for source in sources)),
+                "sources": sum(1 for source in sources if source["protocol"] == protocol),
+                "bestpaths": sum(1 for source in sources if source["protocol"] == protocol and source["bestpath"]),
+            }
+            for protocol in {source["protocol"] for source in sources}
+        }
+        assert sum(result["prefix_lengths"][4].values()) == 300
+        assert sum(result["prefix_lengths"][6].values()) == 50
+        assert result["as_path_lengths"] == dict(sorted(Counter(len(source_as_path(source)) for source in sources).items()))
+        origins = Counter(origin for sources in routes.values() for origin in {source_as_path(source)[-1] for source in sources})
+        assert result["origin_as"] == dict(origins)
+        communities = Counter(
+            community
+            for sources in routes.values()
+            for community in {community for source in sources for _, community in source_communities(source)}
+        )
+        assert result["community"] == dict(communities)
+        assert result["distinct"]["community"] == len(communities)
+        assert sum(result["gateway"].values()) >= len(routes)
+        assert list(stats.result(top=3)["community"]) == [community for community, _ in communities.most_common(3)]
+
+    def test_stats_sketched(self) -> None:
+        """Test the sketched statistics are close to the exact ones."""
+
+        exact = RouteStats()
+        sketched = RouteStats(top_k=20, precision=10)
+        BirdClient().show_route(data=list(BirdOutputGenerator().routes(2000, max_sources=3)), sinks=[exact, sketched])
+        exact_result = exact.result()
+        sketched_result = sketched.result()
+
+        assert sketched_result["prefixes"] == exact_result["prefixes"]
+        assert sketched_result["protocols"] == exact_result["protocols"]
+        assert len(sketched_result["community"]) == 20
+        for dimension in ("origin_as", "gateway", "community"):
+            distinct = exact_result["distinct"][dimension]
+            assert abs(sketched_result["distinct"][dimension] - distinct) <= max(2, distinct * 0.1)
+
+    def test_topk(self) -> None:
+        """Test the TopK sketch keeps the most frequent values."""
+
+        topk = TopK(20)
+        # Values 0 to 4 are frequent, the rest are seen once each
+        for value in range(1000):
+            topk.update([value % 5, 1000 + value])
+
+        assert sorted(value for value, _ in topk.most_common(5)) == [0, 1, 2, 3, 4]
+        assert all(count >= 200 for _, count in topk.most_common(5))
+        assert len(topk) == 20
+        with pytest.raises(BirdClientError):
+            TopK(0)
+
+    @pytest.mark.parametrize("count", [0, 10, 1000, 50000])
+    def test_hyperloglog(self, count: int) -> None:
+        """Test the HyperLogLog estimate is within its expected error."""
+
+        hll = HyperLogLog(12)
+        hll.update(range(count))
+        # Adding values again doesn't change the estimate
+        hll.update(range(count // 2))
+
+        assert abs(len(hll) - count) <= max(1, count * 0.05)
+
+        other = HyperLogLog(12)
+        other.update(range(count, 2 * count))
+        hll.merge(other)
+        assert abs(len(hll) - 2 * count) <= max(1, count * 0.1)
+        with pytest.raises(BirdClientError):
+            hll.merge(HyperLogLog(10))
+        with pytest.raises(BirdClientError):
+            HyperLogLog(3)
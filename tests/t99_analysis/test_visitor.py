@@ -0,0 +1,164 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (C) 2019-2025, AllWorldIT.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# type: ignore
+# pylint: disable=import-error,too-few-public-methods
+
+
+"""Tests for the route visitor."""
+
+import pathlib
+
+import pytest
+
+from benchmarks.synthetic import BirdOutputGenerator
+from birdclient import BirdClient, BirdClientParseError, RouteVisitor
+
+__all__ = ["TestRouteVisitor"]
+
+
+# Saved route tables to check against
+TABLES = sorted((pathlib.Path(__file__).parent.parent / "t20_tables").glob("**/*.txt"))
+
+
+class RebuildVisitor(RouteVisitor):
+    """Visitor rebuilding the routes as show_route() returns them."""
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self.routes = {}
+        self.ended = False
+        self._sources = []
+        self._source = {}
+
+    def on_prefix(self, prefix):
+        """Start a prefix."""
+        self._sources = self.routes.setdefault(prefix, [])
+
+    def on_source(self, protocol, since, bestpath, pref):
+        """Start a source."""
+        self._source = {"protocol": protocol, "since": since, "bestpath": bestpath, "pref": pref}
+        self._sources.append(self._source)
+
+    def on_field(self, name, value):
+        """Add a field."""
+        self._source[name] = value
+
+    def on_nexthop(self, gateway, interface, mpls, onlink, weight):
+        """Add a nexthop."""
+        nexthop = {"interface": interface}
+        if gateway:
+            nexthop["gateway"] = gateway
+        if mpls:
+            nexthop["mpls"] = mpls
+        if onlink:
+            nexthop["onlink"] = "onlink"
+        if weight is not None:
+            nexthop["weight"] = weight
+        self._source.setdefault("nexthops", []).append(nexthop)
+
+    def on_attribute(self, name, value):
+        """Add an attribute."""
+        attributes = self._source.setdefault("attributes", {})
+        if name in attributes:
+            attributes[name].extend(value)
+        else:
+            attributes[name] = value
+
+    def on_end(self):
+        """End the routes."""
+        self.ended = True
+
+
+class PrefixVisitor(RouteVisitor):
+    """Visitor only collecting the prefixes."""
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self.prefixes = []
+
+    def on_prefix(self, prefix):
+        """Add a prefix."""
+        self.prefixes.append(prefix)
+
+
+class TestRouteVisitor:
+    """Test the route visitor."""
+
+    @pytest.mark.parametrize("path", TABLES, ids=[path.stem for path in TABLES])
+    def test_tables(self, path: pathlib.Path) -> None:
+        """Test rebuilding the routes from the visitor matches the saved tables parsed by show_route()."""
+
+        birdclient = BirdClient()
+        visitor = RebuildVisitor()
+        birdclient.show_route_visit(visitor, data=path)
+
+        assert visitor.routes == birdclient.show_route(data=path)
+        assert visitor.ended
+
+    @pytest.mark.parametrize("address_format", ["str", "int", "ipaddress"])
+    def test_synthetic(self, address_format: str) -> None:
+        """Test rebuilding synthetic routes with each address format."""
+
+        data = list(BirdOutputGenerator().routes(200, max_sources=3)) + list(BirdOutputGenerator().routes(50, family=6))
+        data = [line for line in data if not line.startswith("0000")] + ["0000 "]
+        birdclient = BirdClient(address_format=address_format)
+        visitor = RebuildVisitor()
+        birdclient.show_route_visit(visitor, data=data)
+
+        assert visitor.routes == birdclient.show_route(data=data)
+
+    def test_partial(self) -> None:
+        """Test a visitor only handling prefixes skips parsing the attributes."""
+
+        data = list(BirdOutputGenerator().routes(20))
+        attribute = next(i for i, line in enumerate(data) if line.startswith("1012-"))
+        data.insert(attribute, "1012-\tBGP.unknown: 1")
+        visitor = PrefixVisitor()
+        BirdClient().show_route_visit(visitor, data=data)
+
+        assert visitor.prefixes == list(BirdClient().show_route(data=list(BirdOutputGenerator().routes(20))))
+        with pytest.raises(BirdClientParseError):
+            BirdClient().show_route_visit(RebuildVisitor(), data=data)
+
+    @pytest.mark.parametrize("limit", [0, 1, 7])
+    def test_limit(self, limit: int) -> None:
+        """Test the visitor is stopped after the limit."""
+
+        data = list(BirdOutputGenerator().routes(20, max_sources=3))
+        visitor = RebuildVisitor()
+        BirdClient().show_route_visit(visitor, data=data, limit=limit)
+
+        assert visitor.routes == BirdClient().show_route(data=data, limit=limit)
+        assert len(visitor.routes) == limit
+        assert visitor.ended
+
+    def test_end(self) -> None:
+        """Test the visitor is ended when the output runs out without an end line, but not when parsing fails."""
+
+        data = [line for line in BirdOutputGenerator().routes(5) if not line.startswith("0000")]
+        visitor = RebuildVisitor()
+        BirdClient().show_route_visit(visitor, data=data)
+
+        assert visitor.routes == BirdClient().show_route(data=[*data, "0000 "])
+        assert visitor.ended
+
+        visitor = RebuildVisitor()
+        with pytest.raises(BirdClientParseError):
+            BirdClient().show_route_visit(visitor, data=[*data, "garbage"])
+        assert not visitor.ended